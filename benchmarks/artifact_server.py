@@ -0,0 +1,228 @@
+# benchmarks/artifact_server.py
+"""
+HTTP stand-in lokal untuk repository CTE:
+
+    /main_package.info                 -> berisi URL server ini
+    /cte/bin/                          -> index HTML target (probe mirror)
+    /cte/bin/<target>/latest/          -> index HTML dengan link .bin
+    /cte/bin/<target>/latest/<bin>     -> artifact (Range, ETag, 304)
+    /cte/bin/<target>/latest/<bin>.sha256
+    /cte/bin/<target>/latest/<bin>.blockmap (lihat core/delta.py)
+    /pub/cte_compatibility_matrix.json -> matrix (kalau diberikan)
+
+Latency per request dan bandwidth bisa diatur, untuk mensimulasikan
+tunnel cloudflared yang lambat; `fail_after` memutus koneksi setelah
+sejumlah byte body (tunnel mati di tengah download) dan `mirrors` menambah
+endpoint lain ke main_package.info. Bisa dipakai sebagai context manager atau
+dijalankan langsung:
+
+    python -m benchmarks.artifact_server --port 8800 --latency-ms 50 --bandwidth-mbps 20
+"""
+import argparse
+import hashlib
+import json
+import random
+import re
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# installer palsu: script shell yang langsung exit 0, diikuti padding acak
+FAKE_INSTALLER_HEADER = b"#!/bin/sh\nexit 0\n"
+
+
+def make_fake_installer(size, seed=0):
+    rng = random.Random(seed)
+    return FAKE_INSTALLER_HEADER + _padding(rng, max(0, size - len(FAKE_INSTALLER_HEADER)))
+
+
+def _padding(rng, n):
+    block = bytes(rng.getrandbits(8) for _ in range(65536))
+    return (block * (n // len(block) + 1))[:n]
+
+
+class ArtifactServer:
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, bandwidth=None,
+                 artifacts=None, matrix=None, targets=("rh8", "rh9", "ubuntu22", "ubuntu24"),
+                 fail_after=None, mirrors=()):
+        """
+        latency    : detik delay sebelum setiap response
+        bandwidth  : byte/detik untuk body (None = tanpa batas)
+        artifacts  : {filename: bytes}; default satu installer 16 MiB
+        fail_after : total byte body artifact sebelum server mulai memutus koneksi
+        mirrors    : URL mirror tambahan yang ditulis di main_package.info
+        """
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.fail_after = fail_after
+        self.mirrors = list(mirrors)
+        self.targets = targets
+        self.matrix = matrix
+        self.artifacts = artifacts or {
+            "vee-fs-7.8.0.100-{target}-x86_64.bin": make_fake_installer(16 * 1024 * 1024)
+        }
+        self._blockmaps = {}
+        self.requests = []
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def artifact_for(self, target, filename):
+        for pattern, data in self.artifacts.items():
+            if pattern.format(target=target) == filename:
+                return data
+        return None
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status, body=b"", headers=None, ctype=None):
+                self.send_response(status)
+                for k, v in (headers or {}).items():
+                    self.send_header(k, v)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if self.command == "HEAD" or not body:
+                    return
+                if server.fail_after is not None and ctype == "application/octet-stream":
+                    with server._lock:
+                        allowed = max(0, server.fail_after - server.bytes_sent)
+                    if allowed < len(body):
+                        self.wfile.write(body[:allowed])
+                        with server._lock:
+                            server.bytes_sent += allowed
+                        self.close_connection = True
+                        self.connection.shutdown(socket.SHUT_RDWR)
+                        return
+                if not server.bandwidth:
+                    self.wfile.write(body)
+                else:
+                    step = 64 * 1024
+                    for i in range(0, len(body), step):
+                        chunk = body[i:i + step]
+                        self.wfile.write(chunk)
+                        time.sleep(len(chunk) / server.bandwidth)
+                with server._lock:
+                    server.bytes_sent += len(body)
+
+            def _route(self):
+                path = self.path.split("?", 1)[0]
+                if path == "/main_package.info":
+                    lines = [f"active repo: {server.url}"] + [f"mirror: {m}" for m in server.mirrors]
+                    return ("\n".join(lines) + "\n").encode(), "text/plain"
+                if path == "/pub/cte_compatibility_matrix.json" and server.matrix is not None:
+                    return json.dumps(server.matrix).encode(), "application/json"
+                if path == "/cte/bin/":
+                    links = "".join(f'<a href="{t}/">{t}/</a>\n' for t in server.targets)
+                    return f"<html><body>\n{links}</body></html>".encode(), "text/html"
+                m = re.match(r"^/cte/bin/([^/]+)/latest/(.*)$", path)
+                if not m or m.group(1) not in server.targets:
+                    return None, None
+                target, name = m.groups()
+                if name == "":
+                    links = "".join(
+                        f'<a href="{p.format(target=target)}">{p.format(target=target)}</a>\n'
+                        for p in server.artifacts)
+                    return f"<html><body>\n{links}</body></html>".encode(), "text/html"
+                if name.endswith(".blockmap"):
+                    data = server.artifact_for(target, name[:-len(".blockmap")])
+                    if data is None:
+                        return None, None
+                    key = hashlib.sha256(data).hexdigest()
+                    if key not in server._blockmaps:
+                        from core.delta import build_block_map
+                        server._blockmaps[key] = json.dumps(build_block_map(data)).encode()
+                    return server._blockmaps[key], "application/json"
+                if name.endswith(".sha256"):
+                    data = server.artifact_for(target, name[:-len(".sha256")])
+                    if data is None:
+                        return None, None
+                    return f"{hashlib.sha256(data).hexdigest()}  {name[:-7]}\n".encode(), "text/plain"
+                return server.artifact_for(target, name), "application/octet-stream"
+
+            def do_HEAD(self):
+                self.do_GET()
+
+            def do_GET(self):
+                with server._lock:
+                    server.requests.append((self.command, self.path, self.headers.get("Range")))
+                if server.latency:
+                    time.sleep(server.latency)
+                body, ctype = self._route()
+                if body is None:
+                    return self._send(404)
+
+                etag = '"%s"' % hashlib.sha1(body).hexdigest()
+                headers = {"Content-Type": ctype, "ETag": etag, "Accept-Ranges": "bytes"}
+                if self.headers.get("If-None-Match") == etag:
+                    return self._send(304, headers={"ETag": etag})
+
+                rng = self.headers.get("Range")
+                if_range = self.headers.get("If-Range")
+                if rng and (not if_range or if_range == etag):
+                    m = re.match(r"bytes=(\d+)-(\d*)$", rng)
+                    if m:
+                        start = int(m.group(1))
+                        end = int(m.group(2)) if m.group(2) else len(body) - 1
+                        end = min(end, len(body) - 1)
+                        if start > end:
+                            return self._send(416, headers={"Content-Range": f"bytes */{len(body)}"})
+                        headers["Content-Range"] = f"bytes {start}-{end}/{len(body)}"
+                        return self._send(206, body[start:end + 1], headers, ctype)
+                self._send(200, body, headers, ctype)
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local CTE repository stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8800)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--bandwidth-mbps", type=float, default=0, help="0 = unlimited")
+    parser.add_argument("--artifact-mb", type=int, default=16)
+    args = parser.parse_args()
+
+    server = ArtifactServer(
+        host=args.host, port=args.port, latency=args.latency_ms / 1000.0,
+        bandwidth=args.bandwidth_mbps * 1024 * 1024 / 8 if args.bandwidth_mbps else None,
+        artifacts={"vee-fs-7.8.0.100-{target}-x86_64.bin": make_fake_installer(args.artifact_mb * 1024 * 1024)},
+    )
+    print(f"Serving CTE repository stand-in at {server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+# benchmarks/run.py
+"""
+Benchmark suite reproducible untuk setup_cte.
+
+    python -m benchmarks.run --output bench.json
+    python -m benchmarks.run --quick --only kernel_lookup,pdf_parse
+    python -m benchmarks.run --output new.json --compare bench.json
+
+Semua data sintetis (benchmarks/synthetic.py) dan semua network lewat
+server lokal (benchmarks/artifact_server.py); tidak ada akses ke vendor.
+Hasil ditulis sebagai JSON supaya bisa dibandingkan antar versi.
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+# cache tool diarahkan ke direktori sementara sebelum modul core di-import
+_WORKDIR = tempfile.mkdtemp(prefix="cte-bench-")
+os.environ["CTE_CACHE_DIR"] = os.path.join(_WORKDIR, "cache")
+
+from benchmarks import synthetic  # noqa: E402
+from benchmarks.artifact_server import ArtifactServer, make_fake_installer  # noqa: E402
+
+
+def timed(fn, repeat=1):
+    """Return (median detik, hasil terakhir)."""
+    samples, result = [], None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples), result
+
+
+def _naive_lookup(matrix, kernel):
+    """Algoritma lama check_kernel_support (scan linear), sebagai pembanding."""
+    return [
+        (entry["OS"], k) for entry in matrix["MAPPING"] for k in entry["KERNEL"] if kernel in k["NUM"]
+    ]
+
+
+# ======================
+# BENCHMARKS
+# ======================
+
+def bench_kernel_lookup(quick):
+    from core.kernel_index import KernelIndex
+
+    results = []
+    scales = [1000, 10000] if quick else [1000, 10000, 50000]
+    queries = 500 if quick else 2000
+    for total in scales:
+        matrix = synthetic.generate_matrix(total)
+        kernels = synthetic.sample_kernels(matrix, queries)
+        build_s, index = timed(lambda: KernelIndex(matrix))
+        lookup_s, _ = timed(lambda: [index.lookup(k) for k in kernels], repeat=3)
+        naive_n = min(queries, 200)
+        naive_s, _ = timed(lambda: [_naive_lookup(matrix, k) for k in kernels[:naive_n]])
+        results.append({
+            "name": "kernel_lookup",
+            "params": {"matrix_kernels": total, "queries": queries},
+            "metrics": {
+                "index_build_s": build_s,
+                "indexed_lookup_us": lookup_s / queries * 1e6,
+                "naive_lookup_us": naive_s / naive_n * 1e6,
+            },
+        })
+    return results
+
+
+def bench_pdf_parse(quick):
+    from core.compatibility_checker import CompatibilityChecker
+
+    results = []
+    scales = [0, 10] if quick else [0, 10, 50]
+    for filler in scales:
+        pdf = os.path.join(_WORKDIR, f"release_status_{filler}.pdf")
+        synthetic.write_release_status_pdf(pdf, versions=30, filler_pages=filler)
+        checker = CompatibilityChecker(pdf_path=pdf)
+        cold_s, parsed = timed(checker._parse_pdf_support_status)
+        checker.parse_cte_support_status()  # isi sidecar cache
+        warm_s, _ = timed(checker.parse_cte_support_status, repeat=5)
+        results.append({
+            "name": "pdf_parse",
+            "params": {"pages": 1 + filler, "versions": len(parsed)},
+            "metrics": {"cold_parse_s": cold_s, "warm_cached_s": warm_s},
+        })
+    return results
+
+
+def bench_host_info(quick):
+    from core.host_info import HostInfoCollector
+
+    collector = HostInfoCollector()
+    repeat = 1 if quick else 3
+    # CM domain lokal yang menolak koneksi, supaya hasil tidak bergantung DNS
+    serial_s, _ = timed(lambda: collector.collect("127.0.0.1", concurrent=False), repeat)
+    concurrent_s, _ = timed(lambda: collector.collect("127.0.0.1", concurrent=True), repeat)
+    return [{
+        "name": "host_info_collect",
+        "params": {},
+        "metrics": {"serial_s": serial_s, "concurrent_s": concurrent_s},
+    }]
+
+
+def bench_install_download(quick):
+    from core.artifact_store import ArtifactStore
+    from core.installer import Installer
+    from core.repository import RepositoryManager
+
+    results = []
+    size_mb = 16 if quick else 64
+    profiles = [("unthrottled", 0.0, None), ("tunnel", 0.05, 40 * 1024 * 1024)]
+    artifact = make_fake_installer(size_mb * 1024 * 1024)
+    for label, latency, bandwidth in profiles:
+        artifacts = {"vee-fs-7.8.0.100-{target}-x86_64.bin": artifact}
+        with ArtifactServer(latency=latency, bandwidth=bandwidth, artifacts=artifacts) as server:
+            store = ArtifactStore(os.path.join(_WORKDIR, f"store-{label}"))
+            repo = RepositoryManager(override_url=f"{server.url}/main_package.info")
+            installer = Installer(repo, store=store)
+            cold_s, _ = timed(installer.perform_install)
+            sent = server.bytes_sent
+            warm_s, _ = timed(installer.perform_install)
+            results.append({
+                "name": "install_download",
+                "params": {"profile": label, "artifact_mb": size_mb,
+                           "latency_ms": latency * 1000, "bandwidth_bps": bandwidth},
+                "metrics": {
+                    "cold_install_s": cold_s,
+                    "cold_throughput_mbps": sent * 8 / cold_s / 1e6,
+                    "cached_install_s": warm_s,
+                    "cached_bytes_transferred": server.bytes_sent - sent,
+                },
+            })
+    return results
+
+
+def bench_mirror_failover(quick):
+    """
+    Tiga mirror di info file: satu lambat, satu mati di tengah download,
+    satu sehat. Install harus tetap sukses dengan SHA-256 terverifikasi.
+    """
+    from core.artifact_store import ArtifactStore
+    from core.installer import Installer
+    from core.repository import RepositoryManager
+
+    size_mb = 16 if quick else 64
+    artifacts = {"vee-fs-7.8.0.100-{target}-x86_64.bin": make_fake_installer(size_mb * 1024 * 1024)}
+    with ArtifactServer(artifacts=artifacts, latency=0.05) as healthy, \
+            ArtifactServer(artifacts=artifacts, fail_after=size_mb * 1024 * 1024 // 3) as dying, \
+            ArtifactServer(artifacts=artifacts, latency=0.8) as slow:
+        # mirror yang mati di tengah download paling cepat, jadi dipilih pertama
+        dying.mirrors = [slow.url, healthy.url]
+        repo = RepositoryManager(override_url=f"{dying.url}/main_package.info")
+        discover_s, mirrors = timed(repo.discover_mirrors)
+        installer = Installer(repo, store=ArtifactStore(os.path.join(_WORKDIR, "store-mirrors")))
+        install_s, _ = timed(installer.perform_install)
+        return [{
+            "name": "mirror_failover",
+            "params": {"artifact_mb": size_mb, "mirrors": len(mirrors)},
+            "metrics": {
+                "discover_s": discover_s,
+                "install_s": install_s,
+                "dying_mirror_bytes": dying.bytes_sent,
+                "healthy_mirror_bytes": healthy.bytes_sent,
+                "slow_mirror_bytes": slow.bytes_sent,
+            },
+        }]
+
+
+BENCHMARKS = {
+    "kernel_lookup": bench_kernel_lookup,
+    "pdf_parse": bench_pdf_parse,
+    "host_info": bench_host_info,
+    "install_download": bench_install_download,
+    "mirror_failover": bench_mirror_failover,
+}
+
+
+# ======================
+# OUTPUT & COMPARE
+# ======================
+
+def _git_revision():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+            stderr=subprocess.DEVNULL, universal_newlines=True).strip()
+    except Exception:
+        return None
+
+
+def _key(result):
+    return result["name"] + json.dumps(result["params"], sort_keys=True)
+
+
+def compare(current, baseline, tolerance):
+    """
+    Bandingkan metric *_s / *_us dengan baseline. Return daftar regresi
+    (naik lebih dari `tolerance`, mis. 0.2 = 20%).
+    """
+    base = {_key(r): r for r in baseline["results"]}
+    regressions = []
+    for r in current["results"]:
+        old = base.get(_key(r))
+        if not old:
+            continue
+        for metric, value in r["metrics"].items():
+            if not (metric.endswith("_s") or metric.endswith("_us")):
+                continue
+            prev = old["metrics"].get(metric)
+            if prev and value > prev * (1 + tolerance):
+                regressions.append({
+                    "name": r["name"], "params": r["params"], "metric": metric,
+                    "baseline": prev, "current": value, "change": value / prev - 1,
+                })
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="setup_cte benchmark suite")
+    parser.add_argument("--output", metavar="FILE", help="write results as JSON (default: stdout)")
+    parser.add_argument("--only", help=f"comma separated subset of: {', '.join(BENCHMARKS)}")
+    parser.add_argument("--quick", action="store_true", help="smaller scales for a fast smoke run")
+    parser.add_argument("--compare", metavar="BASELINE", help="baseline JSON to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown vs baseline (default 0.2)")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    selected = args.only.split(",") if args.only else list(BENCHMARKS)
+
+    report = {
+        "meta": {
+            "revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "quick": args.quick,
+        },
+        "results": [],
+    }
+    for name in selected:
+        print(f"running {name} ...", file=sys.stderr)
+        report["results"].extend(BENCHMARKS[name](args.quick))
+
+    exit_code = 0
+    if args.compare:
+        with open(args.compare) as fh:
+            regressions = compare(report, json.load(fh), args.tolerance)
+        report["regressions"] = regressions
+        for reg in regressions:
+            print(f"REGRESSION {reg['name']} {reg['params']} {reg['metric']}: "
+                  f"{reg['baseline']:.6g} -> {reg['current']:.6g} (+{reg['change']:.0%})", file=sys.stderr)
+        exit_code = 1 if regressions else 0
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(text + "\n")
+    else:
+        print(text)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# benchmarks/startup_budget.py
+"""
+Startup-time budget untuk main.py, berbasis output `python -X importtime`.
+
+Mengukur biaya import milik tool (di luar import interpreter dasar) untuk
+beberapa skenario, dan gagal (exit 1) kalau:
+- median waktu import melebihi budget, atau
+- modul berat (requests, pdfplumber, bs4, ...) ter-import di jalur yang
+  seharusnya tidak membutuhkannya.
+
+Jalur yang di-lazy-import (--check, --fix, --encrypt, --estimate) dijalankan
+sungguhan tapi offline dan tanpa efek samping: repo info diarahkan ke port
+tertutup, --check menjawab dari snapshot kosong, candidate path enkripsi
+tidak ada, dan --fix tanpa --apply hanya mendiagnosis. main.py menolak
+jalan di luar virtualenv, jadi kalau interpreter ini bukan venv skenario
+dijalankan di venv sementara (--system-site-packages). Skenario gagal kalau
+child exit non-zero atau modul jalurnya (`expect`) tidak pernah ter-import,
+supaya exit dini tidak lolos sebagai "OK".
+
+Contoh:
+    python benchmarks/startup_budget.py
+    python benchmarks/startup_budget.py --budget-ms 40 --json startup.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import venv
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ("requests", "urllib3", "pdfplumber", "pdfminer", "bs4", "psutil")
+
+# allow: modul berat yang memang dibutuhkan jalur itu; budget_ms: override --budget-ms;
+# expect: modul yang hanya ter-import kalau jalur itu benar-benar dijalankan
+SCENARIOS = {
+    "import-main": {"args": ["-c", "import main"], "expect": "main"},
+    "help": {"args": ["main.py", "--help"]},
+    "check": {"args": ["main.py", "--check"], "allow": ("requests", "urllib3", "psutil"), "budget_ms": 250,
+              "expect": "core.check_pipeline"},
+    "fix": {"args": ["main.py", "--fix"], "expect": "core.issue_resolver"},
+    # scanner, manifest dan scheduler memang di-import jalur ini
+    "encrypt": {"args": ["main.py", "--encrypt", "--dry-run"], "budget_ms": 80, "expect": "core.encrypt_asset"},
+    "estimate": {"args": ["main.py", "--estimate"], "budget_ms": 80, "expect": "core.encrypt_asset"},
+}
+
+
+def offline_env(workdir):
+    """Environment untuk menjalankan skenario tanpa network, root, atau data nyata."""
+    sys.path.insert(0, REPO_ROOT)
+    from core.snapshot import CompatibilitySnapshot
+
+    snapshot = os.path.join(workdir, "snapshot.db")
+    CompatibilitySnapshot.build(snapshot, {"MAPPING": []}, {})
+    env = dict(os.environ)
+    env.pop("CTE_CM_DOMAIN", None)
+    env.update({
+        "CTE_CACHE_DIR": os.path.join(workdir, "cache"),
+        "CTE_SNAPSHOT": snapshot,
+        "CTE_REPO_INFO_URL": "http://127.0.0.1:9/main_package.info",
+        "CTE_ENCRYPT_PATHS": os.path.join(workdir, "no-such-asset-dir"),
+    })
+    return env
+
+
+def interpreter(workdir):
+    """Python yang lolos EnvironmentManager.validate_virtualenv()."""
+    if sys.prefix != sys.base_prefix:
+        return sys.executable
+    path = os.path.join(workdir, "venv")
+    venv.EnvBuilder(system_site_packages=True, with_pip=False, symlinks=os.name != "nt").create(path)
+    return os.path.join(path, "Scripts" if os.name == "nt" else "bin", "python")
+
+
+def parse_importtime(stderr):
+    """Return {module: (self_us, cumulative_us, depth)} dari output -X importtime."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        name = parts[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        modules[name.strip()] = (int(parts[0]), int(parts[1]), depth)
+    return modules
+
+
+def run_importtime(args, env=None, python=sys.executable):
+    """Return (exit code, modules) untuk satu run `python -X importtime`."""
+    proc = subprocess.run(
+        [python, "-X", "importtime"] + args,
+        cwd=REPO_ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+    )
+    return proc.returncode, parse_importtime(proc.stderr)
+
+
+def measure(args, baseline, env=None, python=sys.executable):
+    """Return (exit code, total cumulative ms modul top-level di luar baseline, modules)."""
+    returncode, modules = run_importtime(args, env, python)
+    own = {name: v for name, v in modules.items() if name not in baseline}
+    total_us = sum(cum for _, cum, depth in own.values() if depth == 0)
+    return returncode, total_us / 1000.0, own
+
+
+def main():
+    parser = argparse.ArgumentParser(description="main.py startup-time budget")
+    parser.add_argument("--budget-ms", type=float, default=50.0,
+                        help="max median import time per scenario (default: 50ms)")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--json", metavar="FILE", help="write results as JSON")
+    args = parser.parse_args()
+
+    workdir = tempfile.TemporaryDirectory(prefix="cte-startup-")
+    env = offline_env(workdir.name)
+    python = interpreter(workdir.name)
+    _, baseline = run_importtime(["-c", "pass"], env, python)
+    results = {}
+    failed = False
+
+    for name, scenario in SCENARIOS.items():
+        budget = scenario.get("budget_ms", args.budget_ms)
+        samples = []
+        exit_codes = set()
+        own = {}
+        for _ in range(args.runs):
+            returncode, ms, own = measure(scenario["args"], baseline, env, python)
+            exit_codes.add(returncode)
+            samples.append(ms)
+        median = statistics.median(samples)
+        # exit dini (mis. ditolak validate_virtualenv) hanya mengukur `import main`
+        errors = [f"exit code {code}" for code in sorted(exit_codes) if code != 0]
+        if scenario.get("expect") and scenario["expect"] not in own:
+            errors.append(f"{scenario['expect']} never imported")
+        heavy = sorted(m for m in own if m.split(".")[0] in HEAVY_MODULES
+                       and m.split(".")[0] not in scenario.get("allow", ()))
+        top = sorted(own.items(), key=lambda kv: kv[1][1], reverse=True)[:5]
+        over = median > budget
+
+        results[name] = {
+            "median_ms": round(median, 2),
+            "samples_ms": [round(s, 2) for s in samples],
+            "budget_ms": budget,
+            "over_budget": over,
+            "heavy_modules": heavy,
+            "errors": errors,
+            "top_imports_ms": {m: round(v[1] / 1000.0, 2) for m, v in top},
+        }
+        bad = over or bool(heavy) or bool(errors)
+        failed = failed or bad
+        print(f"[{'FAIL' if bad else 'OK'}] {name}: median {median:.1f}ms (budget {budget:.0f}ms)")
+        if errors:
+            print(f"       did not run the real code path: {', '.join(errors)}")
+        if heavy:
+            print(f"       heavy modules imported: {', '.join(heavy[:8])}")
+
+    workdir.cleanup()
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(results, fh, indent=2)
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
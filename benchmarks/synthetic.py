@@ -0,0 +1,141 @@
+# benchmarks/synthetic.py
+"""
+Generator data sintetis untuk benchmark: compatibility matrix dan PDF
+release-status dengan berbagai skala. Deterministik per seed.
+"""
+import random
+
+DISTROS = [
+    ("Red Hat Enterprise Linux {v}", "el{v}", "4.18.0"),
+    ("Rocky Linux {v}", "el{v}", "5.14.0"),
+    ("Ubuntu {v}.04", "", "5.15.0"),
+    ("SUSE Linux Enterprise Server {v}", "", "5.3.18"),
+]
+STATUSES = ["Active", "Continued Support", "Extended Support", "End of Support"]
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+
+def cte_versions(count):
+    """Versi CTE menurun: 7.8.0, 7.7.0, ..."""
+    versions = []
+    major, minor = 7, 8
+    for _ in range(count):
+        versions.append(f"{major}.{minor}.0")
+        minor -= 1
+        if minor < 0:
+            major, minor = major - 1, 9
+    return versions
+
+
+def generate_matrix(total_kernels, os_count=40, seed=0):
+    """
+    Matrix berbentuk cte_compatibility_matrix.json dengan `total_kernels`
+    record tersebar di `os_count` entry OS.
+    """
+    rng = random.Random(seed)
+    versions = cte_versions(12)
+    mapping = []
+    per_os = max(1, total_kernels // os_count)
+    for i in range(os_count):
+        name_tpl, dist_tpl, base = DISTROS[i % len(DISTROS)]
+        major = 7 + i % 4
+        kernels = []
+        for j in range(per_os):
+            build = f"{100 + j // 10}.{j % 10}.{rng.randint(1, 40)}"
+            dist = dist_tpl.format(v=f"{major}_{i % 10}")
+            num = f"{base}-{build}.{dist}.x86_64" if dist else f"{base}-{build}-generic"
+            start = f"{rng.choice(versions)}.{rng.randint(1, 120)}"
+            end = "0" if rng.random() < 0.6 else f"{rng.choice(versions)}.{rng.randint(1, 120)}"
+            kernels.append({"NUM": num, "START": start, "END": end})
+        mapping.append({"OS": name_tpl.format(v=f"{major}.{i}"), "KERNEL": kernels})
+    return {"MAPPING": mapping}
+
+
+def sample_kernels(matrix, count, miss_ratio=0.1, seed=0):
+    """Ambil kernel query dari matrix, sebagian sengaja tidak ada (miss)."""
+    rng = random.Random(seed)
+    nums = [k["NUM"] for entry in matrix["MAPPING"] for k in entry["KERNEL"]]
+    out = []
+    for _ in range(count):
+        if rng.random() < miss_ratio:
+            out.append(f"9.{rng.randint(0, 99)}.0-{rng.randint(1, 999)}.x86_64")
+        else:
+            out.append(rng.choice(nums))
+    return out
+
+
+def release_status_lines(count, seed=0):
+    rng = random.Random(seed)
+    lines = []
+    for i, version in enumerate(cte_versions(count)):
+        date = f"{rng.randint(1, 28):02d}-{rng.choice(MONTHS)}-{25 - i // 2:02d}"
+        status = STATUSES[min(i, len(STATUSES) - 1)]
+        lines.append(f"{version} {date} {status}")
+    return lines
+
+
+def _pdf_escape(text):
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_release_status_pdf(path, versions=10, filler_pages=0, rows_per_page=40, seed=0):
+    """
+    Tulis PDF minimal (tanpa dependency) yang meniru cte_release_status.pdf:
+    tabel "Release Version / Release Date / Support Status", plus
+    `filler_pages` halaman teks lain untuk mensimulasikan PDF yang membesar.
+    """
+    rng = random.Random(seed)
+    header = ["CipherTrust Transparent Encryption Compatibility",
+              "CTE Release", "Support Status",
+              "Release Version Release Date Support Status"]
+    rows = release_status_lines(versions, seed)
+
+    pages = []
+    for start in range(0, max(1, len(rows)), rows_per_page):
+        pages.append(header + rows[start:start + rows_per_page])
+    for n in range(filler_pages):
+        words = ["kernel", "agent", "policy", "guard", "point", "key", "module", "host"]
+        pages.append([f"Appendix {n + 1}"] + [
+            " ".join(rng.choice(words) for _ in range(10)) for _ in range(rows_per_page)
+        ])
+
+    objects = []  # isi object, index 0 -> obj 1
+
+    def add(body):
+        objects.append(body)
+        return len(objects)
+
+    font_id = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    pages_id = add(b"")  # placeholder, diisi setelah kids diketahui
+    kids = []
+    for lines in pages:
+        ops = ["BT", "/F1 10 Tf", "14 TL", "50 800 Td"]
+        for line in lines:
+            ops.append(f"({_pdf_escape(line)}) Tj T*")
+        ops.append("ET")
+        stream = "\n".join(ops).encode("latin-1")
+        content_id = add(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        kids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>" % (pages_id, font_id, content_id)
+        ))
+    objects[pages_id - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % k for k in kids), len(kids))
+    catalog_id = add(b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for i, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % i + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for off in offsets:
+        out += b"%010d 00000 n \n" % off
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1, catalog_id, xref)
+
+    with open(path, "wb") as fh:
+        fh.write(out)
+    # hasil yang diharapkan dari parser: {version: status}
+    return {version: status for version, _, status in (line.split(" ", 2) for line in rows)}
@@ -6,22 +6,32 @@ Author: Nera Project
 Date: 2025-11-05
 """
 
-import os
-import re
 import json
-import platform
 import requests
-import subprocess
+import sys
 from pathlib import Path
 from typing import Optional
 
+# supaya core/ bisa di-import saat file ini dijalankan langsung
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from core.artifact_store import ArtifactStore  # noqa: E402
+from core.delta import DeltaFetcher  # noqa: E402
+from core import host_facts  # noqa: E402
+from core.downloader import RangedDownloader  # noqa: E402
+from core.kernel_index import KernelIndex  # noqa: E402
+from core.mirrors import candidate_urls, probe_mirrors  # noqa: E402
+from utils import config  # noqa: E402
+from utils.exceptions import DigestMismatchError, DownloadError  # noqa: E402
+from utils.fileio import atomic_write_bytes  # noqa: E402
+from utils.http_cache import get_http_cache  # noqa: E402
+from utils.http_client import http_get  # noqa: E402
+
 # ======================
 # CONFIG
 # ======================
 GITHUB_INFO_URL = "https://raw.githubusercontent.com/Nera-Project/enrolling_thales_cte/main/main_package.info"
 COMPAT_MATRIX_URL = "https://packages.vormetric.com/pub/cte_compatibility_matrix.json"
 LOCAL_MATRIX_FILE = Path("data/cte_compatibility_matrix.json")
-DEFAULT_DOWNLOAD_PATH = Path("/tmp/cte_downloads")
 
 
 # ======================
@@ -33,19 +43,11 @@ class SystemInfo:
 
     def __init__(self):
         self.os_name = self.detect_os_name()
-        self.kernel_version = platform.release()
+        self.kernel_version = host_facts.get("kernel_release")
 
     @staticmethod
     def detect_os_name() -> str:
-        try:
-            with open("/etc/os-release") as f:
-                for line in f:
-                    if line.startswith("PRETTY_NAME"):
-                        name = line.split("=")[1].strip().strip('"')
-                        return name
-        except FileNotFoundError:
-            pass
-        return platform.system()
+        return host_facts.get("os_pretty_name")
 
     def __repr__(self):
         return f"<SystemInfo OS={self.os_name}, Kernel={self.kernel_version}>"
@@ -56,43 +58,55 @@ class ThalesCompatibilityMatrix:
 
     def __init__(self):
         self.data = self._load_matrix()
+        self.index = KernelIndex(self.data)
 
     def _load_matrix(self) -> dict:
-        """Try to load matrix from local cache, else from internet."""
-        if LOCAL_MATRIX_FILE.exists():
+        """Load matrix via shared HTTP cache (revalidated), else from local file."""
+        try:
+            resp = get_http_cache().get(COMPAT_MATRIX_URL, ttl=config.COMPAT_MATRIX_TTL, timeout=10,
+                                        stale_ttl=config.COMPAT_MATRIX_STALE_TTL)
+            resp.raise_for_status()
+            print(f"🌐 Compatibility matrix loaded ({resp.source}).")
+            data = resp.json()
+            if resp.source in ("fetched", "revalidated") or not LOCAL_MATRIX_FILE.exists():
+                # salinan offline, dipakai kalau origin dan HTTP cache tidak tersedia
+                try:
+                    atomic_write_bytes(LOCAL_MATRIX_FILE, resp.content)
+                except OSError as e:
+                    print(f"⚠️  Could not write {LOCAL_MATRIX_FILE}: {e}")
+            return data
+        except Exception as e:
+            if not LOCAL_MATRIX_FILE.exists():
+                raise
+            print(f"📄 Using local compatibility matrix ({e}).")
             with open(LOCAL_MATRIX_FILE) as f:
-                print("📄 Using cached compatibility matrix.")
                 return json.load(f)
-        else:
-            print("🌐 Downloading latest Thales compatibility matrix...")
-            resp = requests.get(COMPAT_MATRIX_URL, timeout=10)
-            resp.raise_for_status()
-            LOCAL_MATRIX_FILE.parent.mkdir(parents=True, exist_ok=True)
-            LOCAL_MATRIX_FILE.write_text(resp.text)
-            return resp.json()
 
     def get_supported_version(self, kernel: str) -> Optional[str]:
         """Return the highest compatible CTE version for a given kernel."""
-        for entry in self.data.get("MAPPING", []):
-            for kdata in entry["KERNEL"]:
-                if kernel.startswith(kdata["NUM"].split(".x86_64")[0]):
-                    return kdata["START"]
-        return None
+        matches = self.index.match_prefix_of(kernel)
+        return matches[0].start if matches else None
 
 
 class RepositoryLocator:
     """Finds the current active repository endpoint from GitHub info file."""
 
     def __init__(self):
-        self.repo_url = self._fetch_repo_url()
+        self.mirrors = self._fetch_mirrors()
+        self.repo_url = self.mirrors[0]
 
-    def _fetch_repo_url(self) -> str:
-        resp = requests.get(GITHUB_INFO_URL, timeout=10)
+    def _fetch_mirrors(self) -> list:
+        """All endpoints in the info file, ranked by a parallel HEAD probe."""
+        resp = http_get(GITHUB_INFO_URL, timeout=10)
         resp.raise_for_status()
-        match = re.search(r'https://[^\s"]+', resp.text)
-        if not match:
+        urls = candidate_urls(resp.text)
+        if not urls:
             raise ValueError("❌ Failed to parse repo URL from GitHub info.")
-        return match.group(0)
+        ranked = probe_mirrors(urls)
+        for p in ranked:
+            state = f"{p.latency * 1000:.0f} ms" if p.healthy else f"unavailable ({p.error})"
+            print(f"🔎 Mirror {p.url}: {state}")
+        return [p.url for p in ranked]
 
     def get_repo_url(self) -> str:
         return self.repo_url
@@ -101,9 +115,10 @@ class RepositoryLocator:
 class BinaryDownloader:
     """Downloads the correct binary from repo if compatible."""
 
-    def __init__(self, repo_url: str):
+    def __init__(self, repo_url: str, mirrors=None):
         self.repo_url = repo_url
-        DEFAULT_DOWNLOAD_PATH.mkdir(exist_ok=True)
+        self.mirrors = mirrors or [repo_url]
+        self.store = ArtifactStore()
 
     @staticmethod
     def _guess_os_code(os_name: str) -> Optional[str]:
@@ -120,6 +135,28 @@ class BinaryDownloader:
         else:
             return None
 
+    def _download_delta(self, os_code, file_url, binary_name, fallbacks, expected=None):
+        """Rebuild from the previous cached installer + changed blocks, or None."""
+        seed = self.store.latest(os_code)
+        if seed is None:
+            return None
+        try:
+            result = DeltaFetcher(timeout=15).fetch(
+                file_url, seed, self.store.staging_path(binary_name),
+                expected_sha256=expected, mirrors=fallbacks)
+        except DigestMismatchError as e:
+            print(f"❌ Delta update ditolak ({e}), download penuh.")
+            return None
+        except (requests.RequestException, DownloadError) as e:
+            print(f"⚠️  Delta update gagal ({e}), download penuh.")
+            return None
+        if result is None:
+            return None
+        staged, digest, stats = result
+        print(f"🧩 Delta update dari {seed.name}: "
+              f"{stats['fetched_bytes'] / 1048576:.1f} dari {stats['size'] / 1048576:.1f} MiB di-download")
+        return staged, digest
+
     def download_binary(self, os_name: str, version: str) -> Optional[Path]:
         os_code = self._guess_os_code(os_name)
         if not os_code:
@@ -128,21 +165,30 @@ class BinaryDownloader:
 
         binary_name = f"vee-fs-{version}-{os_code}-x86_64.bin"
         file_url = f"{self.repo_url}/cte/bin/{os_code}/latest/{binary_name}"
-        dest_path = DEFAULT_DOWNLOAD_PATH / binary_name
+        expected = RangedDownloader().resolve_expected_digest(file_url)
+        cached = self.store.lookup(os_code, filename=binary_name, expected_sha256=expected)
+        if cached:
+            print(f"📦 Binary sudah ada di artifact store: {cached}")
+            return cached
 
         print(f"⬇️  Downloading {binary_name} from {file_url}")
-        resp = requests.get(file_url, stream=True, timeout=15)
-
-        if resp.status_code != 200:
+        fallbacks = [f"{m}/cte/bin/{os_code}/latest/{binary_name}" for m in self.mirrors]
+        delta = self._download_delta(os_code, file_url, binary_name, fallbacks, expected)
+        if delta is not None:
+            dest_path = self.store.publish(os_code, binary_name, *delta)
+            print(f"✅ Binary disimpan di {dest_path}")
+            return dest_path
+        try:
+            staged, digest = RangedDownloader(timeout=15).download(
+                file_url, self.store.staging_path(binary_name), expected_sha256=expected, mirrors=fallbacks)
+        except requests.HTTPError:
             print(f"❌ File {binary_name} tidak ditemukan di repo.")
             return None
+        except DownloadError as e:
+            print(f"❌ Download {binary_name} gagal: {e}")
+            return None
 
-        with open(dest_path, "wb") as f:
-            for chunk in resp.iter_content(chunk_size=8192):
-                if chunk:
-                    f.write(chunk)
-
-        os.chmod(dest_path, 0o755)
+        dest_path = self.store.publish(os_code, binary_name, staged, digest)
         print(f"✅ Binary disimpan di {dest_path}")
         return dest_path
 
@@ -159,7 +205,7 @@ class CTEClient:
         self.sys_info = SystemInfo()
         self.matrix = ThalesCompatibilityMatrix()
         self.repo = RepositoryLocator()
-        self.downloader = BinaryDownloader(self.repo.get_repo_url())
+        self.downloader = BinaryDownloader(self.repo.get_repo_url(), self.repo.mirrors)
 
     def check_compatibility_and_download(self):
         print(f"🧩 System Detected: {self.sys_info}")
@@ -1,15 +1,16 @@
 # collections/test_compatibility.py
 import requests
-import json
-import pdfplumber
-import re
-import pdfplumber
+import sys
 import warnings
+from pathlib import Path
 warnings.filterwarnings("ignore", message="Could get FontBBox")
 
 import logging
 logging.getLogger("pdfminer").setLevel(logging.ERROR)
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from core.pdf_status import parse_support_status  # noqa: E402
+
 
 # =============================
 # 1️⃣ Ambil JSON Compatibility Matrix dari URL
@@ -28,23 +29,9 @@ def parse_cte_support_status(pdf_path):
     """
     Membaca file PDF yang berisi tabel 'CTE Release Support Status'
     dan mengembalikan dict: { '7.8.0': 'Active', ... }
+    Hanya page yang berisi tabel yang di-extract, paralel (core/pdf_status.py).
     """
-
-    results = {}
-    pattern = re.compile(r"^(\d+\.\d+\.\d+)\s+[\dA-Za-z-]+\s+([A-Za-z\s]+)$")
-
-    with pdfplumber.open(pdf_path) as pdf:
-        for page in pdf.pages:
-            text = page.extract_text()
-            if not text:
-                continue
-            for line in text.splitlines():
-                match = pattern.match(line.strip())
-                if match:
-                    version, status = match.groups()
-                    results[version.strip()] = status.strip()
-
-    return results
+    return parse_support_status(pdf_path)
 
 # =============================
 # 3️⃣ Cek kompatibilitas berdasarkan kernel + tambahkan status dari PDF
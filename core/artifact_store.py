@@ -0,0 +1,182 @@
+# core/artifact_store.py
+import fcntl
+import hashlib
+import json
+import os
+import re
+import shutil
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from core.logger import get_logger
+from utils import config
+from utils.fileio import atomic_write_json, read_json
+
+logger = get_logger(__name__)
+
+# vee-fs-<version>-<target>-x86_64.bin
+BINARY_VERSION_PATTERN = re.compile(r"vee-fs-(\d+(?:\.\d+)+)-")
+
+
+def version_from_filename(filename):
+    m = BINARY_VERSION_PATTERN.search(filename)
+    return m.group(1) if m else None
+
+
+class ArtifactStore:
+    """
+    Store lokal content-addressed untuk installer CTE.
+
+    objects/<aa>/<sha256>   : isi file, immutable
+    index.json              : refs (target, filename) -> sha256 + waktu akses
+    staging/                : tempat download sebelum di-publish
+
+    Publish atomic (rename di filesystem yang sama), eviction LRU berdasarkan
+    total ukuran object. Index dilindungi flock supaya aman dipakai
+    beberapa proses sekaligus.
+    """
+
+    def __init__(self, root=None, max_bytes=None):
+        self.root = Path(root or config.ARTIFACT_STORE_DIR)
+        self.max_bytes = max_bytes if max_bytes is not None else config.ARTIFACT_STORE_MAX_BYTES
+        self.objects_dir = self.root / "objects"
+        self.staging_dir = self.root / "staging"
+        self.index_path = self.root / "index.json"
+        for d in (self.objects_dir, self.staging_dir):
+            d.mkdir(parents=True, exist_ok=True)
+
+    # --- locking & index ---
+    @contextmanager
+    def _locked_index(self):
+        with open(self.root / "index.lock", "a") as lock_fh:
+            fcntl.flock(lock_fh, fcntl.LOCK_EX)
+            try:
+                index = read_json(self.index_path) or {}
+                index.setdefault("objects", {})
+                index.setdefault("refs", {})
+                before = json.dumps(index, sort_keys=True)
+                yield index
+                # lookup read-only (miss, latest, versions) tidak menulis + fsync index
+                if json.dumps(index, sort_keys=True) != before:
+                    atomic_write_json(self.index_path, index)
+            finally:
+                fcntl.flock(lock_fh, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _ref_key(target, filename):
+        return f"{target}/{filename}"
+
+    def object_path(self, sha256):
+        return self.objects_dir / sha256[:2] / sha256
+
+    # --- API ---
+    def staging_path(self, filename):
+        """
+        Path di staging/ untuk download yang nanti di-publish. Namanya tetap
+        per file supaya journal download yang terputus bisa dilanjutkan.
+        """
+        return self.staging_dir / filename
+
+    def lookup(self, target, filename=None, version=None, expected_sha256=None):
+        """
+        Cari installer di store berdasarkan nama file atau versi.
+        Return Path object atau None. Akses meng-update urutan LRU.
+        Kalau `expected_sha256` (digest published / pinned) diberikan dan
+        berbeda, entry dianggap usang (installer di-rebuild dengan nama sama).
+        """
+        with self._locked_index() as index:
+            ref = None
+            if filename:
+                ref = index["refs"].get(self._ref_key(target, filename))
+            elif version:
+                matches = [r for r in index["refs"].values()
+                           if r["target"] == target and r.get("version") == version]
+                ref = max(matches, key=lambda r: r["stored_at"]) if matches else None
+            if not ref:
+                return None
+            if expected_sha256 and ref["sha256"] != expected_sha256.lower():
+                logger.info("Cached installer %s (%s) differs from published digest %s",
+                            ref["filename"], ref["sha256"][:12], expected_sha256[:12].lower())
+                return None
+            path = self.object_path(ref["sha256"])
+            if not path.exists():
+                index["refs"].pop(self._ref_key(ref["target"], ref["filename"]), None)
+                index["objects"].pop(ref["sha256"], None)
+                return None
+            index["objects"].setdefault(ref["sha256"], {"size": path.stat().st_size})["last_access"] = time.time()
+        logger.info("Using cached installer %s (%s)", ref["filename"], ref["sha256"][:12])
+        return path
+
+    def latest(self, target):
+        """Installer paling baru yang pernah di-publish untuk target ini (untuk offline)."""
+        with self._locked_index() as index:
+            refs = [r for r in index["refs"].values() if r["target"] == target]
+        if not refs:
+            return None
+        ref = max(refs, key=lambda r: r["stored_at"])
+        return self.lookup(target, filename=ref["filename"])
+
+    def versions(self, target):
+        """Daftar versi yang tersedia lokal untuk target (untuk rollback)."""
+        with self._locked_index() as index:
+            return sorted({r["version"] for r in index["refs"].values()
+                           if r["target"] == target and r.get("version")})
+
+    def publish(self, target, filename, src_path, sha256=None):
+        """
+        Pindahkan file staging ke objects/ secara atomic dan catat ref-nya.
+        Return path object final.
+        """
+        src_path = Path(src_path)
+        if sha256 is None:
+            h = hashlib.sha256()
+            with open(src_path, "rb") as fh:
+                for block in iter(lambda: fh.read(1024 * 1024), b""):
+                    h.update(block)
+            sha256 = h.hexdigest()
+
+        dest = self.object_path(sha256)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        if dest.exists():
+            src_path.unlink()
+        else:
+            try:
+                os.replace(src_path, dest)
+            except OSError:
+                # beda filesystem: copy ke temp di objects/ lalu rename
+                tmp = dest.with_name(f".{sha256}.tmp")
+                shutil.copyfile(src_path, tmp)
+                os.replace(tmp, dest)
+                src_path.unlink()
+        dest.chmod(0o755)
+
+        now = time.time()
+        with self._locked_index() as index:
+            index["objects"][sha256] = {"size": dest.stat().st_size, "last_access": now}
+            index["refs"][self._ref_key(target, filename)] = {
+                "target": target,
+                "filename": filename,
+                "version": version_from_filename(filename),
+                "sha256": sha256,
+                "stored_at": now,
+            }
+            self._evict(index, keep=sha256)
+        logger.info("Stored installer %s as %s", filename, sha256[:12])
+        return dest
+
+    def _evict(self, index, keep=None):
+        total = sum(o["size"] for o in index["objects"].values())
+        for sha, meta in sorted(index["objects"].items(), key=lambda kv: kv[1].get("last_access", 0)):
+            if total <= self.max_bytes:
+                break
+            if sha == keep:
+                continue
+            try:
+                self.object_path(sha).unlink()
+            except OSError:
+                pass
+            total -= meta["size"]
+            del index["objects"][sha]
+            for key in [k for k, r in index["refs"].items() if r["sha256"] == sha]:
+                del index["refs"][key]
+            logger.info("Evicted cached installer %s (%d bytes)", sha[:12], meta["size"])
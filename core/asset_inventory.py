@@ -0,0 +1,204 @@
+# core/asset_inventory.py
+import os
+import queue
+import stat
+import threading
+from core.logger import get_logger
+from utils import config
+
+logger = get_logger(__name__)
+
+# batas atas bucket histogram ukuran file (byte); terakhir = sisanya
+SIZE_BUCKETS = [
+    ("<4K", 4 << 10),
+    ("4K-64K", 64 << 10),
+    ("64K-1M", 1 << 20),
+    ("1M-16M", 16 << 20),
+    ("16M-256M", 256 << 20),
+    ("256M-4G", 4 << 30),
+    (">=4G", None),
+]
+
+ROOT_BUCKET = "."
+
+
+def _size_bucket(size):
+    for label, limit in SIZE_BUCKETS:
+        if limit is None or size < limit:
+            return label
+    return SIZE_BUCKETS[-1][0]
+
+
+def _empty_stats():
+    return {
+        "files": 0,
+        "dirs": 0,
+        "symlinks": 0,
+        "total_bytes": 0,
+        "allocated_bytes": 0,
+        "sparse_files": 0,
+        "hardlink_duplicates": 0,
+        "hardlink_duplicate_bytes": 0,
+        "hardlinks_untracked": 0,
+        "skipped_mounts": 0,
+        "errors": 0,
+        "size_distribution": {label: 0 for label, _ in SIZE_BUCKETS},
+    }
+
+
+def _merge(dst, src):
+    for key, value in src.items():
+        if key == "size_distribution":
+            for label, count in value.items():
+                dst[key][label] += count
+        else:
+            dst[key] += value
+
+
+class AssetInventoryScanner:
+    """
+    Inventory paralel berbasis os.scandir untuk folder kandidat enkripsi.
+
+    Per direktori top-level dilaporkan: jumlah file, total & allocated bytes,
+    sparse file, duplikat hardlink, dan distribusi ukuran. Scan tidak
+    menyeberang filesystem (seperti `du -x`).
+
+    Memory tetap kecil: antrian hanya berisi direktori yang belum discan,
+    statistik diakumulasi per thread lalu digabung, dan hanya inode dengan
+    st_nlink > 1 yang diingat untuk deteksi hardlink. Inode dilupakan
+    lagi setelah semua link-nya terlihat, dan jumlah yang diingat dibatasi
+    `max_tracked_links` (config.INVENTORY_MAX_TRACKED_LINKS). Di atas batas
+    itu (mis. backup rsnapshot) inode baru dihitung sebagai file biasa dan
+    dicatat di `hardlinks_untracked`, jadi total bytes bisa lebih besar.
+    """
+
+    def __init__(self, workers=8, one_filesystem=True, max_tracked_links=None):
+        self.workers = workers
+        self.one_filesystem = one_filesystem
+        self.max_tracked_links = (config.INVENTORY_MAX_TRACKED_LINKS
+                                  if max_tracked_links is None else max_tracked_links)
+
+    def scan(self, root):
+        """Scan satu path kandidat. Return {"path", "totals", "by_directory"}."""
+        root = os.path.abspath(root)
+        # stat, bukan lstat: root boleh berupa symlink ke volume lain
+        root_dev = os.stat(root).st_dev
+        work = queue.LifoQueue()  # LIFO = depth-first, antrian tetap pendek
+        pending_links = {}  # (dev, ino) -> link yang belum terlihat
+        links_lock = threading.Lock()
+        per_thread = []
+
+        work.put((root, None))
+
+        def worker():
+            local = {}
+            per_thread.append(local)
+            while True:
+                item = work.get()
+                if item is None:
+                    work.task_done()
+                    return
+                try:
+                    self._scan_dir(item, root, root_dev, work, local, pending_links, links_lock)
+                except Exception as e:
+                    logger.error("Inventory scan of %s failed: %s", item[0], e)
+                finally:
+                    work.task_done()
+
+        threads = [threading.Thread(target=worker, daemon=True) for _ in range(self.workers)]
+        for t in threads:
+            t.start()
+        work.join()
+        for _ in threads:
+            work.put(None)
+        for t in threads:
+            t.join()
+
+        by_directory = {}
+        for local in per_thread:
+            for bucket, stats in local.items():
+                _merge(by_directory.setdefault(bucket, _empty_stats()), stats)
+        totals = _empty_stats()
+        for stats in by_directory.values():
+            _merge(totals, stats)
+        if totals["hardlinks_untracked"]:
+            logger.warning("Inventory %s: hardlink tracking limit (%d inodes) reached; "
+                           "%d hardlinked files counted without duplicate detection",
+                           root, self.max_tracked_links, totals["hardlinks_untracked"])
+        return {"path": root, "totals": totals, "by_directory": by_directory}
+
+    def scan_all(self, paths):
+        """Scan beberapa path; path yang tidak ada dilewati."""
+        reports = {}
+        for p in paths:
+            if not os.path.isdir(p):
+                logger.debug("Path %s not found, skipping inventory", p)
+                continue
+            reports[p] = self.scan(p)
+        return reports
+
+    def _scan_dir(self, item, root, root_dev, work, local, pending_links, links_lock):
+        path, bucket = item
+
+        def stats_for(name):
+            if name not in local:
+                local[name] = _empty_stats()
+            return local[name]
+
+        try:
+            it = os.scandir(path)
+        except OSError as e:
+            logger.debug("Cannot scan %s: %s", path, e)
+            stats_for(bucket or ROOT_BUCKET)["errors"] += 1
+            return
+
+        with it:
+            for entry in it:
+                # entry langsung di bawah root menentukan bucket top-level
+                entry_bucket = bucket or (entry.name if entry.is_dir(follow_symlinks=False) else ROOT_BUCKET)
+                stats = stats_for(entry_bucket)
+                try:
+                    st = entry.stat(follow_symlinks=False)
+                except OSError:
+                    stats["errors"] += 1
+                    continue
+
+                mode = st.st_mode
+                if stat.S_ISDIR(mode):
+                    if self.one_filesystem and st.st_dev != root_dev:
+                        stats["skipped_mounts"] += 1
+                        continue
+                    stats["dirs"] += 1
+                    work.put((entry.path, entry_bucket))
+                elif stat.S_ISLNK(mode):
+                    stats["symlinks"] += 1
+                elif stat.S_ISREG(mode):
+                    size = st.st_size
+                    allocated = st.st_blocks * 512
+                    if st.st_nlink > 1:
+                        key = (st.st_dev, st.st_ino)
+                        untracked = False
+                        with links_lock:
+                            left = pending_links.get(key)
+                            if left is None:
+                                if len(pending_links) < self.max_tracked_links:
+                                    pending_links[key] = st.st_nlink - 1
+                                else:
+                                    untracked = True
+                            elif left > 1:
+                                pending_links[key] = left - 1
+                            else:
+                                # link terakhir: inode tidak perlu diingat lagi
+                                del pending_links[key]
+                        if left is not None:
+                            stats["hardlink_duplicates"] += 1
+                            stats["hardlink_duplicate_bytes"] += size
+                            continue
+                        if untracked:
+                            stats["hardlinks_untracked"] += 1
+                    stats["files"] += 1
+                    stats["total_bytes"] += size
+                    stats["allocated_bytes"] += allocated
+                    if allocated < size:
+                        stats["sparse_files"] += 1
+                    stats["size_distribution"][_size_bucket(size)] += 1
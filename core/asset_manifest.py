@@ -0,0 +1,214 @@
+# core/asset_manifest.py
+import bisect
+import fcntl
+import heapq
+import mmap
+import os
+import struct
+import tempfile
+from contextlib import contextmanager
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+MAGIC = b"CTEMAN01"
+HEADER = struct.Struct("<8sQ")          # magic, jumlah record
+RECORD = struct.Struct("<QQQqq")        # dev, ino, size, mtime_ns, ctime_ns
+FENCE_EVERY = 256                       # satu fence pointer per 256 record
+SORT_RUN_RECORDS = 1_000_000            # ukuran run external sort di memory
+
+
+def stat_record(st):
+    return (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns, st.st_ctime_ns)
+
+
+class AssetManifest:
+    """
+    Manifest incremental per set candidate path, dikunci oleh (device, inode).
+
+    File biner: header + array record 40 byte terurut (dev, ino). Dibaca
+    lewat mmap tanpa di-load: fence pointer tiap 256 record di memory, lalu
+    binary search kecil di dalam blok. Manifest baru ditulis dengan external
+    sort (memory terbatas) dan di-publish atomic di bawah flock, jadi run
+    yang bersamaan tidak bisa merusaknya.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.lock_path = path + ".lock"
+        self.run_lock_path = path + ".run.lock"
+        self._mm = None
+        self._count = 0
+        self._fences = []
+        self._open()
+
+    def _open(self):
+        try:
+            fh = open(self.path, "rb")
+        except FileNotFoundError:
+            return
+        with fh:
+            size = os.fstat(fh.fileno()).st_size
+            if size < HEADER.size:
+                return
+            mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count = HEADER.unpack_from(mm, 0)
+        if magic != MAGIC or HEADER.size + count * RECORD.size > len(mm):
+            logger.warning("Ignoring corrupt asset manifest %s", self.path)
+            mm.close()
+            return
+        self._mm, self._count = mm, count
+        self._fences = [self._key(i) for i in range(0, count, FENCE_EVERY)]
+        logger.info("Loaded asset manifest %s (%d entries)", self.path, count)
+
+    def __len__(self):
+        return self._count
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+
+    def _record(self, i):
+        return RECORD.unpack_from(self._mm, HEADER.size + i * RECORD.size)
+
+    def _key(self, i):
+        dev, ino = struct.unpack_from("<QQ", self._mm, HEADER.size + i * RECORD.size)
+        return (dev << 64) | ino
+
+    def get(self, dev, ino):
+        """Record (dev, ino, size, mtime_ns, ctime_ns) atau None."""
+        if not self._count:
+            return None
+        key = (dev << 64) | ino
+        block = bisect.bisect_right(self._fences, key) - 1
+        if block < 0:
+            return None
+        lo = block * FENCE_EVERY
+        hi = min(lo + FENCE_EVERY, self._count)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            k = self._key(mid)
+            if k < key:
+                lo = mid + 1
+            elif k > key:
+                hi = mid
+            else:
+                return self._record(mid)
+        return None
+
+    def unchanged(self, st):
+        """True kalau file dengan stat `st` sama persis dengan pass sukses terakhir."""
+        return self.get(st.st_dev, st.st_ino) == stat_record(st)
+
+    @contextmanager
+    def _locked(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.lock_path, "a") as fh:
+            fcntl.flock(fh, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fh, fcntl.LOCK_UN)
+
+    @contextmanager
+    def exclusive_run(self):
+        """
+        Pastikan hanya satu sweep incremental per manifest yang berjalan.
+        Run kedua gagal cepat daripada memproses file yang sama dua kali.
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.run_lock_path, "a") as fh:
+            try:
+                fcntl.flock(fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                raise RuntimeError(f"Another encryption run is using manifest {self.path}")
+            try:
+                yield self
+            finally:
+                fcntl.flock(fh, fcntl.LOCK_UN)
+
+    def writer(self):
+        return ManifestWriter(self)
+
+
+class ManifestWriter:
+    """
+    Kumpulkan record untuk manifest berikutnya. Record di-sort per run
+    (maks SORT_RUN_RECORDS) dan di-spill ke file sementara, lalu di-merge
+    saat commit().
+    """
+
+    def __init__(self, manifest):
+        self.manifest = manifest
+        self.directory = os.path.dirname(os.path.abspath(manifest.path))
+        os.makedirs(self.directory, exist_ok=True)
+        self._buffer = []
+        self._runs = []
+
+    def add(self, record):
+        self._buffer.append(record)
+        if len(self._buffer) >= SORT_RUN_RECORDS:
+            self._spill()
+
+    def add_stat(self, st):
+        self.add(stat_record(st))
+
+    def _spill(self):
+        self._buffer.sort()
+        fd, path = tempfile.mkstemp(prefix=".manifest-run-", dir=self.directory)
+        with os.fdopen(fd, "wb") as fh:
+            for rec in self._buffer:
+                fh.write(RECORD.pack(*rec))
+        self._runs.append(path)
+        self._buffer = []
+
+    @staticmethod
+    def _iter_run(path):
+        with open(path, "rb") as fh:
+            while True:
+                block = fh.read(RECORD.size * 4096)
+                if not block:
+                    return
+                yield from RECORD.iter_unpack(block)
+
+    def discard(self):
+        for path in self._runs:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+        self._runs, self._buffer = [], []
+
+    def commit(self):
+        """Merge semua run, tulis manifest baru, publish atomic. Return jumlah record."""
+        self._buffer.sort()
+        sources = [iter(self._buffer)] + [self._iter_run(p) for p in self._runs]
+        fd, tmp = tempfile.mkstemp(prefix=".manifest-", dir=self.directory)
+        count = 0
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(HEADER.pack(MAGIC, 0))
+                last = None
+                for rec in heapq.merge(*sources):
+                    if last is not None and rec[:2] == last:
+                        continue  # hardlink: inode yang sama cukup sekali
+                    last = rec[:2]
+                    fh.write(RECORD.pack(*rec))
+                    count += 1
+                fh.seek(0)
+                fh.write(HEADER.pack(MAGIC, count))
+                fh.flush()
+                os.fsync(fh.fileno())
+            with self.manifest._locked():
+                os.replace(tmp, self.manifest.path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+        finally:
+            self.discard()
+        logger.info("Asset manifest %s updated (%d entries)", self.manifest.path, count)
+        return count
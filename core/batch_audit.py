@@ -0,0 +1,112 @@
+# core/batch_audit.py
+import json
+import os
+import sys
+from core.compatibility_checker import CompatibilityChecker
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# key kernel yang diterima di record host (snapshot dari fleet)
+KERNEL_KEYS = ("Kernel", "Kernel Version", "kernel", "kernel_version")
+
+
+class BatchAuditor:
+    """
+    Evaluasi offline banyak snapshot host sekaligus.
+
+    Record host berbentuk output HostInfoCollector.collect() ditambah kernel
+    version. Matrix dan support status PDF dimuat sekali di awal, lalu setiap
+    host hanya melakukan lookup index.
+    """
+
+    def __init__(self, checker=None):
+        self.checker = checker or CompatibilityChecker()
+        self.index = self.checker.get_kernel_index()
+        self.support_data = self.checker.parse_cte_support_status()
+
+    @staticmethod
+    def iter_records(source):
+        """
+        Yield (origin, record) dari:
+        - "-"           : NDJSON dari stdin
+        - direktori     : setiap *.json (satu record) / *.ndjson di dalamnya
+        - file          : NDJSON (satu record per baris)
+        """
+        if source == "-":
+            yield from BatchAuditor._iter_ndjson(sys.stdin, "<stdin>")
+            return
+
+        if os.path.isdir(source):
+            for name in sorted(os.listdir(source)):
+                path = os.path.join(source, name)
+                if name.endswith(".ndjson") or name.endswith(".jsonl"):
+                    with open(path) as fh:
+                        yield from BatchAuditor._iter_ndjson(fh, path)
+                elif name.endswith(".json"):
+                    try:
+                        with open(path) as fh:
+                            yield path, json.load(fh)
+                    except ValueError as e:
+                        yield path, {"_error": f"invalid JSON: {e}"}
+            return
+
+        with open(source) as fh:
+            yield from BatchAuditor._iter_ndjson(fh, source)
+
+    @staticmethod
+    def _iter_ndjson(fh, origin):
+        for lineno, line in enumerate(fh, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield f"{origin}:{lineno}", json.loads(line)
+            except ValueError as e:
+                yield f"{origin}:{lineno}", {"_error": f"invalid JSON: {e}"}
+
+    def evaluate(self, record, origin=None):
+        """Evaluasi satu record host, hasilnya dict siap di-dump ke NDJSON."""
+        if not isinstance(record, dict):
+            return {
+                "source": origin, "hostname": None, "operating_system": None, "kernel": None,
+                "compatible": False, "matches": [],
+                "reason": f"invalid record: expected JSON object, got {type(record).__name__}",
+            }
+        result = {
+            "source": origin,
+            "hostname": record.get("Hostname"),
+            "operating_system": record.get("Operating System"),
+        }
+        if "_error" in record:
+            result.update({"kernel": None, "compatible": False, "reason": record["_error"], "matches": []})
+            return result
+
+        kernel = next((record[k] for k in KERNEL_KEYS if record.get(k)), None)
+        result["kernel"] = kernel
+        if kernel is not None and not isinstance(kernel, str):
+            result.update({"compatible": False, "reason": "Kernel version is not a string", "matches": []})
+            return result
+        if not kernel:
+            result.update({"compatible": False, "reason": "Kernel version missing", "matches": []})
+            return result
+
+        rows = self.checker.build_support_rows(self.index, self.support_data, kernel)
+        summary = self.checker.summarize_compatibility(rows)
+        result.update({"compatible": summary["compatible"], "reason": summary["reason"], "matches": rows})
+        return result
+
+    def run(self, source, out):
+        """Stream hasil sebagai NDJSON ke file object `out`. Return ringkasan jumlah."""
+        counts = {"total": 0, "compatible": 0, "incompatible": 0}
+        for origin, record in self.iter_records(source):
+            result = self.evaluate(record, origin)
+            out.write(json.dumps(result) + "\n")
+            counts["total"] += 1
+            counts["compatible" if result["compatible"] else "incompatible"] += 1
+        out.flush()
+        logger.info(
+            f"Batch audit finished: {counts['total']} hosts, "
+            f"{counts['compatible']} compatible, {counts['incompatible']} not compatible"
+        )
+        return counts
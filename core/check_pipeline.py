@@ -0,0 +1,89 @@
+# core/check_pipeline.py
+from concurrent.futures import ThreadPoolExecutor
+from core.compatibility_checker import CompatibilityChecker
+from core.environment import EnvironmentManager
+from core.host_info import HostInfoCollector
+from core.logger import get_logger
+from core.repository import RepositoryManager
+from utils import config
+
+logger = get_logger(__name__)
+
+
+class CheckPipeline:
+    """
+    Pipeline untuk `--check`. Langkah yang tidak saling bergantung jalan
+    bersamaan di thread pool:
+
+        system info ─┐
+        repo URL ────┤
+        matrix ──────┼─► tabel kompatibilitas ─► summary
+        PDF status ──┘
+        host probes ───────────────────────────► tabel host
+
+    Hasil hanya di-join di titik yang dibutuhkan summary, jadi latency total
+    kira-kira sama dengan dependency paling lambat.
+    """
+
+    def __init__(self, snapshot_path=None, cm_domain="example.com", max_workers=6):
+        # sama seperti CompatibilityChecker: --snapshot atau env CTE_SNAPSHOT
+        self.snapshot_path = snapshot_path or config.SNAPSHOT_PATH
+        self.cm_domain = cm_domain
+        self.max_workers = max_workers
+        self.repo = RepositoryManager()
+        self.compat = CompatibilityChecker(snapshot_path=self.snapshot_path)
+
+    def run(self):
+        """
+        Jalankan semua langkah dan return dict:
+        system, repo_url, kernel, table, summary, host_info.
+        Error repo URL tetap fatal kecuali memakai snapshot offline.
+        """
+        pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        futures = []
+        try:
+            def submit(fn, *args):
+                futures.append(pool.submit(fn, *args))
+                return futures[-1]
+
+            f_system = submit(EnvironmentManager.check_system_info)
+            f_repo = submit(self.repo.fetch_active_repo_url)
+            f_index = submit(self.compat.get_kernel_index)
+            f_support = submit(self.compat.parse_cte_support_status)
+            f_host = submit(HostInfoCollector().collect, self.cm_domain)
+
+            result = {"system": f_system.result()}
+            result["kernel"] = result["system"].get("kernel") or self.compat.get_kernel_version()
+            logger.info(f"Detected kernel version: {result['kernel']}")
+
+            try:
+                result["repo_url"] = f_repo.result()
+                logger.info(f"Active repository URL detected: {result['repo_url']}")
+            except Exception as e:
+                # host air-gapped dengan snapshot tetap bisa lanjut
+                if not self.snapshot_path:
+                    raise
+                logger.warning(f"Repository info unavailable ({e}); continuing with offline snapshot")
+                result["repo_url"] = None
+
+            try:
+                index, support_data = f_index.result(), f_support.result()
+                table = self.compat.build_support_rows(index, support_data, result["kernel"]) or None
+                if table is None:
+                    logger.warning(f"No entry found for kernel: {result['kernel']}")
+            except Exception as e:
+                logger.error(f"Failed to load compatibility data: {e}")
+                table = None
+            result["table"] = table
+            result["summary"] = self.compat.summarize_compatibility(table) if table else None
+
+            result["host_info"] = f_host.result()
+        except BaseException:
+            # error fatal: jangan tunggu langkah lain, batalkan yang belum jalan
+            # (cancel manual: cancel_futures baru ada di Python 3.9)
+            for future in futures:
+                future.cancel()
+            pool.shutdown(wait=False)
+            raise
+        pool.shutdown()
+        return result
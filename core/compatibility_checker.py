@@ -1,11 +1,13 @@
 # core/compatibility_checker.py
-import requests
-import pdfplumber
-import re
-import json
+import os
+import hashlib
 import warnings
-from utils.command import run_shell
 from utils import config
+from utils import tracing
+from utils.fileio import atomic_write_json, read_json
+from core import host_facts
+from core.kernel_index import KernelIndex
+from core.snapshot import CompatibilitySnapshot
 from core.logger import get_logger
 
 logger = get_logger(__name__)
@@ -14,75 +16,151 @@ warnings.filterwarnings("ignore", message="Could get FontBBox")
 import logging
 logging.getLogger("pdfminer").setLevel(logging.ERROR)
 
+# Naikkan setiap kali logika parsing PDF berubah, supaya cache lama tidak dipakai
+SUPPORT_STATUS_PARSER_VERSION = 2
+
+
 class CompatibilityChecker:
     def __init__(self,
-                 json_url="https://packages.vormetric.com/pub/cte_compatibility_matrix.json",
-                 pdf_path="./data/cte_release_status.pdf"):
+                 json_url=config.COMPAT_MATRIX_URL,
+                 pdf_path="./data/cte_release_status.pdf",
+                 snapshot_path=None):
         self.json_url = json_url
         self.pdf_path = pdf_path
+        self._kernel_index = None
+        self.snapshot = None
+        snapshot_path = snapshot_path or config.SNAPSHOT_PATH
+        if snapshot_path:
+            self.snapshot = CompatibilitySnapshot(snapshot_path)
+            logger.info(f"Using offline compatibility snapshot {snapshot_path} "
+                        f"(built {self.snapshot.meta.get('built_at')})")
 
     # === Ambil kernel version ===
     def get_kernel_version(self):
-        out = run_shell("uname -r")
-        return out.strip()
+        return host_facts.get("kernel_release")
 
     # === Ambil matrix JSON dari Thales ===
+    @tracing.traced("compat.matrix_fetch")
     def fetch_cte_compatibility(self):
+        from utils.http_cache import get_http_cache
+
         logger.info(f"Fetching CTE compatibility matrix from {self.json_url}")
-        resp = requests.get(self.json_url, timeout=15)
+        resp = get_http_cache().get(self.json_url, ttl=config.COMPAT_MATRIX_TTL, timeout=15,
+                                    stale_ttl=config.COMPAT_MATRIX_STALE_TTL)
         resp.raise_for_status()
         return resp.json()
 
-    # === Parse PDF support status ===
+    # === Index kernel dari matrix (dibangun sekali per checker) ===
+    @tracing.traced("compat.index_build")
+    def get_kernel_index(self):
+        if self._kernel_index is None and self.snapshot is not None:
+            self._kernel_index = self.snapshot.kernel_index()
+        if self._kernel_index is None:
+            self._kernel_index = KernelIndex(self.fetch_cte_compatibility())
+            logger.debug(f"Kernel index built with {len(self._kernel_index)} records")
+        return self._kernel_index
+
+    # === Fingerprint PDF (hash + size + mtime + versi parser) ===
+    def _support_status_fingerprint(self):
+        st = os.stat(self.pdf_path)
+        sha = hashlib.sha256()
+        with open(self.pdf_path, "rb") as fh:
+            for block in iter(lambda: fh.read(1024 * 1024), b""):
+                sha.update(block)
+        return {
+            "sha256": sha.hexdigest(),
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "parser_version": SUPPORT_STATUS_PARSER_VERSION,
+        }
+
+    def _support_status_cache_path(self):
+        return f"{self.pdf_path}.status.json"
+
+    # === Parse PDF support status (dengan sidecar cache) ===
+    @tracing.traced("compat.support_status")
     def parse_cte_support_status(self):
-        logger.info(f"Parsing CTE release support status from {self.pdf_path}")
-        results = {}
-        pattern = re.compile(r"^(\d+\.\d+\.\d+)\s+[\dA-Za-z-]+\s+([A-Za-z\s]+)$")
-
-        with pdfplumber.open(self.pdf_path) as pdf:
-            for page in pdf.pages:
-                text = page.extract_text()
-                if not text:
-                    continue
-                for line in text.splitlines():
-                    match = pattern.match(line.strip())
-                    if match:
-                        version, status = match.groups()
-                        results[version.strip()] = status.strip()
+        if self.snapshot is not None:
+            return self.snapshot.support_status()
+
+        cache_path = self._support_status_cache_path()
+        fingerprint = self._support_status_fingerprint()
 
+        cached = read_json(cache_path)
+        if cached and cached.get("fingerprint") == fingerprint:
+            logger.info(f"Using cached CTE release support status from {cache_path}")
+            return cached["status"]
+
+        results = self._parse_pdf_support_status()
+        try:
+            atomic_write_json(cache_path, {"fingerprint": fingerprint, "status": results})
+        except OSError as e:
+            logger.debug(f"Could not write support status cache {cache_path}: {e}")
+        return results
+
+    @tracing.traced("compat.pdf_parse")
+    def _parse_pdf_support_status(self, mode=None):
+        # pdfplumber berat, hanya di-import kalau cache tidak valid;
+        # mode "targeted" hanya extract page tabel secara paralel (core/pdf_status.py)
+        from core.pdf_status import parse_support_status
+
+        mode = mode or config.PDF_PARSE_MODE
+        logger.info(f"Parsing CTE release support status from {self.pdf_path} ({mode})")
+        return parse_support_status(self.pdf_path, mode=mode, workers=config.PDF_PARSE_WORKERS)
+
+    # === Compile matrix + PDF ke snapshot offline ===
+    def build_snapshot(self, out_path):
+        matrix = self.fetch_cte_compatibility()
+        support_data = self.parse_cte_support_status()
+        return CompatibilitySnapshot.build(out_path, matrix, support_data, sources={
+            "matrix_url": self.json_url,
+            "pdf_sha256": self._support_status_fingerprint()["sha256"],
+        })
+
+    # === Gabungkan hasil index + support status PDF jadi baris tabel ===
+    @staticmethod
+    def build_support_rows(index, support_data, kernel_version):
+        return CompatibilityChecker.support_rows(index.lookup(kernel_version), support_data)
+
+    @staticmethod
+    def support_rows(records, support_data):
+        results = []
+        for k in records:
+            compat = "Active" if k.end == "0" else f"Supported until {k.end}"
+            cte_version_base = '.'.join(k.start.split('.')[:3])
+            support_status = support_data.get(cte_version_base, "Unknown")
+
+            results.append({
+                "OS": k.os,
+                "CTE Start": k.start,
+                "CTE End": k.end,
+                "Compatibility": compat,
+                "Support Status": support_status
+            })
         return results
 
     # === Cek kernel di JSON matrix + tambahkan support PDF ===
     def check_kernel_support(self, kernel_version):
         try:
-            data = self.fetch_cte_compatibility()
+            index = self.get_kernel_index()
             support_data = self.parse_cte_support_status()
         except Exception as e:
             logger.error(f"Failed to load compatibility data: {e}")
             return None
 
-        results = []
-        for os_entry in data["MAPPING"]:
-            for k in os_entry["KERNEL"]:
-                if kernel_version in k["NUM"]:
-                    compat = "Active" if k["END"] == "0" else f"Supported until {k['END']}"
-                    cte_version_base = '.'.join(k["START"].split('.')[:3])
-                    support_status = support_data.get(cte_version_base, "Unknown")
-
-                    results.append({
-                        "OS": os_entry["OS"],
-                        "CTE Start": k["START"],
-                        "CTE End": k["END"],
-                        "Compatibility": compat,
-                        "Support Status": support_status
-                    })
-
+        results = self.build_support_rows(index, support_data, kernel_version)
         if not results:
             logger.warning(f"No entry found for kernel: {kernel_version}")
             return None
 
         return results
 
+    # === Banyak kernel sekaligus (pre-upgrade), lihat core/kernel_query.py ===
+    def check_kernels(self, kernels):
+        from core.kernel_query import BulkKernelQuery
+
+        return BulkKernelQuery(self).query(kernels)
+
     # === Cetak hasil dalam tabel rapi ===
     def print_table(self, results):
         if not results:
@@ -106,7 +184,7 @@ class CompatibilityChecker:
             return {"compatible": False, "reason": "Kernel not found"}
 
         # Jika salah satu masih Active → dianggap compatible
-        active = any("Active" in r["Compatibility"] or "Active" in r["Support"] for r in results)
+        active = any("Active" in r["Compatibility"] or "Active" in r["Support Status"] for r in results)
         if active:
             return {"compatible": True, "reason": "CTE version still active"}
         return {"compatible": False, "reason": "End of Support"}
@@ -0,0 +1,301 @@
+# core/delta.py
+"""
+Delta update ala zsync untuk installer .bin.
+
+Publisher menaruh block map `<bin>.blockmap` di samping binary:
+
+    python -m core.delta vee-fs-7.8.0.100-rh8-x86_64.bin
+
+Block map berisi ukuran file, SHA-256 penuh, dan per block (ukuran tetap)
+checksum lemah adler32 (bisa di-roll) + checksum kuat blake2b. Client
+menggeser window adler32 di atas installer lama dari artifact store; block
+yang cocok disalin lokal, hanya range yang berubah diambil lewat HTTP Range.
+File hasil rekonstruksi diverifikasi SHA-256 end to end.
+"""
+import argparse
+import hashlib
+import math
+import mmap
+import os
+import zlib
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import requests
+from core.downloader import RangedDownloader
+from core.logger import get_logger
+from utils import config
+from utils.exceptions import DigestMismatchError, DownloadError
+from utils.fileio import atomic_write_json
+from utils.http_client import http_get
+
+logger = get_logger(__name__)
+
+BLOCKMAP_FORMAT_VERSION = 1
+BLOCKMAP_SUFFIX = ".blockmap"
+_ADLER_MOD = 65521
+# range berdekatan yang jaraknya <= ini digabung jadi satu request
+_RANGE_MERGE_GAP = 64 * 1024
+
+
+def _strong(data):
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def build_block_map(data, block_size=None):
+    """Block map untuk buffer `data` (bytes / mmap), sebagai dict siap di-dump JSON."""
+    block_size = block_size or config.DELTA_BLOCK_SIZE
+    view = memoryview(data)
+    blocks = []
+    for offset in range(0, len(view), block_size):
+        block = view[offset:offset + block_size]
+        blocks.append([zlib.adler32(block), _strong(block)])
+    return {
+        "format_version": BLOCKMAP_FORMAT_VERSION,
+        "size": len(view),
+        "block_size": block_size,
+        "sha256": hashlib.sha256(view).hexdigest(),
+        "blocks": blocks,
+    }
+
+
+def write_block_map(path, block_size=None):
+    """Tulis `<path>.blockmap` untuk file `path`. Return path block map."""
+    out = f"{path}{BLOCKMAP_SUFFIX}"
+    with open(path, "rb") as fh:
+        size = os.fstat(fh.fileno()).st_size
+        if size == 0:
+            blockmap = build_block_map(b"", block_size)
+        else:
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                blockmap = build_block_map(data, block_size)
+    atomic_write_json(out, blockmap)
+    return out
+
+
+def match_blocks(blockmap, seed, min_reuse=0.0, max_scan_bytes=None):
+    """
+    Cari block target di buffer `seed` dengan rolling adler32.
+    Return dict index block -> offset di seed. Block terakhir yang tidak
+    penuh selalu diambil dari network.
+
+    Geser per byte berjalan di Python, jadi scan berhenti lebih awal kalau
+    `min_reuse` (fraksi ukuran target) tidak mungkin lagi tercapai dengan
+    sisa seed, atau setelah `max_scan_bytes` byte digeser (default
+    config.DELTA_MAX_SCAN_BYTES). Block yang belum ketemu diambil dari network.
+    """
+    block_size = blockmap["block_size"]
+    full_blocks = blockmap["size"] // block_size
+    max_scan_bytes = config.DELTA_MAX_SCAN_BYTES if max_scan_bytes is None else max_scan_bytes
+    weak_table = {}
+    for i, (weak, _) in enumerate(blockmap["blocks"][:full_blocks]):
+        weak_table.setdefault(weak, []).append(i)
+
+    found = {}
+    if not weak_table or len(seed) < block_size:
+        return found
+
+    needed = math.ceil(min_reuse * blockmap["size"] / block_size)
+    # satu window bisa cocok dengan beberapa block identik sekaligus
+    per_window = max(Counter(tuple(b) for b in blockmap["blocks"][:full_blocks]).values())
+
+    def reachable(pos):
+        windows = (len(seed) - pos) // block_size
+        return len(found) + min(full_blocks - len(found), windows * per_window) >= needed
+
+    view = memoryview(seed)
+    last = len(seed) - block_size
+    pos = 0
+    rolled = 0
+    weak = None
+    while pos <= last:
+        if weak is None:
+            # window baru: hitung penuh di C, bukan per byte
+            weak = zlib.adler32(view[pos:pos + block_size])
+        candidates = weak_table.get(weak)
+        if candidates:
+            strong = _strong(view[pos:pos + block_size])
+            hits = [i for i in candidates if blockmap["blocks"][i][1] == strong]
+            if hits:
+                # block identik (mis. padding) cukup disalin dari kemunculan pertama
+                for i in hits:
+                    found.setdefault(i, pos)
+                pos += block_size
+                weak = None
+                if not reachable(pos):
+                    break
+                continue
+        if pos == last or rolled >= max_scan_bytes or not reachable(pos):
+            break
+        # geser window per byte (rumus rolling adler32) sampai ada kandidat
+        # weak, maksimal satu block sebelum batas scan dicek lagi
+        stop = min(last, pos + block_size, pos + max_scan_bytes - rolled)
+        a, b = weak & 0xFFFF, weak >> 16
+        begin = pos
+        while pos < stop:
+            out_byte, in_byte = seed[pos], seed[pos + block_size]
+            a = (a - out_byte + in_byte) % _ADLER_MOD
+            b = (b - block_size * out_byte + a - 1) % _ADLER_MOD
+            pos += 1
+            if ((b << 16) | a) in weak_table:
+                break
+        rolled += pos - begin
+        weak = (b << 16) | a
+    if pos < last:
+        logger.debug("Block search stopped at %d/%d seed bytes (%d blocks found, %d bytes rolled)",
+                     pos, len(seed), len(found), rolled)
+    return found
+
+
+def missing_ranges(blockmap, found):
+    """Range byte (start, end inklusif) yang harus di-download, sudah digabung."""
+    block_size, size = blockmap["block_size"], blockmap["size"]
+    ranges = []
+    for i in range(len(blockmap["blocks"])):
+        if i in found:
+            continue
+        start, end = i * block_size, min((i + 1) * block_size, size) - 1
+        if ranges and start - ranges[-1][1] - 1 <= _RANGE_MERGE_GAP:
+            ranges[-1][1] = end
+        else:
+            ranges.append([start, end])
+    return [tuple(r) for r in ranges]
+
+
+class DeltaFetcher:
+    """
+    Rekonstruksi installer baru dari installer lama + range yang berubah.
+    `fetch` return None kalau delta tidak bisa dipakai (tidak ada block map,
+    reuse terlalu kecil); pemanggil lalu jatuh ke RangedDownloader biasa.
+    """
+
+    def __init__(self, workers=None, timeout=30, min_reuse=None):
+        self.workers = workers or config.DOWNLOAD_SEGMENTS
+        self.timeout = timeout
+        self.min_reuse = config.DELTA_MIN_REUSE if min_reuse is None else min_reuse
+
+    def _fetch_block_map(self, urls):
+        for url in urls:
+            try:
+                resp = http_get(f"{url}{BLOCKMAP_SUFFIX}", timeout=10, retries=False)
+                if resp.status_code == 200:
+                    blockmap = resp.json()
+                    if blockmap.get("format_version") == BLOCKMAP_FORMAT_VERSION:
+                        return blockmap
+                    logger.debug("Unsupported block map format from %s", url)
+                    return None
+            except (requests.RequestException, ValueError) as e:
+                logger.debug("No block map at %s: %s", url, e)
+        return None
+
+    def _fetch_range(self, urls, start, end, size, fd):
+        headers = {"Range": f"bytes={start}-{end}"}
+        last_error = None
+        for url in urls:
+            try:
+                with http_get(url, headers=headers, stream=True, timeout=self.timeout) as r:
+                    if r.status_code != 206 or not r.headers.get("Content-Range", "").endswith(f"/{size}"):
+                        raise DownloadError(f"Range request not honoured by {url} (HTTP {r.status_code})")
+                    offset = start
+                    for chunk in r.iter_content(chunk_size=256 * 1024):
+                        if offset + len(chunk) > end + 1:
+                            raise DownloadError("Server sent more data than requested")
+                        os.pwrite(fd, chunk, offset)
+                        offset += len(chunk)
+                if offset != end + 1:
+                    raise DownloadError(f"Range {start}-{end} ended early")
+                return end - start + 1
+            except (requests.RequestException, DownloadError) as e:
+                logger.warning("Delta range %d-%d failed on %s: %s", start, end, url, e)
+                last_error = e
+        raise DownloadError(f"Delta range {start}-{end} failed on all mirrors: {last_error}")
+
+    def fetch(self, url, seed_path, dest, expected_sha256=None, mirrors=()):
+        """
+        Bangun `dest` dari `seed_path` + range yang berubah. Return
+        (Path, sha256, stats) atau None kalau delta tidak layak.
+        """
+        urls = [url] + [m for m in mirrors if m != url]
+        blockmap = self._fetch_block_map(urls)
+        if blockmap is None:
+            logger.info("No block map published for %s; delta update unavailable", url)
+            return None
+
+        size = blockmap["size"]
+        # digest independen (pinned / `<url>.sha256`) harus sama dengan block map
+        expected = RangedDownloader().resolve_expected_digest(url, expected_sha256)
+        if expected and expected != blockmap["sha256"]:
+            raise DigestMismatchError(f"Block map for {url} does not match the expected SHA-256")
+
+        with open(seed_path, "rb") as fh:
+            seed_size = os.fstat(fh.fileno()).st_size
+            if seed_size == 0:
+                return None
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as seed:
+                found = match_blocks(blockmap, seed, min_reuse=self.min_reuse)
+                reused = len(found) * blockmap["block_size"]
+                if size and reused / size < self.min_reuse:
+                    logger.info("Only %.0f%% of %s reusable from %s; using full download",
+                                reused * 100 / size, url, seed_path)
+                    return None
+
+                dest = Path(dest)
+                dest.parent.mkdir(parents=True, exist_ok=True)
+                part = Path(f"{dest}.delta")
+                fd = os.open(str(part), os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+                try:
+                    os.ftruncate(fd, size)
+                    block_size = blockmap["block_size"]
+                    for i, seed_offset in found.items():
+                        os.pwrite(fd, seed[seed_offset:seed_offset + block_size], i * block_size)
+                    ranges = missing_ranges(blockmap, found)
+                    logger.info("Delta update: reusing %d/%d blocks, fetching %d range(s)",
+                                len(found), len(blockmap["blocks"]), len(ranges))
+                    with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                        fetched = sum(pool.map(lambda r: self._fetch_range(urls, r[0], r[1], size, fd), ranges))
+                    os.fsync(fd)
+                except BaseException:
+                    # seperti downloader penuh: jangan tinggalkan file setengah jadi
+                    _discard(part)
+                    raise
+                finally:
+                    os.close(fd)
+
+        try:
+            digest = _sha256_file(part)
+            if digest != blockmap["sha256"]:
+                raise DigestMismatchError(f"Delta reconstruction of {url} failed verification ({digest})")
+            os.replace(part, dest)
+        except BaseException:
+            _discard(part)
+            raise
+        logger.info("SHA-256 verified: %s (%d of %d bytes downloaded)", digest, fetched, size)
+        return dest, digest, {"size": size, "reused_bytes": size - fetched, "fetched_bytes": fetched}
+
+
+def _discard(path):
+    try:
+        path.unlink()
+    except OSError:
+        pass
+
+
+def _sha256_file(path):
+    sha = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(1024 * 1024), b""):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate <file>.blockmap for delta installer updates")
+    parser.add_argument("files", nargs="+")
+    parser.add_argument("--block-size", type=int, default=None, help="bytes per block (default: config)")
+    args = parser.parse_args(argv)
+    for path in args.files:
+        print(write_block_map(path, args.block_size))
+
+
+if __name__ == "__main__":
+    main()
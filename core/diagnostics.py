@@ -0,0 +1,309 @@
+# core/diagnostics.py
+"""
+Rules engine untuk `--fix`.
+
+Fact = data host yang dikumpulkan sekali (module ter-load, kernel headers,
+status service, koneksi ke CM, disk, file registrasi agent). Rule hanya
+membaca fact yang dideklarasikan di `facts` dan mengembalikan Finding.
+
+Fact yang tidak saling bergantung dikumpulkan paralel di thread pool, rule
+dievaluasi segera setelah semua fact-nya tersedia. Satu fact dipakai
+bersama oleh banyak rule, jadi menambah rule tidak menambah probe.
+"""
+import glob
+import os
+import shutil
+import socket
+import subprocess
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from core import host_facts, probes
+from core.logger import get_logger
+from utils import config
+from utils import tracing
+
+logger = get_logger(__name__)
+
+OK, WARN, FAIL, UNKNOWN = "OK", "WARN", "FAIL", "UNKNOWN"
+
+# status -> kode, untuk urutan tabel (paling parah di atas)
+SEVERITY = {FAIL: 0, WARN: 1, UNKNOWN: 2, OK: 3}
+
+CTE_MODULE_PATTERNS = ("vee", "secfs")
+CTE_SERVICES = ("secfs2", "vmd")
+AGENT_DIR = "/opt/vormetric/DataSecurityExpert/agent"
+
+Fact = namedtuple("Fact", "name collect deps")
+Rule = namedtuple("Rule", "name facts check remedy")
+Finding = namedtuple("Finding", "rule status message remedy")
+
+FACTS = {}
+RULES = []
+
+
+def fact(name, deps=()):
+    """Daftarkan collector fact; argumen collector = nilai `deps` (urut)."""
+    def register(fn):
+        FACTS[name] = Fact(name, fn, tuple(deps))
+        return fn
+    return register
+
+
+def rule(name, facts, remedy=None):
+    """
+    Daftarkan rule. `check(*fact_values)` return (status, message).
+    `remedy` = shell command perbaikan, dijalankan `IssueResolver` bila FAIL
+    (rule tanpa perbaikan otomatis cukup menjelaskan masalah di message).
+    """
+    def register(fn):
+        RULES.append(Rule(name, tuple(facts), fn, remedy))
+        return fn
+    return register
+
+
+# ========================
+# FACTS
+# ========================
+
+@fact("kernel_release")
+def _kernel_release():
+    return host_facts.get("kernel_release")
+
+
+@fact("loaded_modules")
+def _loaded_modules():
+    return probes.loaded_modules()
+
+
+@fact("kernel_headers", deps=("kernel_release",))
+def _kernel_headers(release):
+    """Versi kernel headers / devel yang terpasang + apakah build dir cocok."""
+    versions = set()
+    for pattern in ("/usr/src/kernels/*", "/usr/src/linux-headers-*"):
+        for path in glob.glob(pattern):
+            versions.add(os.path.basename(path).replace("linux-headers-", "", 1))
+    return {
+        "installed": sorted(versions),
+        "build_dir": os.path.exists(f"/lib/modules/{release}/build"),
+    }
+
+
+@fact("service_states")
+def _service_states():
+    """Status systemd untuk service CTE; None kalau systemctl tidak tersedia."""
+    if not shutil.which("systemctl"):
+        return None
+    proc = subprocess.run(
+        ["systemctl", "is-active", *CTE_SERVICES],
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+        universal_newlines=True, timeout=config.DIAGNOSTIC_FACT_TIMEOUT,
+    )
+    return dict(zip(CTE_SERVICES, proc.stdout.split()))
+
+
+@fact("cm_connect")
+def _cm_connect():
+    """(host, error) koneksi TCP ke CM:443; error None kalau berhasil."""
+    host = config.CM_DOMAIN
+    if not host:
+        return None
+    try:
+        socket.create_connection((host, 443), timeout=config.DIAGNOSTIC_FACT_TIMEOUT).close()
+        return host, None
+    except OSError as e:
+        return host, str(e)
+
+
+@fact("disk_free")
+def _disk_free():
+    free = {}
+    for path in config.DIAGNOSTIC_DISK_PATHS:
+        # path yang belum ada (mis. /opt/vormetric) diukur dari parent terdekat
+        probe = path
+        while not os.path.exists(probe):
+            probe = os.path.dirname(probe)
+        free[path] = shutil.disk_usage(probe).free
+    return free
+
+
+@fact("agent_files")
+def _agent_files():
+    return {
+        "installed": os.path.isdir(AGENT_DIR),
+        "conf": os.path.exists(os.path.join(AGENT_DIR, "vmd/etc/agent.conf")),
+        "cert": bool(glob.glob(os.path.join(AGENT_DIR, "vmd/pem/*.pem"))),
+    }
+
+
+# ========================
+# RULES
+# ========================
+
+@rule("CTE kernel module loaded", facts=("loaded_modules", "agent_files"), remedy="modprobe secfs2")
+def _rule_module(modules, agent):
+    found = [m for m in modules if any(p in m for p in CTE_MODULE_PATTERNS)]
+    if found:
+        return OK, "Loaded: " + ", ".join(found)
+    if not agent["installed"]:
+        return WARN, "CTE agent not installed; no module expected"
+    return FAIL, "CTE agent installed but no vee/secfs module loaded"
+
+
+@rule("Kernel headers match running kernel", facts=("kernel_release", "kernel_headers"))
+def _rule_headers(release, headers):
+    if release in headers["installed"] or headers["build_dir"]:
+        return OK, f"Headers present for {release}"
+    if headers["installed"]:
+        return FAIL, f"Running {release}; headers only for " + ", ".join(headers["installed"])
+    return FAIL, f"No kernel headers installed (running {release})"
+
+
+@rule("secfs service active", facts=("service_states", "agent_files"), remedy="systemctl restart secfs2")
+def _rule_secfs(states, agent):
+    if not agent["installed"]:
+        return WARN, "CTE agent not installed"
+    if states is None:
+        return UNKNOWN, "systemctl not available"
+    state = states.get("secfs2", "unknown")
+    return (OK if state == "active" else FAIL), f"secfs2 is {state}"
+
+
+@rule("vmd service active", facts=("service_states", "agent_files"), remedy="systemctl restart vmd")
+def _rule_vmd(states, agent):
+    if not agent["installed"]:
+        return WARN, "CTE agent not installed"
+    if states is None:
+        return UNKNOWN, "systemctl not available"
+    state = states.get("vmd", "unknown")
+    return (OK if state == "active" else FAIL), f"vmd is {state}"
+
+
+@rule("CipherTrust Manager reachable", facts=("cm_connect",))
+def _rule_cm(result):
+    if result is None:
+        return UNKNOWN, "CM domain not configured (set CTE_CM_DOMAIN)"
+    host, error = result
+    if error is None:
+        return OK, f"{host}:443 reachable"
+    return FAIL, f"{host}:443 unreachable: {error}"
+
+
+@rule("Free disk space", facts=("disk_free",))
+def _rule_disk(free):
+    low = [f"{p} ({b / 1048576:.0f} MiB)" for p, b in free.items() if b < config.DIAGNOSTIC_MIN_FREE_BYTES]
+    if low:
+        return FAIL, "Low free space: " + ", ".join(low)
+    return OK, "All paths above {:.0f} MiB free".format(config.DIAGNOSTIC_MIN_FREE_BYTES / 1048576)
+
+
+@rule("Agent registered with CM", facts=("agent_files",))
+def _rule_registration(agent):
+    if not agent["installed"]:
+        return WARN, "CTE agent not installed"
+    if agent["conf"] and agent["cert"]:
+        return OK, "Agent config and certificate present"
+    missing = [k for k in ("conf", "cert") if not agent[k]]
+    return FAIL, "Missing agent " + " and ".join(missing)
+
+
+class DiagnosticEngine:
+    def __init__(self, rules=None, facts=None, max_workers=8, timeout=None):
+        self.rules = list(RULES if rules is None else rules)
+        self.facts = dict(FACTS if facts is None else facts)
+        self.max_workers = max_workers
+        self.timeout = config.DIAGNOSTIC_TIMEOUT if timeout is None else timeout
+
+    def _needed_facts(self):
+        needed, stack = set(), [f for r in self.rules for f in r.facts]
+        while stack:
+            name = stack.pop()
+            if name not in needed:
+                needed.add(name)
+                stack.extend(self.facts[name].deps)
+        return needed
+
+    def _collect(self, name, args):
+        with tracing.span(f"diag.fact.{name}"):
+            return self.facts[name].collect(*args)
+
+    def _evaluate(self, r, values):
+        try:
+            status, message = r.check(*(values[f] for f in r.facts))
+        except Exception as e:
+            logger.error(f"Diagnostic rule '{r.name}' failed: {e}")
+            status, message = UNKNOWN, f"Rule error: {e}"
+        return Finding(r.name, status, message, r.remedy if status == FAIL else None)
+
+    @tracing.traced("diag.run")
+    def run(self):
+        """
+        Kumpulkan fact (masing-masing sekali, paralel sesuai dependency) lalu
+        evaluasi rule begitu fact-nya lengkap. Fact yang gagal / melewati
+        deadline membuat rule terkait UNKNOWN. Return list Finding.
+        """
+        pending = self._needed_facts()
+        values, errors, findings = {}, {}, {}
+        deadline = time.monotonic() + self.timeout
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        running = {}
+        try:
+            while True:
+                # submit fact yang semua dependency-nya sudah ada
+                for name in sorted(pending):
+                    deps = self.facts[name].deps
+                    if any(d in errors for d in deps):
+                        pending.discard(name)
+                        errors[name] = "dependency failed"
+                    elif all(d in values for d in deps):
+                        pending.discard(name)
+                        args = [values[d] for d in deps]
+                        running[executor.submit(self._collect, name, args)] = name
+
+                # rule yang fact-nya sudah lengkap langsung dievaluasi
+                for r in self.rules:
+                    if r.name in findings:
+                        continue
+                    failed = [f for f in r.facts if f in errors]
+                    if failed:
+                        findings[r.name] = Finding(r.name, UNKNOWN, f"Fact '{failed[0]}' unavailable: "
+                                                   f"{errors[failed[0]]}", None)
+                    elif all(f in values for f in r.facts):
+                        findings[r.name] = self._evaluate(r, values)
+
+                if not running:
+                    break
+                done, _ = wait(running, timeout=max(0.0, deadline - time.monotonic()),
+                               return_when=FIRST_COMPLETED)
+                if not done:
+                    for name in running.values():
+                        logger.warning(f"Diagnostic fact '{name}' timed out after {self.timeout}s")
+                        errors[name] = "timeout"
+                    running.clear()
+                    continue
+                for future in done:
+                    name = running.pop(future)
+                    if future.exception() is not None:
+                        logger.debug(f"Diagnostic fact '{name}' failed: {future.exception()}")
+                        errors[name] = str(future.exception())
+                    else:
+                        values[name] = future.result()
+        finally:
+            executor.shutdown(wait=False)
+
+        return sorted((findings[r.name] for r in self.rules), key=lambda f: SEVERITY[f.status])
+
+    @staticmethod
+    def print_table(findings):
+        headers = ["Rule", "Status", "Detail"]
+        rows = [{"Rule": f.rule, "Status": f.status, "Detail": f.message} for f in findings]
+        col_widths = [max(len(row[h]) for row in rows + [dict(zip(headers, headers))]) for h in headers]
+        sep = "╬".join("═" * (w + 2) for w in col_widths)
+
+        print("╔" + sep.replace("╬", "╦") + "╗")
+        print("║ " + " ║ ".join(headers[i].ljust(col_widths[i]) for i in range(len(headers))) + " ║")
+        print("╠" + sep.replace("╬", "╬") + "╣")
+        for r in rows:
+            print("║ " + " ║ ".join(r[h].ljust(col_widths[i]) for i, h in enumerate(headers)) + " ║")
+        print("╚" + sep.replace("╬", "╩") + "╝")
@@ -0,0 +1,313 @@
+# core/downloader.py
+import math
+import os
+import re
+import threading
+import time
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import requests
+from core.logger import get_logger
+from utils import config
+from utils.exceptions import DownloadError
+from utils.fileio import atomic_write_json, read_json
+from utils.http_client import http_get, http_head
+
+logger = get_logger(__name__)
+
+CHUNK_SIZE = 256 * 1024
+JOURNAL_INTERVAL = 1.0
+
+
+class _InOrderHasher:
+    """
+    SHA-256 yang di-update sesuai urutan offset file.
+
+    SHA-256 hanya bisa dihitung berurutan dan digest pembanding (`<url>.sha256`,
+    PINNED_SHA256) adalah digest seluruh file, jadi hash per segment tidak bisa
+    digabung menjadi digest itu. Chunk di posisi cursor langsung di-hash dari
+    memory; chunk segment lain di depan cursor disimpan di buffer sampai
+    `max_buffer` byte. Sisanya baru di-hash saat cursor sampai ke sana, dengan
+    dibaca ulang dari page cache. Untuk artifact jauh di atas buffer, dengan n
+    segment itu bisa mencapai (n-1)/n ukuran file (dicatat di `reread_bytes`).
+    """
+
+    def __init__(self, fd, max_buffer=None):
+        self.fd = fd
+        self.sha = hashlib.sha256()
+        self.offset = 0
+        self.lock = threading.Lock()
+        self.max_buffer = config.DOWNLOAD_HASH_BUFFER_BYTES if max_buffer is None else max_buffer
+        self.pending = {}  # offset -> chunk di depan cursor
+        self.buffered = 0
+        self.reread_bytes = 0
+
+    def written(self, offset, data, frontier):
+        with self.lock:
+            if offset == self.offset:
+                self.sha.update(data)
+                self.offset += len(data)
+            elif offset > self.offset and self.buffered + len(data) <= self.max_buffer:
+                self.pending[offset] = data
+                self.buffered += len(data)
+            self._catch_up(frontier)
+
+    def catch_up(self, frontier):
+        with self.lock:
+            self._catch_up(frontier)
+
+    def _catch_up(self, frontier):
+        while True:
+            data = self.pending.pop(self.offset, None)
+            if data is not None:
+                # sudah ditulis; aman di-hash walau di luar frontier
+                self.buffered -= len(data)
+                self.sha.update(data)
+                self.offset += len(data)
+                continue
+            if self.offset >= frontier:
+                return
+            # baca ulang hanya sampai chunk ter-buffer berikutnya
+            limit = min([frontier, self.offset + 1024 * 1024] + [o for o in self.pending if o > self.offset])
+            buf = os.pread(self.fd, limit - self.offset, self.offset)
+            if not buf:
+                raise DownloadError(f"Short read while hashing at offset {self.offset}")
+            self.sha.update(buf)
+            self.offset += len(buf)
+            self.reread_bytes += len(buf)
+
+    def hexdigest(self):
+        return self.sha.hexdigest()
+
+
+class RangedDownloader:
+    """
+    Download engine untuk artifact besar (installer .bin).
+
+    - dibagi menjadi beberapa HTTP Range segment, diambil paralel
+    - progress per segment dicatat di journal `<dest>.part.json`, jadi
+      download yang terputus dilanjutkan, bukan diulang dari nol
+    - SHA-256 dihitung sambil menulis dan dicocokkan dengan digest yang
+      di-pin / dipublikasi (`<url>.sha256`)
+    - `mirrors`: URL artifact yang sama di mirror lain; segment yang gagal
+      dilanjutkan dari offset terakhir di mirror berikutnya, tapi hanya kalau
+      isi mirror bisa dipastikan sama: digest SHA-256 diketahui (dicek di
+      akhir) atau validator origin dikirim sebagai If-Range dan cocok
+    """
+
+    def __init__(self, segments=None, min_segment_bytes=None, timeout=30):
+        self.segments = segments or config.DOWNLOAD_SEGMENTS
+        self.min_segment_bytes = min_segment_bytes or config.DOWNLOAD_MIN_SEGMENT_BYTES
+        self.timeout = timeout
+
+    # --- digest ---
+    def resolve_expected_digest(self, url, expected_sha256=None):
+        """Digest dari argumen, config.PINNED_SHA256, atau file `<url>.sha256`."""
+        if expected_sha256:
+            return expected_sha256.lower()
+        filename = url.rstrip("/").rsplit("/", 1)[-1]
+        if filename in config.PINNED_SHA256:
+            return config.PINNED_SHA256[filename].lower()
+        try:
+            resp = http_get(f"{url}.sha256", timeout=10)
+            if resp.status_code == 200:
+                m = re.search(r"\b([0-9a-fA-F]{64})\b", resp.text)
+                if m:
+                    return m.group(1).lower()
+        except requests.RequestException as e:
+            logger.debug("No published digest for %s: %s", url, e)
+        return None
+
+    def _probe(self, urls):
+        """
+        HEAD untuk ukuran, dukungan Range, dan validator (ETag/Last-Modified).
+        Mirror yang tidak menjawab dilewati; return juga urutan URL dengan
+        mirror yang menjawab di depan.
+        """
+        for i, url in enumerate(urls):
+            try:
+                resp = http_head(url, timeout=self.timeout, allow_redirects=True)
+                resp.raise_for_status()
+            except requests.RequestException as e:
+                logger.debug("HEAD failed for %s: %s", url, e)
+                continue
+            size = resp.headers.get("Content-Length")
+            ranges = resp.headers.get("Accept-Ranges", "").lower() == "bytes"
+            validator = resp.headers.get("ETag") or resp.headers.get("Last-Modified")
+            return (int(size) if size and size.isdigit() else None), ranges, validator, urls[i:] + urls[:i]
+        return None, False, None, urls
+
+    # --- API utama ---
+    def download(self, url, dest, expected_sha256=None, mirrors=()):
+        """Download `url` (fallback ke `mirrors`) ke `dest`. Return (Path, sha256 hex)."""
+        dest = Path(dest)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        part = Path(f"{dest}.part")
+        journal_path = Path(f"{dest}.part.json")
+        urls = [url] + [m for m in mirrors if m != url]
+
+        size, ranges, validator, urls = self._probe(urls)
+        expected = self.resolve_expected_digest(urls[0], expected_sha256)
+        if size and ranges:
+            digest = self._download_ranged(urls, part, journal_path, size, validator, expected)
+        else:
+            logger.info("Server does not support ranged download; using single stream")
+            digest = self._download_single(urls, part)
+
+        if expected and digest != expected:
+            for p in (part, journal_path):
+                try:
+                    p.unlink()
+                except OSError:
+                    pass
+            raise DownloadError(f"SHA-256 mismatch for {url}: expected {expected}, got {digest}")
+        if expected:
+            logger.info("SHA-256 verified: %s", digest)
+        else:
+            logger.warning("No published or pinned SHA-256 for %s; computed %s", url, digest)
+
+        os.replace(part, dest)
+        try:
+            journal_path.unlink()
+        except OSError:
+            pass
+        return dest, digest
+
+    def _download_single(self, urls, part):
+        for i, url in enumerate(urls):
+            sha = hashlib.sha256()
+            try:
+                with http_get(url, stream=True, timeout=self.timeout) as r:
+                    r.raise_for_status()
+                    with open(part, "wb") as fh:
+                        for chunk in r.iter_content(chunk_size=CHUNK_SIZE):
+                            if chunk:
+                                fh.write(chunk)
+                                sha.update(chunk)
+                return sha.hexdigest()
+            except requests.RequestException as e:
+                if i == len(urls) - 1:
+                    raise
+                logger.warning("Download from %s failed (%s); failing over to %s", url, e, urls[i + 1])
+
+    def _plan_segments(self, size):
+        count = max(1, min(self.segments, math.ceil(size / self.min_segment_bytes)))
+        step = math.ceil(size / count)
+        # [start, end_inclusive, done_bytes]
+        return [[start, min(start + step, size) - 1, 0] for start in range(0, size, step)]
+
+    def _download_ranged(self, urls, part, journal_path, size, validator, expected=None):
+        url = urls[0]
+        journal = read_json(journal_path)
+        if (
+            journal
+            and journal.get("url") == url
+            and journal.get("size") == size
+            and journal.get("validator") == validator
+            and part.exists()
+        ):
+            segments = journal["segments"]
+            done = sum(s[2] for s in segments)
+            logger.info("Resuming download at %d/%d bytes", done, size)
+        else:
+            segments = self._plan_segments(size)
+            with open(part, "wb") as fh:
+                fh.truncate(size)
+        logger.info("Downloading %d bytes in %d segment(s)", size, len(segments))
+
+        fd = os.open(str(part), os.O_RDWR)
+        state_lock = threading.Lock()
+        last_flush = [time.monotonic()]
+
+        def frontier():
+            for start, end, done in segments:
+                if start + done <= end:
+                    return start + done
+            return size
+
+        def flush_journal(force=False):
+            now = time.monotonic()
+            if not force and now - last_flush[0] < JOURNAL_INTERVAL:
+                return
+            last_flush[0] = now
+            os.fsync(fd)
+            atomic_write_json(journal_path, {
+                "url": url, "size": size, "validator": validator,
+                "segments": [list(s) for s in segments],
+            })
+
+        hasher = _InOrderHasher(fd)
+        # index mirror aktif, dipakai bersama semua segment
+        active = [0]
+
+        def fetch(seg):
+            while True:
+                with state_lock:
+                    current = active[0]
+                try:
+                    return fetch_from(urls[current], seg, current == 0)
+                except (requests.RequestException, DownloadError) as e:
+                    with state_lock:
+                        if active[0] == current:
+                            active[0] += 1
+                        if active[0] >= len(urls):
+                            raise
+                        if not expected and not validator:
+                            # tanpa digest maupun validator, byte dari mirror lain
+                            # tidak bisa dibuktikan berasal dari artifact yang sama
+                            raise DownloadError(
+                                f"Cannot fail over to another mirror mid-download: no SHA-256 digest "
+                                f"or validator for {url} ({e})")
+                        logger.warning("Segment %d-%d failed on %s (%s); failing over to %s",
+                                       seg[0], seg[1], urls[current], e, urls[active[0]])
+
+        def fetch_from(mirror, seg, primary):
+            start, end, done = seg
+            if start + done > end:
+                return
+            headers = {"Range": f"bytes={start + done}-{end}"}
+            # origin selalu dengan If-Range; mirror lain juga kalau tidak ada
+            # digest, supaya segment hanya disambung dari artifact yang sama
+            # (validator beda -> 200 bukan 206 -> mirror itu ditolak)
+            if validator and (primary or not expected):
+                headers["If-Range"] = validator
+            with http_get(mirror, headers=headers, stream=True, timeout=self.timeout) as r:
+                if r.status_code != 206:
+                    raise DownloadError(f"Range request not honoured (HTTP {r.status_code})")
+                if not r.headers.get("Content-Range", "").endswith(f"/{size}"):
+                    raise DownloadError(f"Artifact size differs on {mirror}")
+                offset = start + done
+                for chunk in r.iter_content(chunk_size=CHUNK_SIZE):
+                    if not chunk:
+                        continue
+                    if offset + len(chunk) > end + 1:
+                        raise DownloadError("Server sent more data than requested")
+                    os.pwrite(fd, chunk, offset)
+                    with state_lock:
+                        seg[2] += len(chunk)
+                        front = frontier()
+                        flush_journal()
+                    hasher.written(offset, chunk, front)
+                    offset += len(chunk)
+            if start + seg[2] <= end:
+                raise DownloadError(f"Segment {start}-{end} ended early")
+
+        try:
+            with ThreadPoolExecutor(max_workers=len(segments)) as pool:
+                futures = [pool.submit(fetch, seg) for seg in segments]
+                errors = []
+                for f in futures:
+                    try:
+                        f.result()
+                    except Exception as e:
+                        errors.append(e)
+            with state_lock:
+                flush_journal(force=True)
+            if errors:
+                raise DownloadError(f"Download interrupted, resumable from journal: {errors[0]}")
+            hasher.catch_up(size)
+            logger.debug("Hashed %d bytes, %d re-read from page cache", size, hasher.reread_bytes)
+        finally:
+            os.close(fd)
+        return hasher.hexdigest()
@@ -1,24 +1,163 @@
 # core/encrypt_asset.py
+import hashlib
+import json
+import os
+import tempfile
 from core.logger import get_logger
-from utils.command import run_shell
+from utils import config
 from pathlib import Path
+from core.asset_inventory import AssetInventoryScanner
+from core.asset_manifest import AssetManifest, stat_record
+from core.storage_profiler import StorageProfiler
+from core.encrypt_scheduler import EncryptScheduler
 
 logger = get_logger(__name__)
 
 class EncryptAssetManager:
     def __init__(self, candidate_paths=None):
-        # candidate folders to protect — adjust to your infra
-        self.candidate_paths = candidate_paths or ["/data", "/var/lib/mysql", "/backup"]
+        # candidate folders to protect — adjust to your infra (config / CTE_ENCRYPT_PATHS)
+        self.candidate_paths = candidate_paths or list(config.ENCRYPT_CANDIDATE_PATHS)
 
-    def auto_encrypt(self):
-        logger.info("Starting automatic asset encryption routine")
+    def inventory(self, workers=8):
+        """
+        Ukur data yang akan diproteksi di setiap candidate path
+        (lihat core/asset_inventory.py).
+        """
+        reports = AssetInventoryScanner(workers=workers).scan_all(self.candidate_paths)
+        for p, report in reports.items():
+            t = report["totals"]
+            logger.info(
+                "Inventory %s: %d files, %.1f MiB total, %.1f MiB allocated, %d sparse, %d hardlink duplicates",
+                p, t["files"], t["total_bytes"] / 1048576, t["allocated_bytes"] / 1048576,
+                t["sparse_files"], t["hardlink_duplicates"],
+            )
+        return reports
+
+    def estimate_transform(self, profiler=None):
+        """
+        Gabungkan inventory + profil storage menjadi perkiraan durasi
+        transform awal per candidate path.
+        """
+        reports = self.inventory()
+        profiles = (profiler or StorageProfiler()).profile_paths(list(reports))
+        estimates = {}
+        for p, report in reports.items():
+            t = report["totals"]
+            profile = profiles.get(p)
+            if not profile or not profile.get("measured"):
+                error = profile.get("error") if profile else "not profiled"
+                logger.warning("Cannot estimate initial transform for %s: storage unmeasured (%s)", p, error)
+                estimates[p] = {"estimated_seconds": None, "recommended_concurrency": None,
+                                "bytes": t["total_bytes"], "files": t["files"], "profile": profile}
+                continue
+            est = StorageProfiler.estimate(t["total_bytes"], t["files"], profile)
+            est.update({"bytes": t["total_bytes"], "files": t["files"], "profile": profile})
+            estimates[p] = est
+            logger.info(
+                "Estimated initial transform for %s: %.1f min with concurrency %d",
+                p, est["estimated_seconds"] / 60, est["recommended_concurrency"],
+            )
+        return estimates
+
+    def manifest_path(self, paths):
+        key = json.dumps(sorted(os.path.abspath(p) for p in paths))
+        return os.path.join(config.ENCRYPT_STATE_DIR, f"manifest-{hashlib.sha1(key.encode()).hexdigest()[:16]}.bin")
+
+    @staticmethod
+    def _iter_changed(changed_path):
+        with open(changed_path) as fh:
+            for line in fh:
+                path, size = json.loads(line)
+                yield path, size
+
+    def _incremental_run(self, scheduler, paths):
+        """
+        Proses hanya file yang baru / berubah (size, mtime, ctime) sejak pass
+        sukses terakhir. Daftar file berubah di-spill ke file sementara supaya
+        memory tidak tergantung ukuran pohon. File yang sudah di-transform run
+        yang terputus (done-stats scheduler) juga di-skip.
+        """
+        manifest = AssetManifest(self.manifest_path(paths))
+        try:
+            with manifest.exclusive_run():
+                writer = manifest.writer()
+                done = scheduler.load_done_stats(paths)
+                if done:
+                    logger.info("Resuming: %d files already transformed by an interrupted run", len(done))
+                changed = unchanged = 0
+                fd, changed_path = tempfile.mkstemp(prefix="cte-changed-", suffix=".ndjson")
+                try:
+                    with os.fdopen(fd, "w") as fh:
+                        for root in paths:
+                            # totals dari walk ini, bukan pass inventory terpisah
+                            files = total_bytes = 0
+                            for path, st in EncryptScheduler.iter_file_stats(root):
+                                files += 1
+                                total_bytes += st.st_size
+                                if manifest.unchanged(st) or \
+                                        done.get((st.st_dev, st.st_ino)) == stat_record(st):
+                                    writer.add_stat(st)
+                                    unchanged += 1
+                                    continue
+                                fh.write(json.dumps([path, st.st_size]) + "\n")
+                                changed += 1
+                            logger.info("Inventory %s: %d files, %.1f MiB total", root, files, total_bytes / 1048576)
+                    logger.info("Incremental sweep: %d new/changed files, %d unchanged skipped", changed, unchanged)
+
+                    summary = {"units": 0, "bytes": 0, "failed": 0, "completed": True}
+                    if changed:
+                        summary = scheduler.run(paths, files=self._iter_changed(changed_path),
+                                                cleanup=False)
+                    summary.update({"changed_files": changed, "skipped_files": unchanged})
+                    if not summary["completed"]:
+                        writer.discard()
+                        return summary
+                    if scheduler.dry_run:
+                        # dry run tidak mengenkripsi; jangan tandai file sebagai selesai
+                        writer.discard()
+                        scheduler.clear_state(paths)
+                        return summary
+                    # catat stat setelah transform (CTE bisa mengubah mtime/ctime)
+                    for path, _ in self._iter_changed(changed_path):
+                        try:
+                            writer.add_stat(os.lstat(path))
+                        except FileNotFoundError:
+                            pass
+                    writer.commit()
+                    # checkpoint baru dibuang setelah manifest ter-publish
+                    scheduler.clear_state(paths)
+                    return summary
+                finally:
+                    os.unlink(changed_path)
+        finally:
+            manifest.close()
+
+    def auto_encrypt(self, scheduler=None, incremental=True, dry_run=False):
+        """
+        Transform semua candidate path lewat CLI CTE (config.ENCRYPT_TRANSFORM_COMMAND),
+        paralel, ter-throttle dan resumable; lihat core/encrypt_scheduler.py.
+        Tanpa command terkonfigurasi raise EncryptError, kecuali `dry_run`
+        (stand-in read-only, manifest tidak diperbarui). Tidak ada pass
+        inventory terpisah: totals per path datang dari walk incremental
+        (pakai --estimate untuk inventory lengkap).
+        """
+        logger.info("Starting automatic asset encryption routine%s", " (dry run)" if dry_run else "")
+        # dibuat lebih dulu supaya konfigurasi yang kurang gagal sebelum walk apa pun
+        scheduler = scheduler or EncryptScheduler(dry_run=dry_run)
+        paths = []
         for p in self.candidate_paths:
             path = Path(p)
             if not path.exists():
                 logger.debug("Path %s not found, skipping", p)
                 continue
             logger.info("Preparing to encrypt assets in %s", p)
-            # Placeholder: call CTE CLI to create policy + attach
-            # Example: run_shell("vee-fs policy create ...")
-            logger.info("NOTE: This is a placeholder. Implement CTE CLI commands here.")
-        logger.info("Automatic asset encryption routine completed (placeholder).")
+            paths.append(p)
+        if not paths:
+            logger.info("No candidate paths found; nothing to encrypt.")
+            return None
+        if incremental:
+            summary = self._incremental_run(scheduler, paths)
+        else:
+            summary = scheduler.run(paths)
+        logger.info("Automatic asset encryption routine finished.")
+        return summary
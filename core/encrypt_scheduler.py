@@ -0,0 +1,436 @@
+# core/encrypt_scheduler.py
+import hashlib
+import json
+import logging
+import os
+import shutil
+import stat
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+from core.asset_manifest import stat_record
+from core.logger import get_logger
+from utils import config
+from utils.command import run_streaming
+from utils.exceptions import EncryptError
+
+logger = get_logger(__name__)
+
+READ_CHUNK = 1024 * 1024
+
+
+class Throttle:
+    """
+    Pembatas MB/s dan IOPS untuk satu worker (pacing berbasis kredit).
+    Ceiling global dibagi rata ke semua worker.
+    """
+
+    def __init__(self, bytes_per_sec=None, ops_per_sec=None):
+        self.bytes_per_sec = bytes_per_sec
+        self.ops_per_sec = ops_per_sec
+        self.start = time.monotonic()
+        self.bytes = 0
+        self.ops = 0
+
+    def consume(self, nbytes=0, nops=0):
+        self.bytes += nbytes
+        self.ops += nops
+        needed = 0.0
+        if self.bytes_per_sec:
+            needed = max(needed, self.bytes / self.bytes_per_sec)
+        if self.ops_per_sec:
+            needed = max(needed, self.ops / self.ops_per_sec)
+        delay = needed - (time.monotonic() - self.start)
+        if delay > 0:
+            time.sleep(delay)
+
+
+class StandInTransform:
+    """
+    Pengganti lokal untuk CLI CTE: membaca setiap byte setiap file (pola I/O
+    transform awal) tanpa mengubah data. Hanya untuk --dry-run, testing dan
+    benchmark; TIDAK mengenkripsi apa pun.
+    """
+
+    def __call__(self, files, throttle):
+        total = 0
+        for path in files:
+            try:
+                with open(path, "rb", buffering=0) as fh:
+                    while True:
+                        chunk = fh.read(READ_CHUNK)
+                        if not chunk:
+                            break
+                        total += len(chunk)
+                        throttle.consume(len(chunk), 1)
+            except FileNotFoundError:
+                # file hilang sejak plan dibuat; tidak ada yang perlu di-transform
+                continue
+        return total
+
+
+class CommandTransform:
+    """
+    Jalankan CLI transform CTE per unit. `argv` adalah list argumen; token
+    "{filelist}" diganti path file berisi daftar file unit (satu per baris).
+    Budget throttle untuk unit dibayar sebelum CLI dijalankan (I/O di dalam
+    CLI tidak bisa di-pace, jadi ukuran unit dibatasi scheduler).
+    """
+
+    def __init__(self, argv):
+        self.argv = list(argv)
+
+    def __call__(self, files, throttle):
+        total = 0
+        for path in files:
+            try:
+                total += os.stat(path).st_size
+            except OSError:
+                pass
+        throttle.consume(total, len(files))
+        fd, listfile = tempfile.mkstemp(prefix="cte-unit-", suffix=".lst")
+        try:
+            with os.fdopen(fd, "w") as fh:
+                fh.write("\n".join(files) + "\n")
+            argv = [a.replace("{filelist}", listfile) for a in self.argv]
+            run_streaming(argv, log=logger, level=logging.DEBUG)
+        finally:
+            os.unlink(listfile)
+        return total
+
+
+# --- state per worker process ---
+_worker_throttle = None
+
+
+def _init_worker(bytes_per_sec, ops_per_sec):
+    global _worker_throttle
+    _worker_throttle = Throttle(bytes_per_sec, ops_per_sec)
+
+
+def _execute_unit(transform, unit):
+    started = time.monotonic()
+    processed = transform(unit["files"], _worker_throttle)
+    return unit["id"], processed, time.monotonic() - started
+
+
+class EncryptScheduler:
+    """
+    Scheduler transform enkripsi:
+
+    - pohon asset dipecah jadi work unit dengan jumlah byte seimbang
+      (plan ditulis streaming ke plan.ndjson, memory tidak tergantung
+      ukuran pohon)
+    - unit dijalankan di process pool dengan transform yang bisa diganti
+      (CLI CTE atau stand-in lokal)
+    - ceiling MB/s dan IOPS global dibagi ke setiap worker
+    - progress di-log per unit; unit selesai dicatat di done.log sehingga
+      run yang terputus dilanjutkan, bukan diulang
+
+    Tanpa config.ENCRYPT_TRANSFORM_COMMAND scheduler menolak jalan
+    (EncryptError); `dry_run=True` memakai StandInTransform read-only dengan
+    state terpisah, jadi tidak pernah tercatat sebagai terenkripsi.
+    """
+
+    def __init__(self, transform=None, workers=None, unit_bytes=None, unit_max_files=None,
+                 max_mbps=None, max_iops=None, state_dir=None, progress=None, dry_run=False):
+        self.dry_run = dry_run
+        if transform is None:
+            if dry_run:
+                logger.warning("Dry run: using the read-only local stand-in, no data will be encrypted")
+                transform = StandInTransform()
+            elif config.ENCRYPT_TRANSFORM_COMMAND:
+                transform = CommandTransform(config.ENCRYPT_TRANSFORM_COMMAND)
+            else:
+                raise EncryptError(
+                    "No CTE transform command configured (config.ENCRYPT_TRANSFORM_COMMAND or "
+                    "CTE_ENCRYPT_COMMAND); refusing to run. Use --dry-run to only measure the I/O pattern.")
+        self.transform = transform
+        self.workers = workers or config.ENCRYPT_WORKERS
+        self.unit_bytes = unit_bytes or config.ENCRYPT_UNIT_BYTES
+        self.unit_max_files = unit_max_files or config.ENCRYPT_UNIT_MAX_FILES
+        self.max_mbps = max_mbps if max_mbps is not None else config.ENCRYPT_MAX_MBPS
+        self.max_iops = max_iops if max_iops is not None else config.ENCRYPT_MAX_IOPS
+        if self.max_mbps:
+            # batasi burst satu unit ke budget per worker selama beberapa detik
+            burst = int(self.max_mbps * 1024 * 1024 / self.workers * config.ENCRYPT_THROTTLE_BURST_SECONDS)
+            self.unit_bytes = max(1, min(self.unit_bytes, burst))
+        state_root = state_dir or config.ENCRYPT_STATE_DIR
+        self.state_root = os.path.join(state_root, "dry-run") if dry_run else state_root
+        self.progress = progress
+
+    # --- planning ---
+    @staticmethod
+    def _roots_key(roots):
+        return sorted(os.path.abspath(r) for r in roots)
+
+    def _state_dir(self, roots):
+        # satu state per set roots, supaya run yang terputus selalu ketemu lagi
+        key = json.dumps(self._roots_key(roots))
+        return os.path.join(self.state_root, hashlib.sha1(key.encode()).hexdigest()[:16])
+
+    def _prune_stale(self, roots, state):
+        """Hapus plan lama untuk roots yang sama (mis. dari skema key sebelumnya)."""
+        try:
+            entries = list(os.scandir(self.state_root))
+        except FileNotFoundError:
+            return
+        for entry in entries:
+            if entry.path == state or not entry.is_dir(follow_symlinks=False):
+                continue
+            try:
+                with open(os.path.join(entry.path, "plan.json")) as fh:
+                    other = json.load(fh).get("roots", [])
+            except (OSError, ValueError):
+                continue
+            if self._roots_key(other) == self._roots_key(roots):
+                logger.info("Removing stale encryption plan %s", entry.path)
+                shutil.rmtree(entry.path, ignore_errors=True)
+
+    def clear_state(self, roots):
+        """Buang checkpoint roots ini (setelah hasilnya tercatat di manifest)."""
+        shutil.rmtree(self._state_dir(roots), ignore_errors=True)
+
+    def load_done_stats(self, roots):
+        """
+        Stat (dev, ino) -> record file yang sudah di-transform oleh run yang
+        terputus, untuk di-skip sweep incremental berikutnya.
+        """
+        done = {}
+        try:
+            with open(os.path.join(self._state_dir(roots), "done-stats.ndjson")) as fh:
+                for line in fh:
+                    try:
+                        rec = tuple(json.loads(line))
+                    except ValueError:
+                        continue  # baris terakhir terpotong saat crash
+                    done[rec[:2]] = rec
+        except FileNotFoundError:
+            pass
+        return done
+
+    @staticmethod
+    def iter_files(root):
+        """Yield (path, size) file reguler di bawah root, tanpa menyeberang filesystem."""
+        for path, st in EncryptScheduler.iter_file_stats(root):
+            yield path, st.st_size
+
+    @staticmethod
+    def iter_file_stats(root):
+        """Yield (path, stat_result) file reguler di bawah root, tanpa menyeberang filesystem."""
+        # stat, bukan lstat: root boleh berupa symlink ke volume lain
+        root_dev = os.stat(root).st_dev
+        stack = [root]
+        while stack:
+            directory = stack.pop()
+            try:
+                it = os.scandir(directory)
+            except OSError as e:
+                logger.warning("Cannot scan %s: %s", directory, e)
+                continue
+            with it:
+                for entry in it:
+                    try:
+                        st = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    if stat.S_ISDIR(st.st_mode):
+                        if st.st_dev == root_dev:
+                            stack.append(entry.path)
+                    elif stat.S_ISREG(st.st_mode):
+                        yield entry.path, st
+
+    def iter_units(self, roots, files=None):
+        """
+        Pack file menjadi unit ~unit_bytes (atau unit_max_files). File yang
+        lebih besar dari unit_bytes menjadi unit sendiri.
+        """
+        unit_id = 0
+        batch, batch_bytes = [], 0
+
+        def source():
+            if files is not None:
+                yield from files
+                return
+            for root in roots:
+                yield from self.iter_files(root)
+
+        for path, size in source():
+            if size >= self.unit_bytes:
+                yield {"id": unit_id, "bytes": size, "files": [path]}
+                unit_id += 1
+                continue
+            batch.append(path)
+            batch_bytes += size
+            if batch_bytes >= self.unit_bytes or len(batch) >= self.unit_max_files:
+                yield {"id": unit_id, "bytes": batch_bytes, "files": batch}
+                unit_id += 1
+                batch, batch_bytes = [], 0
+        if batch:
+            yield {"id": unit_id, "bytes": batch_bytes, "files": batch}
+
+    def plan(self, roots, files=None):
+        """
+        Tulis plan.ndjson. Plan seluruh roots dipakai ulang saat resume
+        (unit selesai di-skip lewat done.log). `files` opsional: iterable
+        (path, size) hasil sweep incremental, yang sudah membuang file di
+        load_done_stats(); plan seperti ini selalu ditulis ulang.
+        Return (state_dir, units, bytes).
+        """
+        state = self._state_dir(roots)
+        plan_path = os.path.join(state, "plan.ndjson")
+        meta_path = os.path.join(state, "plan.json")
+        self._prune_stale(roots, state)
+        meta = None
+        if os.path.exists(meta_path):
+            with open(meta_path) as fh:
+                meta = json.load(fh)
+        if meta is not None and files is None and not meta.get("incremental"):
+            logger.info("Resuming encryption plan %s (%d units)", state, meta["units"])
+            return state, meta["units"], meta["bytes"]
+        if meta is not None:
+            logger.info("Replanning %s; files finished by the interrupted run are skipped", state)
+        for name in ("plan.json", "done.log"):
+            try:
+                os.unlink(os.path.join(state, name))
+            except FileNotFoundError:
+                pass
+
+        os.makedirs(state, exist_ok=True)
+        units = total = 0
+        with open(plan_path, "w") as fh:
+            for unit in self.iter_units(roots, files):
+                fh.write(json.dumps(unit) + "\n")
+                units += 1
+                total += unit["bytes"]
+            fh.flush()
+            os.fsync(fh.fileno())
+        # plan.json ditulis terakhir = penanda plan lengkap
+        with open(meta_path, "w") as fh:
+            json.dump({"roots": list(roots), "units": units, "bytes": total,
+                       "incremental": files is not None}, fh)
+        logger.info("Encryption plan: %d units, %.1f MiB, in %s", units, total / 1048576, state)
+        return state, units, total
+
+    @staticmethod
+    def _load_done(state):
+        done = set()
+        try:
+            with open(os.path.join(state, "done.log")) as fh:
+                for line in fh:
+                    line = line.strip()
+                    if line:
+                        done.add(int(line.split()[0]))
+        except FileNotFoundError:
+            pass
+        return done
+
+    # --- eksekusi ---
+    def run(self, roots, files=None, cleanup=True):
+        """
+        Jalankan plan. Setiap unit selesai dicatat di done.log dan stat file-nya
+        di done-stats.ndjson. `cleanup=False` menyimpan checkpoint setelah run
+        lengkap; caller memanggil clear_state() setelah hasilnya tercatat.
+        """
+        state, unit_count, total_bytes = self.plan(roots, files)
+        done = self._load_done(state)
+        done_bytes = 0
+        pending_set = set()
+        with open(os.path.join(state, "plan.ndjson")) as fh:
+            for line in fh:
+                unit = json.loads(line)
+                if unit["id"] in done:
+                    done_bytes += unit["bytes"]
+                else:
+                    pending_set.add(unit["id"])
+        if done:
+            logger.info("Skipping %d already transformed units", len(done))
+
+        per_worker_bps = self.max_mbps * 1024 * 1024 / self.workers if self.max_mbps else None
+        per_worker_iops = self.max_iops / self.workers if self.max_iops else None
+        summary = {"units": unit_count, "bytes": total_bytes, "failed": 0, "state_dir": state}
+        # multiprocessing baru di-import kalau memang ada unit yang dijalankan
+        from concurrent.futures import ProcessPoolExecutor
+
+        started = time.monotonic()
+        run_bytes = 0
+
+        with open(os.path.join(state, "plan.ndjson")) as plan_fh, \
+                open(os.path.join(state, "done.log"), "a") as done_fh, \
+                open(os.path.join(state, "done-stats.ndjson"), "a") as stats_fh, \
+                ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                    initargs=(per_worker_bps, per_worker_iops)) as pool:
+            units = (json.loads(line) for line in plan_fh)
+            units = (u for u in units if u["id"] in pending_set)
+            in_flight = {}
+
+            def submit_next():
+                unit = next(units, None)
+                if unit is not None:
+                    in_flight[pool.submit(_execute_unit, self.transform, unit)] = unit
+                return unit is not None
+
+            for _ in range(self.workers * 2):
+                if not submit_next():
+                    break
+
+            while in_flight:
+                finished, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+                for future in finished:
+                    unit = in_flight.pop(future)
+                    try:
+                        future.result()
+                    except Exception as e:
+                        summary["failed"] += 1
+                        logger.error("Unit %d failed (will retry on next run): %s", unit["id"], e)
+                    else:
+                        self._record_done(unit, stats_fh)
+                        done_fh.write(f"{unit['id']}\n")
+                        done_fh.flush()
+                        os.fsync(done_fh.fileno())
+                        done_bytes += unit["bytes"]
+                        run_bytes += unit["bytes"]
+                        self._report(done_bytes, total_bytes, run_bytes, started)
+                    submit_next()
+
+        summary["elapsed_s"] = time.monotonic() - started
+        summary["completed"] = summary["failed"] == 0
+        if summary["completed"] and cleanup:
+            # checkpoint hanya untuk resume; run berikutnya membuat plan baru
+            shutil.rmtree(state, ignore_errors=True)
+        logger.info(
+            "Encryption transform %s: %.1f/%.1f MiB in %.1fs, %d failed units",
+            "completed" if summary["completed"] else "incomplete",
+            done_bytes / 1048576, total_bytes / 1048576, summary["elapsed_s"], summary["failed"],
+        )
+        return summary
+
+    @staticmethod
+    def _record_done(unit, stats_fh):
+        # stat setelah transform (CTE bisa mengubah mtime/ctime)
+        for path in unit["files"]:
+            try:
+                st = os.lstat(path)
+            except OSError:
+                continue
+            stats_fh.write(json.dumps(stat_record(st)) + "\n")
+        stats_fh.flush()
+        os.fsync(stats_fh.fileno())
+
+    def _report(self, done_bytes, total_bytes, run_bytes, started):
+        elapsed = max(time.monotonic() - started, 1e-6)
+        rate = run_bytes / elapsed
+        remaining = (total_bytes - done_bytes) / rate if rate else None
+        info = {
+            "done_bytes": done_bytes,
+            "total_bytes": total_bytes,
+            "percent": 100.0 * done_bytes / total_bytes if total_bytes else 100.0,
+            "rate_mbps": rate / 1048576,
+            "eta_s": remaining,
+        }
+        if self.progress:
+            self.progress(info)
+        logger.info(
+            "Progress %.1f%% (%.1f MiB/s, ETA %s)", info["percent"], info["rate_mbps"],
+            f"{remaining:.0f}s" if remaining is not None else "?",
+        )
@@ -5,6 +5,8 @@ import sys
 import platform
 import subprocess
 import shutil
+from core import host_facts
+from utils.command import run_shell
 
 logger = logging.getLogger(__name__)
 
@@ -29,14 +31,14 @@ class EnvironmentManager:
         uname = platform.uname()
         logger.info(f"System: {uname.system}")
         logger.info(f"Node Name: {uname.node}")
-        logger.info(f"Release: {uname.release}")
+        logger.info(f"Release: {host_facts.get('kernel_release')}")
         logger.info(f"Version: {uname.version}")
         logger.info(f"Machine: {uname.machine}")
         logger.info(f"Processor: {uname.processor}")
 
         # Kernel version (for compatibility check)
         try:
-            kernel_version = subprocess.check_output(["uname", "-r"], universal_newlines=True).strip()
+            kernel_version = host_facts.get("kernel_release")
             logger.info(f"Kernel Version: {kernel_version}")
         except Exception as e:
             logger.warning(f"Could not fetch kernel version: {e}")
@@ -71,38 +73,20 @@ class EnvironmentManager:
         """
         Mendeteksi package manager yang digunakan (apt, yum, dnf, zypper, dll.)
         """
-        if shutil.which("apt"):
-            return "apt"
-        elif shutil.which("dnf"):
-            return "dnf"
-        elif shutil.which("yum"):
-            return "yum"
-        elif shutil.which("zypper"):
-            return "zypper"
-        else:
-            return "unknown"
+        return host_facts.get("package_manager")
 
     @staticmethod
-    def run_command(cmd, cwd=None):
+    def run_command(cmd, cwd=None, timeout=None):
         """
-        Helper untuk menjalankan command shell dengan logging.
+        Helper untuk menjalankan command shell dengan logging
+        (delegasi ke utils.command.run_shell).
         """
         logger.debug(f"Running command: {cmd}")
         try:
-            result = subprocess.run(
-                cmd,
-                cwd=cwd,
-                shell=isinstance(cmd, str),
-                check=True,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                universal_newlines=True
-            )
-            if result.stdout:
-                logger.debug(result.stdout.strip())
-            if result.stderr:
-                logger.debug(result.stderr.strip())
-            return result.stdout.strip()
+            output = run_shell(cmd, cwd=cwd, timeout=timeout)
+            if output:
+                logger.debug(output)
+            return output
         except subprocess.CalledProcessError as e:
             logger.error(f"Command failed: {e.cmd}\n{e.stderr}")
             raise
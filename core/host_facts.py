@@ -0,0 +1,187 @@
+# core/host_facts.py
+"""
+Registry fact host bersama untuk satu proses.
+
+Setiap fact (kernel release, /etc/os-release, target distro, arsitektur,
+package manager) dikumpulkan sekali lewat core/probes.py lalu di-memoize,
+jadi EnvironmentManager, CompatibilityChecker, HostInfoCollector, Installer
+dan cte_client selalu melihat jawaban yang sama.
+
+Opsional: dengan config.HOST_FACTS_TTL (env CTE_HOST_FACTS_TTL, detik) nilai
+disimpan ke CACHE_DIR/host_facts.json dan dipakai ulang antar proses selama
+TTL belum habis dan boot id + mtime /etc/os-release tidak berubah. TTL
+dihitung per fact dari `collected_at` masing-masing; proses yang hanya
+mengumpulkan sebagian fact menggabungkannya dengan isi file yang ada.
+"""
+import os
+import platform
+import shutil
+import threading
+import time
+from core import probes
+from core.logger import get_logger
+from utils import config
+from utils import tracing
+from utils.fileio import atomic_write_json, read_json
+
+logger = get_logger(__name__)
+
+CACHE_FORMAT = 2
+COLLECTORS = {}
+
+
+def collector(name):
+    """Daftarkan collector; dipanggil dengan registry supaya bisa memakai fact lain."""
+    def register(fn):
+        COLLECTORS[name] = fn
+        return fn
+    return register
+
+
+@collector("kernel_release")
+def _kernel_release(facts):
+    return probes.kernel_release()
+
+
+@collector("kernel_major")
+def _kernel_major(facts):
+    return int(facts.get("kernel_release").split(".")[0])
+
+
+@collector("os_release")
+def _os_release(facts):
+    return probes.os_release()
+
+
+@collector("os_pretty_name")
+def _os_pretty_name(facts):
+    data = facts.get("os_release")
+    if data.get("PRETTY_NAME"):
+        return data["PRETTY_NAME"]
+    if data.get("NAME"):
+        return " ".join(filter(None, (data["NAME"], data.get("VERSION"))))
+    return platform.platform()
+
+
+@collector("distro_target")
+def _distro_target(facts):
+    """Target installer CTE: rh8 / rh9 / ubuntu22 / ubuntu24 (None kalau tidak dikenal)."""
+    data = facts.get("os_release")
+    ids = " ".join((data.get("ID", ""), data.get("ID_LIKE", ""), data.get("NAME", ""))).lower()
+    major = data.get("VERSION_ID", "").split(".")[0]
+    if any(name in ids for name in ("rhel", "centos", "rocky")):
+        if not major:
+            major = "9" if "9." in probes.release_text("/etc/redhat-release") else "8"
+        return "rh9" if major == "9" else "rh8"
+    if "ubuntu" in ids:
+        return "ubuntu24" if major == "24" else "ubuntu22"
+    return None
+
+
+@collector("architecture")
+def _architecture(facts):
+    return os.uname().machine
+
+
+@collector("package_manager")
+def _package_manager(facts):
+    for name in ("apt", "dnf", "yum", "zypper"):
+        if shutil.which(name):
+            return name
+    return "unknown"
+
+
+def _fingerprint():
+    try:
+        with open("/proc/sys/kernel/random/boot_id") as fh:
+            boot_id = fh.read().strip()
+    except OSError:
+        boot_id = None
+    try:
+        os_release_mtime = os.stat("/etc/os-release").st_mtime_ns
+    except OSError:
+        os_release_mtime = None
+    return {"boot_id": boot_id, "os_release_mtime_ns": os_release_mtime}
+
+
+class HostFacts:
+    def __init__(self, ttl=None, cache_path=None):
+        self.ttl = config.HOST_FACTS_TTL if ttl is None else ttl
+        self.cache_path = cache_path or os.path.join(config.CACHE_DIR, "host_facts.json")
+        self._values = {}
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._fact_locks = {}
+        # fact yang dikumpulkan proses ini: name -> {"value", "collected_at"}
+        self._collected = {}
+        self._persisted = self._load() if self.ttl else {}
+        if self._persisted:
+            logger.debug(f"Using persisted host facts from {self.cache_path}")
+
+    def _load(self):
+        """Fact di file yang fingerprint-nya cocok dan TTL-nya (per fact) belum habis."""
+        cached = read_json(self.cache_path)
+        if not cached or cached.get("format") != CACHE_FORMAT or cached.get("fingerprint") != _fingerprint():
+            return {}
+        now = time.time()
+        return {name: entry for name, entry in cached.get("facts", {}).items()
+                if now - entry.get("collected_at", 0) <= self.ttl}
+
+    def _save(self):
+        # gabung dengan isi file: fact dari proses lain tetap ada dan
+        # collected_at aslinya tidak ikut diperbarui
+        with self._save_lock:
+            facts = self._load()
+            for name, entry in self._collected.items():
+                if name not in facts or facts[name]["collected_at"] < entry["collected_at"]:
+                    facts[name] = entry
+            try:
+                atomic_write_json(self.cache_path, {
+                    "format": CACHE_FORMAT,
+                    "fingerprint": _fingerprint(),
+                    "facts": facts,
+                })
+            except OSError as e:
+                logger.debug(f"Could not persist host facts to {self.cache_path}: {e}")
+
+    def get(self, name):
+        """Nilai fact `name`; dikumpulkan sekali per proses (thread-safe)."""
+        if name in self._values:
+            return self._values[name]
+        with self._lock:
+            lock = self._fact_locks.setdefault(name, threading.Lock())
+        with lock:
+            if name not in self._values:
+                if name in self._persisted:
+                    self._values[name] = self._persisted[name]["value"]
+                else:
+                    with tracing.span(f"host_fact.{name}"):
+                        value = COLLECTORS[name](self)
+                    self._collected[name] = {"value": value, "collected_at": time.time()}
+                    self._values[name] = value
+                    if self.ttl:
+                        self._save()
+        return self._values[name]
+
+    def invalidate(self, name=None):
+        """Lupakan satu / semua fact (mis. setelah upgrade kernel)."""
+        with self._lock:
+            for key in [name] if name else list(self._values):
+                self._values.pop(key, None)
+                self._persisted.pop(key, None)
+                self._collected.pop(key, None)
+
+
+_shared_facts = None
+
+
+def get_host_facts():
+    """Instance HostFacts bersama untuk satu proses."""
+    global _shared_facts
+    if _shared_facts is None:
+        _shared_facts = HostFacts()
+    return _shared_facts
+
+
+def get(name):
+    return get_host_facts().get(name)
@@ -1,15 +1,23 @@
 # core/host_info.py
 
+import math
 import socket
-import platform
 import os
-import re
-import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from utils.command import run_shell
+from core import host_facts, probes
 from core.logger import get_logger
+from utils import tracing
 
 logger = get_logger(__name__)
 
+# Timeout per probe (detik) untuk mode concurrent
+DEFAULT_PROBE_TIMEOUT = 5
+PROBE_TIMEOUTS = {
+    "Port 443 to CM": 4,
+}
+
 class HostInfoCollector:
 
     def get_hostname(self):
@@ -24,8 +32,7 @@ class HostInfoCollector:
         Tidak termasuk 127.x.x.x
         """
         try:
-            output = run_shell("ip -4 addr show", capture_output=True)
-            ips = re.findall(r"inet (\d+\.\d+\.\d+\.\d+)", output)
+            ips = probes.ipv4_addresses()
             return [ip for ip in ips if not ip.startswith("127.")]
         except Exception as e:
             logger.error(f"Failed to get IP addresses: {e}")
@@ -35,29 +42,17 @@ class HostInfoCollector:
         """
         Ambil distro + version dari /etc/os-release
         """
-        try:
-            if os.path.exists("/etc/os-release"):
-                data = {}
-                with open("/etc/os-release") as f:
-                    for line in f:
-                        k, _, v = line.partition("=")
-                        data[k.strip()] = v.strip().strip('"')
-                pretty = f"{data.get('NAME')} {data.get('VERSION')}"
-                return pretty
-        except:
-            pass
-        return platform.platform()
+        return host_facts.get("os_pretty_name")
 
     def get_architecture(self):
-        return platform.machine()
+        return host_facts.get("architecture")
 
     def is_ldt_applicable(self):
         """
         Sementara simple rule:
         - Kernel >= 4.x biasanya support LDT secara default.
         """
-        kernel = platform.release()
-        major = int(kernel.split('.')[0])
+        major = host_facts.get("kernel_major")
         return "Yes" if major >= 4 else "Maybe"
 
     def is_root(self):
@@ -67,7 +62,7 @@ class HostInfoCollector:
         """
         Test TCP ke CM domain:443 menggunakan bash.
         """
-        cmd = f"timeout 3 bash -c '</dev/tcp/{cm_domain}/443' 2>/dev/null && echo OK || echo FAIL'"
+        cmd = f"timeout 3 bash -c '</dev/tcp/{cm_domain}/443' 2>/dev/null && echo OK || echo FAIL"
         result = run_shell(cmd, capture_output=True)
         return "Yes" if result == "OK" else "No"
 
@@ -85,23 +80,90 @@ class HostInfoCollector:
             pass
         return users
 
-    def collect(self, cm_domain="example.com"):
+    def _probes(self, cm_domain):
+        return [
+            ("Hostname", self.get_hostname),
+            ("IP Addresses", lambda: ", ".join(self.get_ip_addresses())),
+            ("Operating System", self.get_os_details),
+            ("Architecture", self.get_architecture),
+            ("LDT Applicable", self.is_ldt_applicable),
+            ("Is Root", self.is_root),
+            ("Port 443 to CM", lambda: self.is_port_443_open_to_cm(cm_domain)),
+            ("OS Users", lambda: ", ".join(self.get_users())),
+        ]
+
+    @staticmethod
+    def _traced_probe(key, fn, started):
+        def run():
+            # deadline probe dihitung sejak mulai jalan, bukan sejak di-submit
+            started[key] = time.monotonic()
+            with tracing.span(f"host.probe.{key}"):
+                return fn()
+        return run
+
+    def collect(self, cm_domain="example.com", concurrent=True, max_workers=4):
         """
         Collect seluruh informasi host.
+        Mode concurrent: semua probe jalan paralel di worker pool, masing-masing
+        dengan timeout sendiri sejak probe mulai jalan. Probe yang timeout /
+        error dilaporkan sebagai "Timeout" / "Error" tanpa menahan probe lain;
+        probe yang masih antre saat batas total habis dibatalkan.
         """
         logger.info("Collecting host information...")
+        started = {}
+        probes = [(key, self._traced_probe(key, fn, started)) for key, fn in self._probes(cm_domain)]
+
+        if not concurrent:
+            return {key: fn() for key, fn in probes}
 
-        info = {
-            "Hostname": self.get_hostname(),
-            "IP Addresses": ", ".join(self.get_ip_addresses()),
-            "Operating System": self.get_os_details(),
-            "Architecture": self.get_architecture(),
-            "LDT Applicable": self.is_ldt_applicable(),
-            "Is Root": self.is_root(),
-            "Port 443 to CM": self.is_port_443_open_to_cm(cm_domain),
-            "OS Users": ", ".join(self.get_users()),
-        }
+        def timeout_of(key):
+            return PROBE_TIMEOUTS.get(key, DEFAULT_PROBE_TIMEOUT)
 
+        # batas total: semua probe habis timeout-nya, gelombang demi gelombang
+        waves = math.ceil(len(probes) / max_workers)
+        overall = time.monotonic() + waves * max(timeout_of(key) for key, _ in probes)
+
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            futures = {key: executor.submit(fn) for key, fn in probes}
+            results = {}
+            pending = dict(futures)
+            while pending:
+                now = time.monotonic()
+                for key, future in list(pending.items()):
+                    if future.done():
+                        results[key] = future
+                    elif key in started and now - started[key] >= timeout_of(key):
+                        logger.warning(f"Host probe '{key}' timed out after {timeout_of(key)}s")
+                        results[key] = None
+                    elif key not in started and now >= overall and future.cancel():
+                        logger.warning(f"Host probe '{key}' did not start before the deadline")
+                        results[key] = None
+                    else:
+                        continue
+                    del pending[key]
+                if not pending:
+                    break
+                deadlines = [started[k] + timeout_of(k) for k in pending if k in started]
+                deadlines.append(overall)
+                wait(list(pending.values()), timeout=max(0.01, min(deadlines) - now),
+                     return_when=FIRST_COMPLETED)
+        finally:
+            # probe yang masih antre dibatalkan, yang menggantung tidak ditunggu
+            for future in futures.values():
+                future.cancel()
+            executor.shutdown(wait=False)
+
+        info = {}
+        for key, _ in probes:
+            future = results[key]
+            if future is None:
+                info[key] = "Timeout"
+            elif future.exception() is not None:
+                logger.error(f"Host probe '{key}' failed: {future.exception()}")
+                info[key] = "Error"
+            else:
+                info[key] = future.result()
         return info
 
     @staticmethod
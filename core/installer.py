@@ -1,81 +1,132 @@
 # core/installer.py
-import os
-import shutil
-import stat
 from pathlib import Path
-import requests
+from core import host_facts
+from core.artifact_store import ArtifactStore
+from core.delta import DeltaFetcher
+from core.downloader import RangedDownloader
 from core.logger import get_logger
-from utils.command import run_shell
-from utils.config import DEFAULT_CLOUDFLARE_DOMAIN_PATTERN
-from utils.exceptions import InstallerError
+from core.mirrors import hedged_get
+import subprocess
+from utils import config
+from utils.command import run_streaming
+from utils.exceptions import DigestMismatchError, InstallerError
+from utils import tracing
 import re
 
 logger = get_logger(__name__)
 
 class Installer:
-    def __init__(self, repo_manager, download_dir="/tmp/cte_download"):
+    def __init__(self, repo_manager, download_dir=None, store=None):
         self.repo_manager = repo_manager
-        self.download_dir = Path(download_dir)
-        self.download_dir.mkdir(parents=True, exist_ok=True)
+        # download_dir (opsional) = root artifact store
+        self.store = store or ArtifactStore(download_dir)
 
     def determine_target(self):
-        # determine distro family (rh8/rh9/ubuntu22/ubuntu24)
-        out = run_shell("cat /etc/os-release || true")
-        if "rhel" in out.lower() or "centos" in out.lower() or "rocky" in out.lower():
-            # map kernel to rh8 vs rh9 maybe by checking /etc/redhat-release or kernel
-            release = run_shell("cat /etc/redhat-release || true").lower()
-            if "9." in release:
-                return "rh9"
-            return "rh8"
-        if "ubuntu" in out.lower():
-            # check version id
-            m = re.search(r'VERSION_ID="?([0-9\.]+)"?', out)
-            if m:
-                v = m.group(1)
-                if v.startswith("24"):
-                    return "ubuntu24"
-                return "ubuntu22"
-            return "ubuntu22"
+        # determine distro family (rh8/rh9/ubuntu22/ubuntu24), lihat core/host_facts.py
+        target = host_facts.get("distro_target")
+        if target:
+            return target
         # fallback
         logger.warning("Unable to auto-detect distro; defaulting to 'ubuntu22'")
         return "ubuntu22"
 
-    def perform_install(self):
-        repo_url = self.repo_manager.fetch_active_repo_url()
+    def perform_install(self, version=None):
         target = self.determine_target()
         logger.info("Selected distro target: %s", target)
-        # craft download URL - expecting structure /cte/bin/<target>/latest/<binary>
-        index_url = f"{repo_url}/cte/bin/{target}/latest/"
-        logger.info("Fetching index URL: %s", index_url)
-        resp = requests.get(index_url, timeout=10)
-        resp.raise_for_status()
+
+        # reinstall / rollback ke versi yang sudah ada di store: tanpa network
+        if version:
+            local_path = self.store.lookup(target, version=version)
+            if local_path is None:
+                raise InstallerError(f"CTE {version} for {target} is not in the local artifact store.")
+            self._run_binary_installer(local_path)
+            return
+
+        local_path = self._fetch_latest(target)
+        # now run installer silently if the binary supports --silent or --install
+        self._run_binary_installer(local_path)
+
+    def _fetch_latest(self, target):
+        try:
+            mirrors = self.repo_manager.discover_mirrors()
+            # craft download URL - expecting structure /cte/bin/<target>/latest/<binary>
+            index_urls = [f"{m}/cte/bin/{target}/latest/" for m in mirrors]
+            logger.info("Fetching index URL: %s", index_urls[0])
+            with tracing.span("installer.index_fetch", url=index_urls[0]):
+                # di-hedge ke mirror berikutnya kalau mirror terbaik lambat
+                index_url, resp = hedged_get(index_urls, timeout=10)
+        except Exception as e:
+            cached = self.store.latest(target)
+            if cached is None:
+                raise
+            logger.warning("Repository unreachable (%s); using newest cached installer", e)
+            return cached
+
         # try to find .bin file in listing by simple regex
         m = re.search(r'href="([^"]+\.bin)"', resp.text)
         if not m:
             raise InstallerError("No .bin file found in repository 'latest' index.")
         filename = m.group(1)
+
         download_url = f"{index_url}{filename}"
+        # installer yang di-rebuild dengan nama sama dikenali lewat digest published / pinned
+        expected = RangedDownloader().resolve_expected_digest(download_url)
+        cached = self.store.lookup(target, filename=filename, expected_sha256=expected)
+        if cached is not None:
+            return cached
+
+        fallbacks = [f"{u}{filename}" for u in index_urls]
+        staging = self.store.staging_path(filename)
         logger.info("Downloading binary: %s", download_url)
-        local_path = self.download_dir / filename
-        with requests.get(download_url, stream=True, timeout=30) as r:
-            r.raise_for_status()
-            with open(local_path, "wb") as fh:
-                for chunk in r.iter_content(chunk_size=8192):
-                    if chunk:
-                        fh.write(chunk)
-        # make executable
-        local_path.chmod(local_path.stat().st_mode | stat.S_IXUSR)
+        with tracing.span("installer.download", url=download_url):
+            staged = self._fetch_delta(target, download_url, staging, fallbacks, expected)
+            if staged is None:
+                staged, digest = RangedDownloader().download(
+                    download_url, staging, expected_sha256=expected, mirrors=fallbacks)
+            else:
+                staged, digest = staged
+            local_path = self.store.publish(target, filename, staged, digest)
         logger.info("Downloaded to %s", local_path)
-        # now run installer silently if the binary supports --silent or --install
-        self._run_binary_installer(local_path)
+        return local_path
 
+    def _fetch_delta(self, target, url, staging, mirrors, expected_sha256=None):
+        """
+        Upgrade: rekonstruksi installer baru dari installer terakhir di store
+        + block yang berubah (core/delta.py). None = pakai download penuh.
+        """
+        seed = self.store.latest(target)
+        if seed is None:
+            return None
+        try:
+            with tracing.span("installer.delta", url=url, seed=str(seed)):
+                result = DeltaFetcher().fetch(url, seed, staging, expected_sha256=expected_sha256,
+                                              mirrors=mirrors)
+        except DigestMismatchError as e:
+            # block map / hasil rekonstruksi tidak cocok dengan digest: repo tidak konsisten
+            logger.error("Delta update rejected: %s; falling back to full download", e)
+            return None
+        except Exception as e:
+            logger.warning("Delta update failed (%s); falling back to full download", e)
+            return None
+        if result is None:
+            return None
+        path, digest, stats = result
+        logger.info("Delta update from %s: downloaded %.1f of %.1f MiB",
+                    seed.name, stats["fetched_bytes"] / 1048576, stats["size"] / 1048576)
+        return path, digest
+
+    @tracing.traced("installer.run_binary")
     def _run_binary_installer(self, path: Path):
         # WARNING: adjust flags according to binary docs
-        cmd = f"{str(path)} --install --quiet"
-        logger.info("Running installer command: %s", cmd)
+        cmd = [str(path), "--install", "--quiet"]
+        logger.info("Running installer command: %s", " ".join(cmd))
         try:
-            out = run_shell(cmd)
-            logger.info("Installer output: %s", out[:400])
+            # output di-stream ke log; hanya tail yang disimpan untuk laporan error
+            result = run_streaming(cmd, timeout=config.INSTALLER_TIMEOUT, log=logger, prefix="installer")
+            logger.info("Installer finished in %.1fs", result.elapsed)
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
+            logger.error("Installer failed: %s\nLast output:\n%s", e, e.output)
+            raise InstallerError("CTE binary installer failed") from e
         except Exception as e:
             logger.error("Installer failed: %s", e)
             raise InstallerError("CTE binary installer failed") from e
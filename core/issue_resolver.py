@@ -1,26 +1,40 @@
 # core/issue_resolver.py
+from core.diagnostics import DiagnosticEngine, FAIL
 from core.logger import get_logger
 from utils.command import run_shell
 
 logger = get_logger(__name__)
 
 class IssueResolver:
-    def __init__(self, installer):
+    def __init__(self, installer=None, engine=None):
         self.installer = installer
+        self.engine = engine or DiagnosticEngine()
 
-    def auto_resolve(self):
+    def diagnose(self):
+        findings = self.engine.run()
+        self.engine.print_table(findings)
+        return findings
+
+    def auto_resolve(self, apply=False):
+        """
+        Jalankan semua rule diagnostik (lihat core/diagnostics.py) dan
+        tampilkan remedy untuk yang FAIL. Dengan apply=True remedy yang
+        berupa command dijalankan.
+        """
         logger.info("Running automatic resolution for common issues.")
-        # Example check: kernel module mismatch (placeholder)
-        try:
-            lsmod = run_shell("lsmod | grep vee || true")
-            if not lsmod.strip():
-                logger.info("No vee/fs module loaded. Trying to reload or reinstall.")
-                # Placeholder recompile or reinstall step
-                logger.info("Attempting to reload module (placeholder)")
-                # run real commands here, example:
-                # run_shell("modprobe vee")
-            else:
-                logger.info("VE module present.")
-        except Exception as e:
-            logger.error("Issue resolution encountered error: %s", e)
-        logger.info("Issue resolver finished (placeholder ops).")
+        findings = self.diagnose()
+        failed = [f for f in findings if f.status == FAIL]
+        for f in failed:
+            if not f.remedy:
+                logger.warning("%s: %s (no automatic remedy)", f.rule, f.message)
+                continue
+            if not apply:
+                logger.info("%s: suggested remedy: %s", f.rule, f.remedy)
+                continue
+            try:
+                logger.info("%s: running %s", f.rule, f.remedy)
+                run_shell(f.remedy)
+            except Exception as e:
+                logger.error("Issue resolution for '%s' encountered error: %s", f.rule, e)
+        logger.info("Issue resolver finished: %d of %d checks failing.", len(failed), len(findings))
+        return findings
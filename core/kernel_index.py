@@ -0,0 +1,105 @@
+# core/kernel_index.py
+from collections import namedtuple
+
+KernelRecord = namedtuple("KernelRecord", ["os", "num", "start", "end"])
+
+# suffix arsitektur yang kadang ada / tidak ada di kolom NUM matrix
+ARCH_SUFFIXES = (".x86_64", ".aarch64", ".ppc64le", ".s390x")
+
+
+def strip_arch(kernel):
+    for suffix in ARCH_SUFFIXES:
+        if kernel.endswith(suffix):
+            return kernel[:-len(suffix)]
+    return kernel
+
+
+class _TrieNode:
+    __slots__ = ("children", "terminal", "subtree")
+
+    def __init__(self):
+        self.children = {}
+        self.terminal = []   # record id yang key-nya berakhir di node ini
+        self.subtree = []    # record id yang key-nya melewati node ini
+
+
+class KernelIndex:
+    """
+    Index kernel release atas CTE compatibility matrix.
+
+    - exact: base release (tanpa arch) -> record
+    - prefix trie atas NUM mentah, untuk query partial ("4.18.0-372")
+    - prefix trie atas base release, untuk kernel yang diawali NUM matrix
+
+    Setiap lookup O(len(kernel)), bukan O(jumlah kernel di matrix).
+    Urutan hasil selalu mengikuti urutan matrix asli.
+    """
+
+    def __init__(self, matrix):
+        self.records = []
+        self._exact = {}
+        self._num_trie = _TrieNode()
+        self._base_trie = _TrieNode()
+
+        for os_entry in matrix.get("MAPPING", []):
+            for k in os_entry.get("KERNEL", []):
+                rid = len(self.records)
+                self.records.append(KernelRecord(os_entry["OS"], k["NUM"], k["START"], k["END"]))
+                base = strip_arch(k["NUM"])
+                self._exact.setdefault(base, []).append(rid)
+                self._insert(self._num_trie, k["NUM"], rid, track_subtree=True)
+                self._insert(self._base_trie, base, rid, track_subtree=False)
+
+    def __len__(self):
+        return len(self.records)
+
+    @staticmethod
+    def _insert(root, key, rid, track_subtree):
+        node = root
+        for ch in key:
+            child = node.children.get(ch)
+            if child is None:
+                child = node.children[ch] = _TrieNode()
+            node = child
+            if track_subtree:
+                node.subtree.append(rid)
+        node.terminal.append(rid)
+
+    @staticmethod
+    def _walk(root, key):
+        node = root
+        for ch in key:
+            node = node.children.get(ch)
+            if node is None:
+                return None
+        return node
+
+    def lookup(self, kernel):
+        """
+        Record yang NUM-nya diawali `kernel` (exact, partial, atau NUM yang
+        punya suffix arch). Kalau kernel membawa arch tapi matrix tidak,
+        dicocokkan lewat base release.
+        """
+        node = self._walk(self._num_trie, kernel)
+        if node is not None and node.subtree:
+            return [self.records[rid] for rid in node.subtree]
+
+        base = strip_arch(kernel)
+        if base != kernel:
+            return [self.records[rid] for rid in self._exact.get(base, [])]
+        return []
+
+    def match_prefix_of(self, kernel):
+        """
+        Record yang base release-nya merupakan prefix dari `kernel`,
+        misal NUM "4.18.0-372" cocok untuk kernel "4.18.0-372.41.1.el8_6.x86_64".
+        """
+        rids = []
+        node = self._base_trie
+        rids.extend(node.terminal)
+        for ch in kernel:
+            node = node.children.get(ch)
+            if node is None:
+                break
+            rids.extend(node.terminal)
+        return [self.records[rid] for rid in sorted(rids)]
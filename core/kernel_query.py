@@ -0,0 +1,198 @@
+# core/kernel_query.py
+"""
+Query kompatibilitas untuk banyak kernel sekaligus (pre-upgrade check).
+
+Kernel dari /boot, /lib/modules dan kandidat upgrade package manager
+di-parse ke tuple versi, diurutkan, lalu di-sweep satu kali terhadap index
+range matrix yang juga terurut. Matrix dan support status dimuat sekali.
+Kernel tanpa entry mendapat tetangga terdekat (di bawah / di atas) dalam
+seri upstream yang sama (mis. 4.18.0).
+"""
+import glob
+import os
+import re
+from collections import namedtuple
+from core.environment import EnvironmentManager
+from core.kernel_index import strip_arch
+from core.logger import get_logger
+from utils.command import run_shell
+
+logger = get_logger(__name__)
+
+_TOKEN = re.compile(r"\d+|[A-Za-z]+")
+
+# timeout query package manager (detik); metadata repo bisa lambat
+PKG_QUERY_TIMEOUT = 60
+
+KernelQueryResult = namedtuple("KernelQueryResult", "kernel source compatible reason rows nearest")
+
+
+def version_key(release):
+    """
+    Tuple yang bisa dibandingkan untuk kernel release:
+    "4.18.0-372.41.1.el8_6.x86_64" -> ((0, 4, ''), (0, 18, ''), ..., (1, 0, 'el'), (0, 8, ''), ...).
+    Angka dibandingkan numerik dan selalu lebih kecil dari token huruf.
+    """
+    return tuple(
+        (0, int(tok), "") if tok.isdigit() else (1, 0, tok)
+        for tok in _TOKEN.findall(strip_arch(release))
+    )
+
+
+def series(key):
+    """Tiga komponen numerik pertama (upstream major.minor.patch)."""
+    return key[:3]
+
+
+def installed_kernels():
+    """Kernel release yang terpasang: /boot/vmlinuz-* dan /lib/modules/*."""
+    kernels = set()
+    for path in glob.glob("/boot/vmlinuz-*"):
+        release = os.path.basename(path)[len("vmlinuz-"):]
+        if "rescue" not in release:
+            kernels.add(release)
+    for path in glob.glob("/lib/modules/*"):
+        if os.path.isdir(os.path.join(path, "kernel")):
+            kernels.add(os.path.basename(path))
+    return sorted(kernels, key=version_key)
+
+
+def available_kernels(pkg_mgr=None):
+    """
+    Kernel yang akan dipasang oleh upgrade berikutnya, menurut package
+    manager (simulasi, tanpa mengubah sistem). List kosong kalau tidak didukung.
+    """
+    pkg_mgr = pkg_mgr or EnvironmentManager.detect_package_manager()
+    try:
+        if pkg_mgr == "apt":
+            out = run_shell(["apt-get", "-s", "-q", "dist-upgrade"], check=False, timeout=PKG_QUERY_TIMEOUT)
+            return sorted(set(re.findall(r"^Inst linux-image-(\d\S*)", out, re.M)), key=version_key)
+        if pkg_mgr in ("dnf", "yum"):
+            out = run_shell([pkg_mgr, "-q", "list", "updates", "kernel"], check=False, timeout=PKG_QUERY_TIMEOUT)
+            found = re.findall(r"^kernel\.(\S+)\s+(\S+)", out, re.M)
+            return sorted({f"{version}.{arch}" for arch, version in found}, key=version_key)
+    except Exception as e:
+        logger.warning(f"Could not query {pkg_mgr} for kernel upgrades: {e}")
+        return []
+    logger.info(f"Kernel upgrade query not supported for package manager '{pkg_mgr}'")
+    return []
+
+
+class KernelRangeIndex:
+    """
+    Record matrix dikelompokkan per base release dan diurutkan by version_key.
+    Dibangun sekali dari KernelIndex / SnapshotIndex.
+    """
+
+    def __init__(self, records):
+        groups = {}
+        for record in records:
+            groups.setdefault(strip_arch(record.num), []).append(record)
+        self.keys = sorted((version_key(base), base) for base in groups)
+        self.groups = groups
+
+    def neighbours(self, queries):
+        """
+        Satu sweep atas query yang sudah diurutkan: return dict
+        kernel -> (base di bawah, base di atas), masing-masing None kalau
+        tidak ada di seri upstream yang sama.
+        """
+        result = {}
+        i = 0
+        for key, kernel in sorted((version_key(k), k) for k in queries):
+            while i < len(self.keys) and self.keys[i][0] <= key:
+                i += 1
+            below = self.keys[i - 1] if i > 0 else None
+            above = self.keys[i] if i < len(self.keys) else None
+            result[kernel] = (
+                below[1] if below and series(below[0]) == series(key) else None,
+                above[1] if above and series(above[0]) == series(key) else None,
+            )
+        return result
+
+
+class BulkKernelQuery:
+    def __init__(self, checker):
+        self.checker = checker
+        self.index = checker.get_kernel_index()
+        self.support_data = checker.parse_cte_support_status()
+        self._ranges = None
+
+    @property
+    def ranges(self):
+        if self._ranges is None:
+            self._ranges = KernelRangeIndex(self.index.records)
+        return self._ranges
+
+    def _describe(self, base):
+        records = self.ranges.groups[base]
+        versions = sorted({r.start for r in records}, key=version_key)
+        ends = {r.end for r in records}
+        until = "active" if "0" in ends else "until " + max(ends, key=version_key)
+        return f"{base} ({', '.join(sorted({r.os for r in records}))}: CTE {versions[0]}+, {until})"
+
+    def query(self, kernels):
+        """
+        `kernels`: dict release -> source (mis. "running", "installed",
+        "available") atau iterable release. Return list KernelQueryResult
+        terurut berdasarkan versi.
+        """
+        if not isinstance(kernels, dict):
+            kernels = {k: None for k in kernels}
+
+        results, missing = {}, []
+        for kernel, source in kernels.items():
+            rows = self.checker.build_support_rows(self.index, self.support_data, kernel)
+            if not rows:
+                # NUM matrix bisa lebih pendek dari release lengkap
+                rows = self.checker.support_rows(self.index.match_prefix_of(strip_arch(kernel)), self.support_data)
+            if rows:
+                summary = self.checker.summarize_compatibility(rows)
+                results[kernel] = KernelQueryResult(kernel, source, summary["compatible"], summary["reason"], rows, None)
+            else:
+                missing.append(kernel)
+
+        for kernel, (below, above) in self.ranges.neighbours(missing).items():
+            nearest = {
+                "below": self._describe(below) if below else None,
+                "above": self._describe(above) if above else None,
+            }
+            results[kernel] = KernelQueryResult(kernel, kernels[kernel], False, "Kernel not found", [], nearest)
+
+        return [results[k] for k in sorted(results, key=version_key)]
+
+    def query_host(self, extra=()):
+        """Running + terpasang + kandidat upgrade (+ `extra`) dalam satu query."""
+        kernels = {}
+        for kernel in available_kernels():
+            kernels[kernel] = "available"
+        for kernel in installed_kernels():
+            kernels[kernel] = "installed"
+        kernels[self.checker.get_kernel_version()] = "running"
+        for kernel in extra:
+            kernels[kernel] = "requested"
+        return self.query(kernels)
+
+    @staticmethod
+    def print_table(results):
+        headers = ["Kernel", "Source", "Status", "Detail"]
+        rows = []
+        for r in results:
+            if r.rows:
+                detail = "; ".join(f"{row['OS']} CTE {row['CTE Start']} ({row['Compatibility']})" for row in r.rows[:3])
+            elif any(r.nearest.values()):
+                detail = "nearest: " + " | ".join(f"{side} {desc}" for side, desc in r.nearest.items() if desc)
+            else:
+                detail = "no CTE range in this kernel series"
+            status = "OK" if r.compatible else ("EOS" if r.rows else "NOT FOUND")
+            rows.append({"Kernel": r.kernel, "Source": r.source or "-", "Status": status, "Detail": detail})
+
+        col_widths = [max(len(row[h]) for row in rows + [dict(zip(headers, headers))]) for h in headers]
+        sep = "╬".join("═" * (w + 2) for w in col_widths)
+
+        print("╔" + sep.replace("╬", "╦") + "╗")
+        print("║ " + " ║ ".join(headers[i].ljust(col_widths[i]) for i in range(len(headers))) + " ║")
+        print("╠" + sep.replace("╬", "╬") + "╣")
+        for r in rows:
+            print("║ " + " ║ ".join(r[h].ljust(col_widths[i]) for i, h in enumerate(headers)) + " ║")
+        print("╚" + sep.replace("╬", "╩") + "╝")
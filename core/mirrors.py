@@ -0,0 +1,139 @@
+# core/mirrors.py
+"""
+Multi-mirror untuk repository CTE.
+
+main_package.info bisa berisi beberapa endpoint (tunnel trycloudflare,
+mirror http biasa). Semua kandidat di-probe paralel dengan HEAD singkat ke
+path repository (config.MIRROR_PROBE_PATH); 2xx/3xx sehat, begitu juga 403
+(autoindex dimatikan) dan 405 (HEAD tidak didukung) karena path di bawahnya
+tetap bisa dilayani. 4xx lain (kemungkinan bukan repository CTE, mis. link
+dokumentasi) tetap disimpan sebagai cadangan paling akhir. Semua diurutkan
+berdasarkan kesehatan lalu latency. Request kecil (index) di-hedge:
+kalau mirror terbaik belum menjawab dalam MIRROR_HEDGE_DELAY, mirror
+berikutnya ikut dicoba dan jawaban pertama yang sukses dipakai.
+"""
+import re
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import requests
+from core.logger import get_logger
+from utils import config
+from utils.http_client import http_get, http_head
+
+logger = get_logger(__name__)
+
+_URL_PATTERN = re.compile(r"https?:\/\/[^\s'\"<>]+")
+
+# status: kode HTTP probe (None kalau tidak ada response)
+MirrorProbe = namedtuple("MirrorProbe", "url healthy latency error status")
+
+# server hidup yang menolak listing / HEAD pada MIRROR_PROBE_PATH
+_REACHABLE_STATUS = (403, 405)
+
+
+def candidate_urls(text):
+    """Semua endpoint di info file, tanpa duplikat; tunnel trycloudflare lebih dulu."""
+    urls = []
+    for match in _URL_PATTERN.finditer(text):
+        url = match.group(0).rstrip("/")
+        if url not in urls:
+            urls.append(url)
+    tunnel = re.compile(config.DEFAULT_CLOUDFLARE_DOMAIN_PATTERN)
+    return sorted(urls, key=lambda u: not tunnel.match(u))
+
+
+def _probe(url, timeout):
+    started = time.monotonic()
+    try:
+        resp = http_head(url + config.MIRROR_PROBE_PATH, timeout=timeout, retries=False, allow_redirects=True)
+        latency = time.monotonic() - started
+        if not (200 <= resp.status_code < 400 or resp.status_code in _REACHABLE_STATUS):
+            return MirrorProbe(url, False, latency, f"HTTP {resp.status_code} on {config.MIRROR_PROBE_PATH}",
+                               resp.status_code)
+        return MirrorProbe(url, True, latency, None, resp.status_code)
+    except requests.RequestException as e:
+        return MirrorProbe(url, False, time.monotonic() - started, str(e), None)
+
+
+def probe_mirrors(urls, timeout=None, grace=None, max_workers=8):
+    """
+    HEAD semua mirror paralel. Setelah mirror sehat pertama menjawab, mirror
+    lain hanya ditunggu `grace` detik lagi. Return list MirrorProbe terurut:
+    yang sehat (latency naik), yang belum menjawab, yang gagal karena
+    network / 5xx, lalu yang menjawab 4xx; semua yang tidak sehat tetap
+    dipakai sebagai cadangan failover.
+    """
+    timeout = timeout or config.MIRROR_PROBE_TIMEOUT
+    grace = config.MIRROR_PROBE_GRACE if grace is None else grace
+    if not urls:
+        return []
+    executor = ThreadPoolExecutor(max_workers=min(max_workers, len(urls)))
+    try:
+        futures = [executor.submit(_probe, url, timeout) for url in urls]
+        deadline = time.monotonic() + timeout + 1
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, timeout=max(0.0, deadline - time.monotonic()),
+                                 return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            if any(f.result().healthy for f in done):
+                deadline = min(deadline, time.monotonic() + grace)
+        probes = [
+            f.result() if f.done() else MirrorProbe(url, False, None, "slower than other mirrors", None)
+            for url, f in zip(urls, futures)
+        ]
+    finally:
+        executor.shutdown(wait=False)
+
+    for p in probes:
+        if p.healthy:
+            logger.debug("Mirror %s healthy (%.0f ms)", p.url, p.latency * 1000)
+        else:
+            logger.warning("Mirror %s unhealthy: %s", p.url, p.error)
+    healthy = sorted((p for p in probes if p.healthy), key=lambda p: p.latency)
+    slow = [p for p in probes if p.latency is None]
+    client_error = [p for p in probes if not p.healthy and p.status and 400 <= p.status < 500]
+    failed = [p for p in probes if not p.healthy and p.latency is not None and p not in client_error]
+    return healthy + slow + failed + client_error
+
+
+def hedged_get(urls, hedge_delay=None, timeout=None):
+    """
+    GET `urls` (URL yang sama di mirror berbeda, urut prioritas). Request
+    berikutnya diluncurkan setiap `hedge_delay` detik tanpa jawaban, atau
+    segera setelah request sebelumnya gagal. Return (url, response) pertama
+    yang 2xx (body sudah dibaca); kalau semua gagal, error terakhir di-raise.
+    """
+    hedge_delay = config.MIRROR_HEDGE_DELAY if hedge_delay is None else hedge_delay
+    timeout = timeout or config.HTTP_TIMEOUT
+
+    def fetch(url):
+        resp = http_get(url, timeout=timeout, retries=False)
+        resp.raise_for_status()
+        resp.content  # baca body di worker
+        return url, resp
+
+    executor = ThreadPoolExecutor(max_workers=len(urls))
+    pending, last_error = {}, None
+    remaining = list(urls)
+    try:
+        while remaining or pending:
+            if remaining:
+                url = remaining.pop(0)
+                if pending:
+                    logger.debug("Hedging request to %s", url)
+                pending[executor.submit(fetch, url)] = url
+            done, _ = wait(pending, timeout=hedge_delay if remaining else None, return_when=FIRST_COMPLETED)
+            for future in done:
+                url = pending.pop(future)
+                try:
+                    return future.result()
+                except Exception as e:
+                    logger.debug("Request to %s failed: %s", url, e)
+                    last_error = e
+    finally:
+        # request yang kalah dibiarkan selesai di background
+        executor.shutdown(wait=False)
+    raise last_error
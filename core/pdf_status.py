@@ -0,0 +1,131 @@
+# core/pdf_status.py
+"""
+Parser tabel "CTE Release Support Status" dari PDF rilis Thales.
+
+Mode "targeted" (default):
+1. probe murah per page: baca content stream mentah (tanpa layout analysis)
+   dan cari token versi x.y.z di string literal operator teks;
+2. hanya page kandidat yang di-extract_text, dibagi ke process pool
+   (context "spawn": pemanggil seperti CheckPipeline punya thread lain yang
+   sedang jalan, dan fork dari proses multi-thread bisa mewarisi lock
+   yang sedang dipegang);
+3. hasil di-merge sesuai urutan page lalu diurutkan berdasarkan versi.
+
+Page yang teksnya tidak bisa dibaca mentah (font CID / hex string) selalu
+dianggap kandidat, jadi hasilnya sama dengan mode "full" (serial, semua page).
+"""
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+ROW_PATTERN = re.compile(r"^(\d+\.\d+\.\d+)\s+[\dA-Za-z-]+\s+([A-Za-z\s]+)$")
+
+_VERSION_BYTES = re.compile(rb"\d+\.\d+\.\d+")
+_LITERAL = re.compile(rb"\((?:\\.|[^\\)])*\)", re.S)
+_HEX_TEXT = re.compile(rb"<[0-9A-Fa-f\s]{2,}>\s*(?:Tj|'|\")|\[[^\]]*<[0-9A-Fa-f]")
+_TEXT_OPERATOR = re.compile(rb"\bT[jJ]\b|['\"]\s")
+
+# page kandidat sebanyak ini atau kurang di-extract langsung (tanpa pool)
+INLINE_PAGE_LIMIT = 2
+
+
+def _version_key(version):
+    return tuple(int(p) for p in version.split("."))
+
+
+def _rows(text):
+    for line in text.splitlines():
+        match = ROW_PATTERN.match(line.strip())
+        if match:
+            version, status = match.groups()
+            yield version.strip(), status.strip()
+
+
+def probe_pages(pdf_path):
+    """Index page (0-based) yang mungkin berisi tabel support status."""
+    from pdfminer.pdfdocument import PDFDocument
+    from pdfminer.pdfpage import PDFPage
+    from pdfminer.pdfparser import PDFParser
+    from pdfminer.pdftypes import resolve1
+
+    candidates = []
+    with open(pdf_path, "rb") as fh:
+        doc = PDFDocument(PDFParser(fh))
+        for number, page in enumerate(PDFPage.create_pages(doc)):
+            try:
+                data = b"\n".join(resolve1(s).get_data() for s in (page.contents or []))
+            except Exception as e:
+                logger.debug(f"Cannot read content stream of page {number + 1} ({e}); extracting it")
+                candidates.append(number)
+                continue
+            if not _TEXT_OPERATOR.search(data):
+                continue
+            # string literal digabung supaya versi yang dipecah kerning (TJ) tetap ketemu
+            literals = b"".join(m.group(0)[1:-1] for m in _LITERAL.finditer(data))
+            if _HEX_TEXT.search(data) or _VERSION_BYTES.search(literals):
+                candidates.append(number)
+    return candidates
+
+
+def _extract_pages(pdf_path, page_numbers):
+    """Worker: extract_text page tertentu saja, return [(version, status)] urut page."""
+    import logging
+    import warnings
+    import pdfplumber
+
+    warnings.filterwarnings("ignore", message="Could get FontBBox")
+    logging.getLogger("pdfminer").setLevel(logging.ERROR)
+
+    rows = []
+    with pdfplumber.open(pdf_path, pages=[n + 1 for n in page_numbers]) as pdf:
+        for page in pdf.pages:
+            text = page.extract_text()
+            if text:
+                rows.extend(_rows(text))
+    return rows
+
+
+def _extract_pages_all(pdf_path):
+    import pdfplumber
+
+    rows = []
+    with pdfplumber.open(pdf_path) as pdf:
+        for page in pdf.pages:
+            text = page.extract_text()
+            if text:
+                rows.extend(_rows(text))
+    return rows
+
+
+def _chunks(items, count):
+    size = -(-len(items) // count)
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def parse_support_status(pdf_path, mode="targeted", workers=None):
+    """
+    Dict {versi: status} (mis. {'7.8.0': 'Active'}), urut berdasarkan versi.
+    Versi yang muncul lebih dari sekali memakai baris terakhir (urutan page).
+    """
+    if mode == "full":
+        rows = _extract_pages_all(pdf_path)
+    else:
+        pages = probe_pages(pdf_path)
+        logger.debug(f"Release status table candidates in {pdf_path}: pages {[p + 1 for p in pages]}")
+        workers = min(workers or os.cpu_count() or 1, len(pages))
+        if len(pages) <= INLINE_PAGE_LIMIT or workers <= 1:
+            rows = _extract_pages(pdf_path, pages) if pages else []
+        else:
+            rows = []
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+                # chunk berurutan, map() menjaga urutan page saat merge
+                for chunk_rows in pool.map(_extract_pages, [pdf_path] * workers, _chunks(pages, workers)):
+                    rows.extend(chunk_rows)
+
+    merged = dict(rows)
+    return {v: merged[v] for v in sorted(merged, key=_version_key)}
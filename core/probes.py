@@ -0,0 +1,101 @@
+# core/probes.py
+"""
+Probe fakta host tanpa fork shell.
+
+Setiap probe membaca langsung dari kernel (os.uname, /proc, /etc/*-release,
+psutil) dan baru jatuh ke jalur subprocess lama kalau jalur native gagal.
+Set env CTE_NATIVE_PROBES=0 untuk memaksa jalur subprocess.
+"""
+import os
+import re
+import socket
+from utils.command import run_shell
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+NATIVE_PROBES = os.environ.get("CTE_NATIVE_PROBES", "1") != "0"
+
+
+def _native_or_fallback(name, native, fallback):
+    if NATIVE_PROBES:
+        try:
+            return native()
+        except Exception as e:
+            logger.debug(f"Native probe '{name}' failed ({e}); falling back to subprocess")
+    return fallback()
+
+
+def kernel_release():
+    """Sama dengan `uname -r`."""
+    return _native_or_fallback(
+        "kernel_release",
+        lambda: os.uname().release,
+        lambda: run_shell("uname -r").strip(),
+    )
+
+
+def release_text(path="/etc/os-release"):
+    """Isi mentah file /etc/*-release; string kosong kalau tidak ada."""
+    def native():
+        try:
+            with open(path) as fh:
+                return fh.read()
+        except FileNotFoundError:
+            return ""
+
+    return _native_or_fallback(
+        "release_text",
+        native,
+        lambda: run_shell(f"cat {path} || true"),
+    )
+
+
+def parse_os_release(text):
+    data = {}
+    for line in text.splitlines():
+        k, sep, v = line.partition("=")
+        if sep:
+            data[k.strip()] = v.strip().strip('"')
+    return data
+
+
+def os_release():
+    """/etc/os-release sebagai dict (NAME, VERSION_ID, ID, ...)."""
+    return parse_os_release(release_text("/etc/os-release"))
+
+
+def loaded_modules():
+    """Nama kernel module yang sedang ter-load (kolom pertama /proc/modules)."""
+    def native():
+        with open("/proc/modules") as fh:
+            return [line.split(" ", 1)[0] for line in fh if line.strip()]
+
+    def fallback():
+        out = run_shell("lsmod || true")
+        return [line.split()[0] for line in out.splitlines()[1:] if line.strip()]
+
+    return _native_or_fallback("loaded_modules", native, fallback)
+
+
+def is_module_loaded(pattern):
+    """True kalau ada module yang namanya mengandung `pattern` (seperti `lsmod | grep`)."""
+    return any(pattern in name for name in loaded_modules())
+
+
+def ipv4_addresses():
+    """Semua alamat IPv4 di semua interface (termasuk loopback)."""
+    def native():
+        import psutil
+        return [
+            addr.address
+            for addrs in psutil.net_if_addrs().values()
+            for addr in addrs
+            if addr.family == socket.AF_INET
+        ]
+
+    def fallback():
+        output = run_shell("ip -4 addr show", capture_output=True)
+        return re.findall(r"inet (\d+\.\d+\.\d+\.\d+)", output)
+
+    return _native_or_fallback("ipv4_addresses", native, fallback)
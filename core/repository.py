@@ -1,8 +1,9 @@
 # core/repository.py
-import re
-import requests
 from core.logger import get_logger
+from core.mirrors import candidate_urls, probe_mirrors
 from utils import config
+from utils import tracing
+from utils.http_cache import get_http_cache
 from utils.exceptions import RepositoryError
 
 logger = get_logger(__name__)
@@ -10,22 +11,35 @@ logger = get_logger(__name__)
 class RepositoryManager:
     def __init__(self, override_url=None):
         self.info_url = override_url or config.GITHUB_RAW_MAIN
+        self._mirrors = None
 
-    def fetch_active_repo_url(self):
+    def fetch_repo_urls(self):
+        """Semua endpoint kandidat di info file (trycloudflare lebih dulu)."""
         logger.info("Fetching repository info from %s", self.info_url)
-        resp = requests.get(self.info_url, timeout=10)
+        resp = get_http_cache().get(self.info_url, ttl=config.REPO_INFO_TTL, timeout=10)
         resp.raise_for_status()
-        text = resp.text
-        # try to find trycloudflare domain (common in your setup)
-        m = re.search(config.DEFAULT_CLOUDFLARE_DOMAIN_PATTERN, text)
-        if m:
-            url = m.group(0)
-            logger.info("Found active repo URL: %s", url)
-            return url.rstrip("/")
-        # fallback: try first http(s) link
-        m2 = re.search(r"https?:\/\/[^\s'\"<>]+", text)
-        if m2:
-            url = m2.group(0)
-            logger.info("Found fallback URL: %s", url)
-            return url.rstrip("/")
-        raise RepositoryError("Active repository URL not found in info file.")
+        urls = candidate_urls(resp.text)
+        if not urls:
+            raise RepositoryError("Active repository URL not found in info file.")
+        return urls
+
+    @tracing.traced("repo.discover")
+    def discover_mirrors(self):
+        """
+        Endpoint repository terurut (sehat + latency terendah dulu), di-probe
+        paralel sekali per instance. Mirror yang gagal probe tetap ada di
+        akhir list sebagai cadangan failover.
+        """
+        if self._mirrors is None:
+            urls = self.fetch_repo_urls()
+            ranked = probe_mirrors(urls)
+            self._mirrors = [p.url for p in ranked]
+            if ranked[0].healthy:
+                logger.info("Found active repo URL: %s (%.0f ms, %d mirror(s))",
+                            ranked[0].url, ranked[0].latency * 1000, len(urls))
+            else:
+                logger.warning("No repository mirror answered the probe; trying %s first", self._mirrors[0])
+        return self._mirrors
+
+    def fetch_active_repo_url(self):
+        return self.discover_mirrors()[0]
@@ -0,0 +1,146 @@
+# core/snapshot.py
+import os
+import sqlite3
+import tempfile
+import time
+from core.kernel_index import KernelRecord, strip_arch
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+SNAPSHOT_FORMAT_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE os_names (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+CREATE TABLE versions (id INTEGER PRIMARY KEY, version TEXT NOT NULL UNIQUE);
+CREATE TABLE kernels (
+    rid INTEGER PRIMARY KEY,
+    os_id INTEGER NOT NULL REFERENCES os_names(id),
+    num TEXT NOT NULL,
+    base TEXT NOT NULL,
+    start_id INTEGER NOT NULL REFERENCES versions(id),
+    end_id INTEGER NOT NULL REFERENCES versions(id)
+);
+CREATE INDEX kernels_num ON kernels(num);
+CREATE INDEX kernels_base ON kernels(base);
+CREATE TABLE support_status (version TEXT PRIMARY KEY, status TEXT NOT NULL);
+"""
+
+_RECORD_SQL = """
+SELECT o.name, k.num, s.version, e.version
+FROM kernels k
+JOIN os_names o ON o.id = k.os_id
+JOIN versions s ON s.id = k.start_id
+JOIN versions e ON e.id = k.end_id
+"""
+
+
+class CompatibilitySnapshot:
+    """
+    Snapshot offline (SQLite) dari compatibility matrix + tabel support
+    status PDF. Nama OS dan versi CTE di-intern ke tabel sendiri, kernel
+    disimpan sebagai kolom ber-index, jadi lookup tidak perlu memuat seluruh
+    matrix. Dipakai host air-gapped: tanpa network, tanpa pdfplumber.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        # read-only; file tidak pernah diubah setelah dibangun
+        self.conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+        meta = dict(self.conn.execute("SELECT key, value FROM meta"))
+        version = int(meta.get("format_version", 0))
+        if version != SNAPSHOT_FORMAT_VERSION:
+            raise ValueError(f"Unsupported snapshot format {version} in {path}")
+        self.meta = meta
+
+    @classmethod
+    def build(cls, out_path, matrix, support_status, sources=None):
+        """Compile matrix JSON + support status ke file snapshot (atomic)."""
+        directory = os.path.dirname(os.path.abspath(out_path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=".snapshot-", dir=directory)
+        os.close(fd)
+        try:
+            conn = sqlite3.connect(tmp)
+            conn.executescript(SCHEMA)
+            os_ids, version_ids = {}, {}
+
+            def intern(table, column, cache, value):
+                if value not in cache:
+                    cur = conn.execute(f"INSERT INTO {table} ({column}) VALUES (?)", (value,))
+                    cache[value] = cur.lastrowid
+                return cache[value]
+
+            rows = []
+            for os_entry in matrix.get("MAPPING", []):
+                os_id = intern("os_names", "name", os_ids, os_entry["OS"])
+                for k in os_entry.get("KERNEL", []):
+                    rows.append((
+                        os_id, k["NUM"], strip_arch(k["NUM"]),
+                        intern("versions", "version", version_ids, k["START"]),
+                        intern("versions", "version", version_ids, k["END"]),
+                    ))
+            conn.executemany(
+                "INSERT INTO kernels (os_id, num, base, start_id, end_id) VALUES (?, ?, ?, ?, ?)", rows
+            )
+            conn.executemany("INSERT INTO support_status VALUES (?, ?)", sorted(support_status.items()))
+
+            meta = {
+                "format_version": str(SNAPSHOT_FORMAT_VERSION),
+                "built_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                "kernel_count": str(len(rows)),
+            }
+            meta.update({k: str(v) for k, v in (sources or {}).items()})
+            conn.executemany("INSERT INTO meta VALUES (?, ?)", sorted(meta.items()))
+            conn.commit()
+            conn.execute("VACUUM")
+            conn.close()
+            os.replace(tmp, out_path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+        logger.info(f"Compatibility snapshot written to {out_path} ({len(rows)} kernels)")
+        return cls(out_path)
+
+    def support_status(self):
+        return dict(self.conn.execute("SELECT version, status FROM support_status"))
+
+    def kernel_index(self):
+        return SnapshotIndex(self.conn)
+
+
+class SnapshotIndex:
+    """Interface yang sama dengan KernelIndex, dijawab langsung dari SQLite."""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM kernels").fetchone()[0]
+
+    @property
+    def records(self):
+        return self._query("1", ())
+
+    def _query(self, where, params):
+        sql = f"{_RECORD_SQL} WHERE {where} ORDER BY k.rid"
+        return [KernelRecord(*row) for row in self.conn.execute(sql, params)]
+
+    def lookup(self, kernel):
+        # prefix match via range scan di index: kernel <= num < kernel + U+10FFFF
+        records = self._query("k.num >= ? AND k.num < ?", (kernel, kernel + "\U0010ffff"))
+        if records:
+            return records
+        base = strip_arch(kernel)
+        if base != kernel:
+            return self._query("k.base = ?", (base,))
+        return []
+
+    def match_prefix_of(self, kernel):
+        prefixes = [kernel[:i] for i in range(len(kernel) + 1)]
+        placeholders = ",".join("?" * len(prefixes))
+        return self._query(f"k.base IN ({placeholders})", prefixes)
@@ -0,0 +1,220 @@
+# core/storage_profiler.py
+import mmap
+import os
+import random
+import tempfile
+import time
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+MiB = 1024 * 1024
+# transform awal CTE membaca lalu menulis ulang setiap byte; beri margin
+ESTIMATE_SAFETY_FACTOR = 1.2
+
+
+class StorageProfiler:
+    """
+    Ukur throughput dan IOPS filesystem tempat candidate path berada, untuk
+    memperkirakan durasi transform awal CTE.
+
+    - sequential write/read dengan blok besar, random read/write 4 KiB
+    - O_DIRECT bila didukung filesystem (buffer aligned dari mmap anonim);
+      kalau tidak (mis. tmpfs), tulis buffered + fsync, buang page cache
+      dengan posix_fadvise lalu baca lewat mmap
+    - scratch file dibuat di filesystem target dan selalu dihapus
+    - setiap fase dibatasi ukuran dan waktu (total kira-kira max_seconds);
+      direktori yang tidak bisa diukur (ENOSPC, read-only, ...) dilaporkan
+      sebagai unmeasured, bukan exception
+    """
+
+    def __init__(self, scratch_bytes=256 * MiB, block_bytes=MiB, io_bytes=4096,
+                 random_ops=2000, max_seconds=10.0):
+        self.scratch_bytes = scratch_bytes
+        self.block_bytes = block_bytes
+        self.io_bytes = io_bytes
+        self.random_ops = random_ops
+        self.max_seconds = max_seconds
+
+    # --- helper I/O ---
+    @staticmethod
+    def _open(path, flags, direct):
+        if direct and hasattr(os, "O_DIRECT"):
+            try:
+                return os.open(path, flags | os.O_DIRECT), True
+            except OSError:
+                pass
+        return os.open(path, flags), False
+
+    @staticmethod
+    def _drop_cache(fd):
+        os.fsync(fd)
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+
+    def _seq_write(self, path, buf):
+        """Tulis sampai scratch_bytes atau batas waktu fase. Return (byte/s, direct, byte ditulis)."""
+        fd, direct = self._open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, True)
+        try:
+            start = time.perf_counter()
+            deadline = start + self.max_seconds / 4
+            written = 0
+            try:
+                written += os.write(fd, buf)
+            except OSError:
+                # O_DIRECT bisa ditolak saat write pertama; ulang tanpa direct
+                if not direct:
+                    raise
+                os.close(fd)
+                fd = None
+                fd, direct = self._open(path, os.O_WRONLY | os.O_TRUNC, False)
+                start = time.perf_counter()
+                deadline = start + self.max_seconds / 4
+                written += os.write(fd, buf)
+            while written < self.scratch_bytes and time.perf_counter() < deadline:
+                written += os.write(fd, buf)
+            os.fsync(fd)
+            elapsed = time.perf_counter() - start
+        finally:
+            if fd is not None:
+                try:
+                    self._drop_cache(fd)
+                finally:
+                    os.close(fd)
+        return written / elapsed, direct, written
+
+    def _seq_read(self, path, buf, direct):
+        fd, direct = self._open(path, os.O_RDONLY, direct)
+        try:
+            start = time.perf_counter()
+            total = 0
+            if direct:
+                while True:
+                    n = os.readv(fd, [buf])
+                    if n <= 0:
+                        break
+                    total += n
+            else:
+                with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+                    for off in range(0, len(mm), self.block_bytes):
+                        total += len(mm[off:off + self.block_bytes])
+            elapsed = time.perf_counter() - start
+        finally:
+            os.close(fd)
+        return total / elapsed
+
+    def _random_io(self, path, direct, write, size):
+        flags = os.O_RDWR if write else os.O_RDONLY
+        fd, direct = self._open(path, flags, direct)
+        buf = mmap.mmap(-1, self.io_bytes)
+        rng = random.Random(0)
+        slots = max(1, size // self.io_bytes)
+        deadline = time.perf_counter() + self.max_seconds / 4
+        ops = 0
+        try:
+            if not direct and not write:
+                self._drop_cache(fd)
+            start = time.perf_counter()
+            while ops < self.random_ops and time.perf_counter() < deadline:
+                offset = rng.randrange(slots) * self.io_bytes
+                if write:
+                    os.pwritev(fd, [buf], offset)
+                else:
+                    os.preadv(fd, [buf], offset)
+                ops += 1
+            if write:
+                os.fsync(fd)
+            elapsed = time.perf_counter() - start
+        finally:
+            buf.close()
+            os.close(fd)
+        return ops / elapsed
+
+    # --- API ---
+    def profile(self, directory):
+        """
+        Profil filesystem dari `directory`. Return dict throughput (byte/s),
+        IOPS, dan apakah O_DIRECT dipakai; kalau gagal diukur, dict dengan
+        "measured": False dan "error".
+        """
+        buf = mmap.mmap(-1, self.block_bytes)  # page-aligned, aman untuk O_DIRECT
+        buf.write(os.urandom(self.block_bytes))
+        scratch = None
+        try:
+            fd, scratch = tempfile.mkstemp(prefix=".cte_profile-", dir=directory)
+            os.close(fd)
+            seq_write, direct, size = self._seq_write(scratch, buf)
+            seq_read = self._seq_read(scratch, buf, direct)
+            rand_read = self._random_io(scratch, direct, write=False, size=size)
+            rand_write = self._random_io(scratch, direct, write=True, size=size)
+        except OSError as e:
+            logger.warning("Storage profile of %s failed: %s; reporting it as unmeasured", directory, e)
+            return {"directory": directory, "measured": False, "error": str(e)}
+        finally:
+            buf.close()
+            if scratch is not None:
+                try:
+                    os.unlink(scratch)
+                except OSError:
+                    pass
+
+        result = {
+            "directory": directory,
+            "measured": True,
+            "direct_io": direct,
+            "sample_bytes": size,
+            "seq_read_bps": seq_read,
+            "seq_write_bps": seq_write,
+            "rand_read_iops": rand_read,
+            "rand_write_iops": rand_write,
+        }
+        logger.info(
+            "Storage profile %s: seq read %.0f MiB/s, seq write %.0f MiB/s, "
+            "rand read %.0f IOPS, rand write %.0f IOPS (%s, %.0f MiB sample)",
+            directory, seq_read / MiB, seq_write / MiB, rand_read, rand_write,
+            "O_DIRECT" if direct else "buffered+mmap", size / MiB,
+        )
+        return result
+
+    def profile_paths(self, paths):
+        """Profil sekali per filesystem (st_dev), dipetakan ke setiap path."""
+        by_dev = {}
+        results = {}
+        for p in paths:
+            try:
+                if not os.path.isdir(p):
+                    continue
+                dev = os.stat(p).st_dev
+            except OSError as e:
+                results[p] = {"directory": p, "measured": False, "error": str(e)}
+                continue
+            if dev not in by_dev:
+                by_dev[dev] = self.profile(p)
+            results[p] = by_dev[dev]
+        return results
+
+    @staticmethod
+    def estimate(volume_bytes, file_count, profile, cpu_count=None):
+        """
+        Perkiraan durasi transform awal dan concurrency yang disarankan.
+
+        Satu stream: setiap byte dibaca lalu ditulis (read + write serial).
+        Dengan concurrency > 1 read dan write saling overlap, sehingga dibatasi
+        sisi yang lebih lambat. Concurrency disarankan dari random read IOPS
+        (HDD/SAN lambat ~ ratusan IOPS -> 1-2 worker, SSD/NVMe -> hingga CPU).
+        """
+        cpu_count = cpu_count or os.cpu_count() or 1
+        read_bps = max(profile["seq_read_bps"], 1.0)
+        write_bps = max(profile["seq_write_bps"], 1.0)
+        concurrency = max(1, min(cpu_count, int(profile["rand_read_iops"] // 1000) or 1))
+
+        if concurrency > 1:
+            seconds = volume_bytes / min(read_bps, write_bps)
+        else:
+            seconds = volume_bytes / read_bps + volume_bytes / write_bps
+        # biaya metadata per file (open/close/rename) ~ satu random write
+        seconds += file_count / max(profile["rand_write_iops"], 1.0) / concurrency
+        return {
+            "estimated_seconds": seconds * ESTIMATE_SAFETY_FACTOR,
+            "recommended_concurrency": concurrency,
+        }
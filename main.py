@@ -2,10 +2,13 @@
 # main.py
 import argparse
 import logging
+import sys
 from core.environment import EnvironmentManager
-from core.repository import RepositoryManager
-from core.compatibility_checker import CompatibilityChecker  # ✅ NEW import
-from core.host_info import HostInfoCollector
+from utils import tracing
+
+# Modul berat (requests, pdfplumber, bs4) di-import di dalam branch yang
+# membutuhkannya saja, supaya --help / --fix / --encrypt tetap cepat.
+# Lihat benchmarks/startup_budget.py.
 
 # Logging setup
 logging.basicConfig(
@@ -20,11 +23,44 @@ def main():
     parser = argparse.ArgumentParser(description="Thales CTE Setup & Integration Tool")
     parser.add_argument("--check", action="store_true", help="Check environment and compatibility")
     parser.add_argument("--install", action="store_true", help="Install Thales CTE Agent")
+    parser.add_argument("--version", metavar="VERSION", dest="install_version",
+                        help="With --install, reinstall / roll back to a version from the local artifact store")
     parser.add_argument("--encrypt", action="store_true", help="Encrypt asset folder")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="With --encrypt, only read the candidate files with a local stand-in (nothing is encrypted)")
     parser.add_argument("--fix", action="store_true", help="Resolve common issues automatically")
+    parser.add_argument("--apply", action="store_true",
+                        help="With --fix, run the suggested remedy commands instead of only printing them")
+    parser.add_argument("--estimate", action="store_true",
+                        help="Profile candidate storage and estimate initial encryption time")
+    parser.add_argument("--batch", metavar="SOURCE",
+                        help="Offline compatibility audit of host snapshots (directory, NDJSON file, or '-' for stdin)")
+    parser.add_argument("--output", metavar="FILE", default="-",
+                        help="NDJSON output for --batch (default: stdout)")
+    parser.add_argument("--snapshot", metavar="FILE",
+                        help="Answer --check/--batch from an offline compatibility snapshot")
+    parser.add_argument("--build-snapshot", metavar="FILE",
+                        help="Compile the matrix JSON and release-status PDF into an offline snapshot")
+    parser.add_argument("--pre-upgrade", action="store_true",
+                        help="Check installed and upgrade-candidate kernels against the compatibility matrix")
+    parser.add_argument("--kernel", metavar="RELEASE", action="append", default=[],
+                        help="Extra kernel release to include in --pre-upgrade (repeatable)")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="Write per-phase timing spans as a Chrome trace-event JSON file")
 
     args = parser.parse_args()
 
+    if args.trace:
+        tracing.enable()
+    try:
+        run(args, parser)
+    finally:
+        if args.trace:
+            count = tracing.export_chrome_trace(args.trace)
+            logger.info(f"Trace with {count} spans written to {args.trace}")
+
+
+def run(args, parser):
     # Validate we are inside venv (setup.sh handles env creation)
     EnvironmentManager.validate_virtualenv()
 
@@ -33,53 +69,93 @@ def main():
     # ========================
     if args.check:
         logger.info("Performing environment and repository compatibility check...")
+        from core.check_pipeline import CheckPipeline
+        from core.host_info import HostInfoCollector
         try:
-            # ✅ 1. Check environment
-            EnvironmentManager.check_system_info()
+            # system info, repo URL, matrix, PDF status dan host probes
+            # berjalan paralel; lihat core/check_pipeline.py
+            pipeline = CheckPipeline(snapshot_path=args.snapshot)
+            result = pipeline.run()
 
-            # ✅ 2. Fetch repository info
-            repo = RepositoryManager()
-            url = repo.fetch_active_repo_url()
-            logger.info(f"Active repository URL detected: {url}")
-
-            # ✅ 3. Compatibility check (new feature)
-            compat = CompatibilityChecker()
-            kernel_version = compat.get_kernel_version()
-            logger.info(f"Detected kernel version: {kernel_version}")
-
-            table = compat.check_kernel_support(kernel_version)
+            table = result["table"]
             if table:
-                compat.print_table(table)
-                summary = compat.summarize_compatibility(table)
+                pipeline.compat.print_table(table)
+                summary = result["summary"]
                 if summary["compatible"]:
                     logger.info(f"✅ This system is compatible with Thales CTE: {summary['reason']}")
                 else:
                     logger.warning(f"⚠️  This system might NOT be fully compatible: {summary['reason']}")
             else:
                 logger.warning("Could not determine Thales CTE compatibility automatically.")
-            info = HostInfoCollector().collect()
-            HostInfoCollector.print_table(info)
+            HostInfoCollector.print_table(result["host_info"])
             logger.info("Environment check completed successfully.")
-            
 
         except Exception as e:
             logger.error(f"Error during environment check: {e}")
             exit(1)
 
+    elif args.build_snapshot:
+        from core.compatibility_checker import CompatibilityChecker
+
+        logger.info(f"Building offline compatibility snapshot {args.build_snapshot}")
+        CompatibilityChecker().build_snapshot(args.build_snapshot)
+
+    elif args.pre_upgrade:
+        from core.compatibility_checker import CompatibilityChecker
+        from core.kernel_query import BulkKernelQuery
+
+        logger.info("Checking installed and available kernels for CTE coverage...")
+        query = BulkKernelQuery(CompatibilityChecker(snapshot_path=args.snapshot))
+        results = query.query_host(extra=args.kernel)
+        query.print_table(results)
+        uncovered = [r.kernel for r in results if not r.compatible]
+        if uncovered:
+            logger.warning(f"⚠️  {len(uncovered)} kernel(s) not covered by an active CTE version: {', '.join(uncovered)}")
+        else:
+            logger.info(f"✅ All {len(results)} kernels are covered by an active CTE version")
+
+    elif args.batch:
+        from core.batch_audit import BatchAuditor
+        from core.compatibility_checker import CompatibilityChecker
+
+        logger.info(f"Running offline batch compatibility audit on {args.batch}")
+        auditor = BatchAuditor(CompatibilityChecker(snapshot_path=args.snapshot))
+        if args.output == "-":
+            auditor.run(args.batch, sys.stdout)
+        else:
+            with open(args.output, "w") as out:
+                auditor.run(args.batch, out)
+
     elif args.install:
         logger.info("CTE Agent installation process started...")
-        # TODO: add integration logic
-        logger.info("Installation feature not implemented yet.")
+        from core.installer import Installer
+        from core.repository import RepositoryManager
+
+        try:
+            # --version: tanpa network, langsung dari artifact store (core/artifact_store.py)
+            Installer(RepositoryManager()).perform_install(version=args.install_version)
+            logger.info("✅ CTE Agent installation completed.")
+        except Exception as e:
+            logger.error(f"CTE Agent installation failed: {e}")
+            exit(1)
 
     elif args.encrypt:
         logger.info("Starting folder encryption process...")
-        # TODO: encryption automation
-        logger.info("Encryption feature not implemented yet.")
+        from core.encrypt_asset import EncryptAssetManager
+
+        EncryptAssetManager().auto_encrypt(dry_run=args.dry_run)
+
+    elif args.estimate:
+        logger.info("Estimating initial encryption time for candidate paths...")
+        from core.encrypt_asset import EncryptAssetManager
+
+        EncryptAssetManager().estimate_transform()
 
     elif args.fix:
         logger.info("Auto fixing common issues...")
-        # TODO: add automatic repair logic
-        logger.info("Fixing feature not implemented yet.")
+        from core.issue_resolver import IssueResolver
+
+        IssueResolver().auto_resolve(apply=args.apply)
 
     else:
         parser.print_help()
@@ -0,0 +1,9 @@
+# tests/conftest.py
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# cache / state tool diarahkan ke direktori sementara sebelum utils.config di-import
+os.environ.setdefault("CTE_CACHE_DIR", tempfile.mkdtemp(prefix="setup_cte-tests-"))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,105 @@
+# tests/test_artifact_store.py
+import hashlib
+import os
+import sys
+
+import pytest
+
+import main
+from benchmarks.artifact_server import ArtifactServer, make_fake_installer
+from core import artifact_store
+from core.artifact_store import ArtifactStore
+from core.installer import Installer
+from core.repository import RepositoryManager
+from utils import config
+
+NAME = "vee-fs-7.8.0.100-rh8-x86_64.bin"
+
+
+def _stage(store, name, data):
+    path = store.staging_path(name)
+    path.write_bytes(data)
+    return path
+
+
+def test_publish_and_lookup(tmp_path):
+    store = ArtifactStore(tmp_path)
+    data = b"installer-1"
+    path = store.publish("rh8", NAME, _stage(store, NAME, data))
+    digest = hashlib.sha256(data).hexdigest()
+
+    assert path == store.object_path(digest)
+    assert path.read_bytes() == data
+    assert not store.staging_path(NAME).exists()
+    assert store.lookup("rh8", filename=NAME) == path
+    assert store.lookup("rh8", version="7.8.0.100") == path
+    assert store.lookup("rh9", filename=NAME) is None
+    assert store.versions("rh8") == ["7.8.0.100"]
+    assert store.latest("rh8") == path
+
+
+def test_lookup_rejects_rebuilt_installer(tmp_path):
+    store = ArtifactStore(tmp_path)
+    path = store.publish("rh8", NAME, _stage(store, NAME, b"old build"))
+    assert store.lookup("rh8", filename=NAME, expected_sha256=hashlib.sha256(b"old build").hexdigest()) == path
+    assert store.lookup("rh8", filename=NAME, expected_sha256=hashlib.sha256(b"new build").hexdigest()) is None
+
+
+def test_missing_object_drops_ref(tmp_path):
+    store = ArtifactStore(tmp_path)
+    path = store.publish("rh8", NAME, _stage(store, NAME, b"gone"))
+    os.unlink(path)
+    assert store.lookup("rh8", filename=NAME) is None
+    assert store.latest("rh8") is None
+
+
+def test_lru_eviction_keeps_newest(tmp_path):
+    store = ArtifactStore(tmp_path, max_bytes=150)
+    first = store.publish("rh8", "vee-fs-1.0.0.1-rh8-x86_64.bin",
+                          _stage(store, "a.bin", b"a" * 100))
+    second = store.publish("rh8", "vee-fs-1.0.0.2-rh8-x86_64.bin",
+                           _stage(store, "b.bin", b"b" * 100))
+    assert not first.exists()
+    assert second.exists()
+    assert store.versions("rh8") == ["1.0.0.2"]
+
+
+def test_installer_redownloads_rebuilt_binary(tmp_path):
+    store = ArtifactStore(tmp_path)
+    store.publish("rh8", NAME, _stage(store, NAME, make_fake_installer(4096, seed=1)))
+    rebuilt = make_fake_installer(4096, seed=2)
+    with ArtifactServer(artifacts={"vee-fs-7.8.0.100-{target}-x86_64.bin": rebuilt}) as srv:
+        installer = Installer(RepositoryManager(override_url=f"{srv.url}/main_package.info"), store=store)
+        path = installer._fetch_latest("rh8")
+    assert path.read_bytes() == rebuilt
+    assert store.lookup("rh8", filename=NAME) == path
+
+
+def test_read_only_lookups_do_not_rewrite_index(tmp_path, monkeypatch):
+    store = ArtifactStore(tmp_path)
+    store.publish("rh8", NAME, _stage(store, NAME, b"installer-1"))
+    writes = []
+    real_write = artifact_store.atomic_write_json
+    monkeypatch.setattr(artifact_store, "atomic_write_json",
+                        lambda path, data: writes.append(path) or real_write(path, data))
+
+    assert store.lookup("rh9", filename=NAME) is None
+    assert store.lookup("rh8", version="0.0.0.1") is None
+    assert store.versions("rh8") == ["7.8.0.100"]
+    assert writes == []
+    # hit meng-update urutan LRU: index memang berubah
+    assert store.lookup("rh8", filename=NAME) is not None
+    assert writes == [store.index_path]
+
+
+def test_install_version_from_cli_uses_store(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "ARTIFACT_STORE_DIR", str(tmp_path))
+    store = ArtifactStore()
+    path = store.publish("rh8", NAME, _stage(store, NAME, b"installer-1"))
+    ran = []
+    monkeypatch.setattr(Installer, "determine_target", lambda self: "rh8")
+    monkeypatch.setattr(Installer, "_run_binary_installer", lambda self, p: ran.append(p))
+    monkeypatch.setattr(RepositoryManager, "discover_mirrors", lambda self: pytest.fail("network used"))
+    monkeypatch.setattr(sys, "argv", ["main.py", "--install", "--version", "7.8.0.100"])
+    main.main()
+    assert ran == [path]
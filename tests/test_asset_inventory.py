@@ -0,0 +1,71 @@
+# tests/test_asset_inventory.py
+import os
+import shutil
+import tempfile
+
+import pytest
+
+from core.asset_inventory import AssetInventoryScanner
+from core.encrypt_scheduler import EncryptScheduler
+
+
+def _tree(root):
+    os.makedirs(os.path.join(root, "a", "b"))
+    for rel, size in (("top.dat", 10), ("a/one.dat", 100), ("a/b/two.dat", 1000)):
+        with open(os.path.join(root, rel), "wb") as fh:
+            fh.write(b"x" * size)
+
+
+def test_scan_counts_files(tmp_path):
+    _tree(str(tmp_path))
+    totals = AssetInventoryScanner(workers=2).scan(str(tmp_path))["totals"]
+    assert totals["files"] == 3
+    assert totals["total_bytes"] == 1110
+
+
+@pytest.fixture
+def linked_root(tmp_path):
+    """Root berupa symlink ke direktori di filesystem lain (mis. data dir di volume terpisah)."""
+    if not os.path.isdir("/dev/shm") or os.stat("/dev/shm").st_dev == os.stat(str(tmp_path)).st_dev:
+        pytest.skip("needs a second filesystem")
+    target = tempfile.mkdtemp(dir="/dev/shm")
+    _tree(target)
+    link = tmp_path / "data"
+    link.symlink_to(target)
+    yield str(link)
+    shutil.rmtree(target)
+
+
+def test_symlinked_root_on_other_volume(linked_root):
+    totals = AssetInventoryScanner(workers=2).scan(linked_root)["totals"]
+    assert totals["files"] == 3
+    files = sorted(os.path.basename(p) for p, _ in EncryptScheduler.iter_file_stats(linked_root))
+    assert files == ["one.dat", "top.dat", "two.dat"]
+
+
+def _hardlinks(root, inodes, links):
+    os.makedirs(root)
+    for i in range(inodes):
+        first = os.path.join(root, f"f{i}")
+        with open(first, "wb") as fh:
+            fh.write(b"x" * 100)
+        for j in range(1, links):
+            os.link(first, os.path.join(root, f"f{i}.{j}"))
+
+
+def test_hardlink_duplicates_counted_once(tmp_path):
+    _hardlinks(str(tmp_path / "snap"), inodes=5, links=3)
+    totals = AssetInventoryScanner(workers=2).scan(str(tmp_path))["totals"]
+    assert (totals["files"], totals["total_bytes"]) == (5, 500)
+    assert (totals["hardlink_duplicates"], totals["hardlinks_untracked"]) == (10, 0)
+
+
+def test_hardlink_tracking_is_bounded(tmp_path):
+    _hardlinks(str(tmp_path / "snap"), inodes=5, links=3)
+    scanner = AssetInventoryScanner(workers=1, max_tracked_links=2)
+    totals = scanner.scan(str(tmp_path))["totals"]
+    # link dari inode di luar batas dihitung sebagai file biasa; dua inode
+    # pertama tetap terdeteksi penuh (masing-masing 2 duplikat)
+    assert totals["files"] + totals["hardlink_duplicates"] == 15
+    assert totals["hardlinks_untracked"] > 0
+    assert totals["hardlink_duplicates"] >= 4
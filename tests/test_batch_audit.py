@@ -0,0 +1,44 @@
+# tests/test_batch_audit.py
+import io
+import json
+
+import pytest
+
+from core.batch_audit import BatchAuditor
+from core.compatibility_checker import CompatibilityChecker
+from core.snapshot import CompatibilitySnapshot
+
+MATRIX = {"MAPPING": [{"OS": "RHEL 8", "KERNEL": [
+    {"NUM": "4.18.0-372.9.1.el8.x86_64", "START": "7.2.0.100", "END": "0"}]}]}
+
+
+@pytest.fixture
+def auditor(tmp_path):
+    path = str(tmp_path / "snapshot.db")
+    CompatibilitySnapshot.build(path, MATRIX, {"7.2.0": "Active"})
+    return BatchAuditor(CompatibilityChecker(snapshot_path=path))
+
+
+def test_batch_reports_invalid_rows_and_continues(tmp_path, auditor):
+    lines = [
+        {"Hostname": "web1", "Kernel": "4.18.0-372.9.1.el8.x86_64"},
+        ["not", "an", "object"],
+        "just a string",
+        {"Hostname": "web2", "Kernel": 418},
+        {"Hostname": "web3"},
+    ]
+    source = tmp_path / "hosts.ndjson"
+    source.write_text("\n".join(json.dumps(line) for line in lines) + "\n{broken\n")
+
+    out = io.StringIO()
+    counts = auditor.run(str(source), out)
+    results = [json.loads(line) for line in out.getvalue().splitlines()]
+
+    assert counts == {"total": 6, "compatible": 1, "incompatible": 5}
+    assert results[0]["compatible"] is True
+    assert results[1]["reason"] == "invalid record: expected JSON object, got list"
+    assert results[2]["reason"] == "invalid record: expected JSON object, got str"
+    assert results[3]["reason"] == "Kernel version is not a string"
+    assert results[4]["reason"] == "Kernel version missing"
+    assert results[5]["reason"].startswith("invalid JSON")
+    assert [r["source"] for r in results][1] == f"{source}:2"
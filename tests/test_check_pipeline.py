@@ -0,0 +1,78 @@
+# tests/test_check_pipeline.py
+import time
+
+import pytest
+
+from core import check_pipeline
+from core.check_pipeline import CheckPipeline
+from core.snapshot import CompatibilitySnapshot
+from utils import config
+from utils.exceptions import RepositoryError
+
+KERNEL = "4.18.0-372.9.1.el8.x86_64"
+MATRIX = {"MAPPING": [{"OS": "RHEL 8", "KERNEL": [{"NUM": KERNEL, "START": "7.2.0.100", "END": "0"}]}]}
+
+
+def _offline(monkeypatch, host_delay=0.0):
+    def repo_down():
+        raise RepositoryError("tunnel down")
+
+    def collect(self, cm_domain):
+        time.sleep(host_delay)
+        return {"Hostname": "test"}
+
+    monkeypatch.setattr(check_pipeline.EnvironmentManager, "check_system_info",
+                        staticmethod(lambda: {"kernel": KERNEL}))
+    monkeypatch.setattr(check_pipeline.HostInfoCollector, "collect", collect)
+    monkeypatch.setattr(check_pipeline.RepositoryManager, "fetch_active_repo_url", lambda self: repo_down())
+
+
+def test_snapshot_from_environment_tolerates_repo_failure(tmp_path, monkeypatch):
+    path = str(tmp_path / "snapshot.db")
+    CompatibilitySnapshot.build(path, MATRIX, {"7.2.0": "Active"})
+    monkeypatch.setattr(config, "SNAPSHOT_PATH", path)
+    _offline(monkeypatch)
+
+    result = CheckPipeline().run()
+    assert result["repo_url"] is None
+    assert result["summary"]["compatible"] is True
+    assert result["host_info"] == {"Hostname": "test"}
+
+
+def test_fatal_repo_error_does_not_wait_for_other_steps(monkeypatch):
+    monkeypatch.setattr(config, "SNAPSHOT_PATH", None)
+    _offline(monkeypatch, host_delay=2)
+    pipeline = CheckPipeline()
+    monkeypatch.setattr(pipeline.compat, "get_kernel_index", lambda: time.sleep(2))
+    monkeypatch.setattr(pipeline.compat, "parse_cte_support_status", lambda: {})
+    started = time.monotonic()
+    with pytest.raises(RepositoryError):
+        pipeline.run()
+    assert time.monotonic() - started < 1
+
+
+def test_fatal_error_cancels_pending_steps_without_cancel_futures(monkeypatch):
+    # Python 3.8: ThreadPoolExecutor.shutdown belum punya cancel_futures
+    real_shutdown = check_pipeline.ThreadPoolExecutor.shutdown
+
+    def shutdown_38(self, wait=True):
+        return real_shutdown(self, wait=wait)
+
+    def broken_collector():
+        raise RepositoryError("collector unavailable")
+
+    monkeypatch.setattr(check_pipeline.ThreadPoolExecutor, "shutdown", shutdown_38)
+    monkeypatch.setattr(config, "SNAPSHOT_PATH", None)
+    _offline(monkeypatch)
+    monkeypatch.setattr(check_pipeline.EnvironmentManager, "check_system_info",
+                        staticmethod(lambda: time.sleep(0.3) or {"kernel": KERNEL}))
+    monkeypatch.setattr(check_pipeline, "HostInfoCollector", broken_collector)
+    calls = []
+    pipeline = CheckPipeline(max_workers=1)
+    monkeypatch.setattr(pipeline.compat, "get_kernel_index", lambda: calls.append("index"))
+    monkeypatch.setattr(pipeline.compat, "parse_cte_support_status", lambda: calls.append("support"))
+    with pytest.raises(RepositoryError, match="collector"):
+        pipeline.run()
+    # satu-satunya worker masih sibuk: langkah yang antre harus batal, bukan jalan
+    time.sleep(0.5)
+    assert calls == []
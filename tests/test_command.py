@@ -0,0 +1,101 @@
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from core.environment import EnvironmentManager
+from utils.command import run_batch, run_shell, run_streaming
+
+
+def _group_alive(pgid):
+    """Proses non-zombie dengan process group `pgid` yang masih ada di /proc."""
+    for name in os.listdir("/proc"):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{name}/stat") as fh:
+                fields = fh.read().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        if int(fields[2]) == pgid and fields[0] != "Z":
+            return True
+    return False
+
+
+def _interrupt_when_started(pidfile):
+    def fire():
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            if os.path.exists(pidfile) and os.path.getsize(pidfile):
+                break
+            time.sleep(0.02)
+        os.kill(os.getpid(), signal.SIGINT)
+    threading.Thread(target=fire, daemon=True).start()
+
+
+@pytest.mark.parametrize("runner", [run_shell, run_streaming])
+def test_interrupt_kills_child_process_group(tmp_path, runner):
+    pidfile = str(tmp_path / "pid")
+    # child + cucu di process group yang sama
+    cmd = f"sleep 30 & echo $$ > {pidfile}; wait"
+    _interrupt_when_started(pidfile)
+    started = time.monotonic()
+    with pytest.raises(KeyboardInterrupt):
+        runner(cmd, timeout=20)
+    assert time.monotonic() - started < 10
+
+    with open(pidfile) as fh:
+        pgid = int(fh.read())
+    deadline = time.monotonic() + 2
+    while _group_alive(pgid) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not _group_alive(pgid)
+
+
+def test_timeout_kills_grandchildren_ignoring_sigterm(tmp_path):
+    pidfile = str(tmp_path / "pid")
+    ready = tmp_path / "ready"
+    stubborn = (f"import signal, time; signal.signal(signal.SIGTERM, signal.SIG_IGN); "
+                f"open({str(ready)!r}, 'w').close(); time.sleep(30)")
+    started = time.monotonic()
+    with pytest.raises(subprocess.TimeoutExpired):
+        run_streaming([sys.executable, "-c",
+                       f"import os, subprocess, time; open({pidfile!r}, 'w').write(str(os.getpgrp())); "
+                       f"subprocess.Popen([{sys.executable!r}, '-c', {stubborn!r}]); time.sleep(30)"],
+                      timeout=1.5)
+    assert time.monotonic() - started < 10
+    assert ready.exists()
+    with open(pidfile) as fh:
+        pgid = int(fh.read())
+    deadline = time.monotonic() + 2
+    while _group_alive(pgid) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not _group_alive(pgid)
+
+
+MISSING = "no-such-binary-for-cte-tests --version"
+
+
+def test_missing_binary_is_exit_127_like_the_shell():
+    # tanpa metachar: di-exec langsung, tapi tetap CalledProcessError seperti /bin/sh
+    for runner in (run_shell, run_streaming):
+        with pytest.raises(subprocess.CalledProcessError) as info:
+            runner(MISSING)
+        assert info.value.returncode == 127
+    assert run_shell(MISSING, check=False) == ""
+    assert run_streaming(MISSING, check=False).returncode == 127
+
+
+def test_run_command_reports_missing_binary():
+    with pytest.raises(subprocess.CalledProcessError):
+        EnvironmentManager.run_command(MISSING)
+
+
+def test_run_batch_reports_start_failure_as_127():
+    ok, missing = run_batch(["true", MISSING])
+    assert (ok.returncode, missing.returncode) == (0, 127)
+    assert "no-such-binary" in missing.tail
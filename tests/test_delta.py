@@ -0,0 +1,116 @@
+import hashlib
+import logging
+import os
+import time
+
+import pytest
+
+from benchmarks.artifact_server import ArtifactServer
+from core.artifact_store import ArtifactStore
+from core.delta import DeltaFetcher, build_block_map, match_blocks, missing_ranges
+from core.installer import Installer
+from utils import config
+from utils.exceptions import DigestMismatchError, DownloadError
+
+BLOCK = 4096
+NAME = "vee-fs-7.8.0.100-rh8-x86_64.bin"
+PATTERN = "vee-fs-7.8.0.100-{target}-x86_64.bin"
+
+
+@pytest.fixture
+def target():
+    return os.urandom(64 * BLOCK + 100)
+
+
+def _check(blockmap, target, seed, found):
+    for i, offset in found.items():
+        assert seed[offset:offset + BLOCK] == target[i * BLOCK:(i + 1) * BLOCK]
+
+
+def test_insert_in_seed_is_skipped(target):
+    # seed = target dengan byte tambahan di tengah (target menghapus bagian itu)
+    seed = target[:10 * BLOCK + 7] + os.urandom(999) + target[10 * BLOCK + 7:]
+    blockmap = build_block_map(target, BLOCK)
+    found = match_blocks(blockmap, seed)
+    _check(blockmap, target, seed, found)
+    assert set(range(64)) - set(found) == {10}
+    assert missing_ranges(blockmap, found) == [(10 * BLOCK, 11 * BLOCK - 1), (64 * BLOCK, 64 * BLOCK + 99)]
+
+
+def test_delete_from_seed_is_refetched(target):
+    # target menyisipkan data baru: block yang menyentuhnya tidak ada di seed
+    seed = target[:20 * BLOCK + 5] + target[20 * BLOCK + 3000:]
+    blockmap = build_block_map(target, BLOCK)
+    found = match_blocks(blockmap, seed)
+    _check(blockmap, target, seed, found)
+    assert set(range(64)) - set(found) == {20}
+
+
+def test_empty_and_short_seed(target):
+    blockmap = build_block_map(target, BLOCK)
+    assert match_blocks(blockmap, b"") == {}
+    assert match_blocks(blockmap, target[:BLOCK - 1]) == {}
+    # tanpa block yang cocok, semua (digabung) di-download
+    assert missing_ranges(blockmap, {}) == [(0, len(target) - 1)]
+
+
+def test_unrelated_seed_scan_is_bounded():
+    target = os.urandom(4 * 1024 * 1024)
+    blockmap = build_block_map(target, 64 * 1024)
+    seed = os.urandom(len(target))
+    started = time.monotonic()
+    assert match_blocks(blockmap, seed, max_scan_bytes=256 * 1024) == {}
+    assert time.monotonic() - started < 1.0
+
+    # min_reuse yang sudah tidak mungkin tercapai menghentikan scan lebih awal
+    started = time.monotonic()
+    assert match_blocks(blockmap, seed[:1024 * 1024], min_reuse=0.5, max_scan_bytes=len(seed)) == {}
+    assert time.monotonic() - started < 0.1
+
+
+def test_fetch_reconstructs_from_seed(tmp_path, target, monkeypatch):
+    # block map dibangun artifact server dengan ukuran block dari config
+    monkeypatch.setattr(config, "DELTA_BLOCK_SIZE", BLOCK)
+    seed = tmp_path / "old.bin"
+    seed.write_bytes(target[:30 * BLOCK] + os.urandom(BLOCK) + target[31 * BLOCK:])
+    with ArtifactServer(artifacts={PATTERN: target}) as srv:
+        url = f"{srv.url}/cte/bin/rh8/latest/{NAME}"
+        path, digest, stats = DeltaFetcher(min_reuse=0.5).fetch(url, seed, tmp_path / "new.bin")
+    assert path.read_bytes() == target
+    assert digest == hashlib.sha256(target).hexdigest()
+    assert stats["fetched_bytes"] < 3 * BLOCK
+
+
+def test_block_map_digest_mismatch_is_logged_as_error(tmp_path, target, caplog):
+    store = ArtifactStore(tmp_path / "store")
+    staged = store.staging_path(NAME)
+    staged.write_bytes(target)
+    store.publish("rh8", NAME, staged)
+    with ArtifactServer(artifacts={PATTERN: target}) as srv:
+        url = f"{srv.url}/cte/bin/rh8/latest/{NAME}"
+        with pytest.raises(DigestMismatchError):
+            DeltaFetcher().fetch(url, store.latest("rh8"), tmp_path / "new.bin", expected_sha256="0" * 64)
+
+        installer = Installer(repo_manager=None, store=store)
+        with caplog.at_level(logging.ERROR, logger="core.installer"):
+            assert installer._fetch_delta("rh8", url, tmp_path / "new.bin", [], "0" * 64) is None
+    assert any("does not match the expected SHA-256" in r.getMessage()
+               for r in caplog.records if r.levelno == logging.ERROR)
+
+
+def test_failed_range_removes_partial_file(tmp_path, target, monkeypatch):
+    monkeypatch.setattr(config, "DELTA_BLOCK_SIZE", BLOCK)
+    seed = tmp_path / "old.bin"
+    seed.write_bytes(target[:30 * BLOCK] + os.urandom(BLOCK) + target[31 * BLOCK:])
+    fetcher = DeltaFetcher(min_reuse=0.5)
+
+    def broken_range(*args):
+        raise DownloadError("mirror went away")
+
+    monkeypatch.setattr(fetcher, "_fetch_range", broken_range)
+    with ArtifactServer(artifacts={PATTERN: target}) as srv:
+        url = f"{srv.url}/cte/bin/rh8/latest/{NAME}"
+        with pytest.raises(DownloadError, match="went away"):
+            fetcher.fetch(url, seed, tmp_path / "new.bin")
+    assert not (tmp_path / "new.bin.delta").exists()
+    assert not (tmp_path / "new.bin").exists()
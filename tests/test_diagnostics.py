@@ -0,0 +1,112 @@
+import threading
+import time
+
+from core import diagnostics
+from core.diagnostics import FAIL, OK, UNKNOWN, WARN, DiagnosticEngine, Fact, Rule
+from utils import config
+
+INSTALLED = {"installed": True, "conf": True, "cert": True}
+NOT_INSTALLED = {"installed": False, "conf": False, "cert": False}
+
+
+def test_module_rule():
+    assert diagnostics._rule_module(["secfs2", "ext4"], INSTALLED)[0] == OK
+    assert diagnostics._rule_module(["ext4"], NOT_INSTALLED)[0] == WARN
+    assert diagnostics._rule_module(["ext4"], INSTALLED)[0] == FAIL
+
+
+def test_headers_rule():
+    assert diagnostics._rule_headers("5.14.0", {"installed": ["5.14.0"], "build_dir": False})[0] == OK
+    assert diagnostics._rule_headers("5.14.0", {"installed": [], "build_dir": True})[0] == OK
+    status, message = diagnostics._rule_headers("5.14.0", {"installed": ["5.10.0"], "build_dir": False})
+    assert status == FAIL and "5.10.0" in message
+
+
+def test_service_rules():
+    assert diagnostics._rule_secfs({"secfs2": "active"}, INSTALLED)[0] == OK
+    assert diagnostics._rule_secfs({"secfs2": "failed"}, INSTALLED)[0] == FAIL
+    assert diagnostics._rule_vmd(None, INSTALLED)[0] == UNKNOWN
+    assert diagnostics._rule_vmd({"vmd": "active"}, NOT_INSTALLED)[0] == WARN
+
+
+def test_cm_disk_and_registration_rules(monkeypatch):
+    assert diagnostics._rule_cm(None)[0] == UNKNOWN
+    assert diagnostics._rule_cm(("cm.example", None))[0] == OK
+    assert diagnostics._rule_cm(("cm.example", "refused"))[0] == FAIL
+
+    monkeypatch.setattr(config, "DIAGNOSTIC_MIN_FREE_BYTES", 100)
+    assert diagnostics._rule_disk({"/": 200})[0] == OK
+    status, message = diagnostics._rule_disk({"/": 200, "/var/log": 50})
+    assert status == FAIL and "/var/log" in message
+
+    assert diagnostics._rule_registration(INSTALLED)[0] == OK
+    assert diagnostics._rule_registration(NOT_INSTALLED)[0] == WARN
+    status, message = diagnostics._rule_registration({"installed": True, "conf": True, "cert": False})
+    assert status == FAIL and "cert" in message
+
+
+def test_shared_fact_collected_once_and_deps_passed():
+    calls = []
+    lock = threading.Lock()
+
+    def collect(name, value):
+        def fn(*args):
+            with lock:
+                calls.append(name)
+            return value(*args)
+        return fn
+
+    facts = {
+        "base": Fact("base", collect("base", lambda: 3), ()),
+        "derived": Fact("derived", collect("derived", lambda b: b * 2), ("base",)),
+    }
+    rules = [
+        Rule("a", ("base",), lambda b: (OK, f"base {b}"), None),
+        Rule("b", ("base", "derived"), lambda b, d: (FAIL, f"{b} {d}"), "fix-it"),
+    ]
+    findings = DiagnosticEngine(rules, facts, timeout=5).run()
+    assert sorted(calls) == ["base", "derived"]
+    # paling parah di atas; remedy hanya untuk FAIL
+    assert [(f.rule, f.status, f.message, f.remedy) for f in findings] == [
+        ("b", FAIL, "3 6", "fix-it"),
+        ("a", OK, "base 3", None),
+    ]
+
+
+def test_failed_dependency_and_rule_error_are_unknown():
+    def broken():
+        raise OSError("no such file")
+
+    facts = {
+        "broken": Fact("broken", broken, ()),
+        "child": Fact("child", lambda v: v, ("broken",)),
+        "fine": Fact("fine", lambda: 1, ()),
+    }
+    rules = [
+        Rule("uses child", ("child",), lambda v: (OK, ""), None),
+        Rule("raises", ("fine",), lambda v: 1 / 0, "never"),
+    ]
+    findings = {f.rule: f for f in DiagnosticEngine(rules, facts, timeout=5).run()}
+    assert findings["uses child"].status == UNKNOWN
+    assert "dependency failed" in findings["uses child"].message
+    assert findings["raises"].status == UNKNOWN and findings["raises"].remedy is None
+
+
+def test_hung_fact_only_turns_its_rules_unknown():
+    release = threading.Event()
+    facts = {
+        "hangs": Fact("hangs", lambda: release.wait(5), ()),
+        "fast": Fact("fast", lambda: "x", ()),
+    }
+    rules = [
+        Rule("slow rule", ("hangs",), lambda v: (OK, ""), None),
+        Rule("fast rule", ("fast",), lambda v: (OK, v), None),
+    ]
+    start = time.monotonic()
+    try:
+        findings = {f.rule: f for f in DiagnosticEngine(rules, facts, timeout=0.3).run()}
+    finally:
+        release.set()
+    assert time.monotonic() - start < 2
+    assert findings["fast rule"].status == OK
+    assert findings["slow rule"].status == UNKNOWN and "timeout" in findings["slow rule"].message
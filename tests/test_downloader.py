@@ -0,0 +1,93 @@
+# tests/test_downloader.py
+import hashlib
+import os
+
+import pytest
+
+from benchmarks.artifact_server import ArtifactServer
+from core.downloader import RangedDownloader, _InOrderHasher
+from utils.exceptions import DownloadError
+from utils.fileio import read_json
+
+NAME = "vee-fs-7.8.0.100-rh8-x86_64.bin"
+SIZE = 4 * 1024 * 1024
+
+
+@pytest.fixture
+def payload():
+    return os.urandom(SIZE)
+
+
+def _url(server):
+    return f"{server.url}/cte/bin/rh8/latest/{NAME}"
+
+
+def test_parallel_download_verifies_published_digest(tmp_path, payload):
+    with ArtifactServer(artifacts={"vee-fs-7.8.0.100-{target}-x86_64.bin": payload}) as srv:
+        dest, digest = RangedDownloader(segments=4, min_segment_bytes=512 * 1024).download(
+            _url(srv), tmp_path / NAME)
+        ranges = [r for r in srv.requests if r[0] == "GET" and r[2]]
+    assert digest == hashlib.sha256(payload).hexdigest()
+    assert dest.read_bytes() == payload
+    assert len(ranges) == 4
+    assert not (tmp_path / f"{NAME}.part.json").exists()
+
+
+def test_interrupted_download_resumes_from_journal(tmp_path, payload):
+    downloader = RangedDownloader(segments=4, min_segment_bytes=512 * 1024)
+    with ArtifactServer(artifacts={"vee-fs-7.8.0.100-{target}-x86_64.bin": payload},
+                        fail_after=SIZE // 2) as srv:
+        with pytest.raises(DownloadError):
+            downloader.download(_url(srv), tmp_path / NAME)
+        journal = read_json(tmp_path / f"{NAME}.part.json")
+        done = sum(seg[2] for seg in journal["segments"])
+        assert 0 < done < SIZE
+        first = srv.bytes_sent
+
+        srv.fail_after = None
+        dest, digest = downloader.download(_url(srv), tmp_path / NAME)
+        resumed = srv.bytes_sent - first
+
+    assert dest.read_bytes() == payload
+    # hanya sisa yang belum ter-download yang diambil ulang (+ file .sha256 kecil)
+    assert resumed <= SIZE - done + 4096
+
+
+def test_digest_mismatch_discards_partial(tmp_path, payload):
+    with ArtifactServer(artifacts={"vee-fs-7.8.0.100-{target}-x86_64.bin": payload}) as srv:
+        with pytest.raises(DownloadError, match="SHA-256 mismatch"):
+            RangedDownloader().download(_url(srv), tmp_path / NAME, expected_sha256="0" * 64)
+    assert not (tmp_path / f"{NAME}.part").exists()
+    assert not (tmp_path / NAME).exists()
+
+
+def _hash_out_of_order(tmp_path, data, chunk, max_buffer):
+    path = tmp_path / "artifact.part"
+    path.write_bytes(b"\0" * len(data))
+    fd = os.open(str(path), os.O_RDWR)
+    try:
+        hasher = _InOrderHasher(fd, max_buffer=max_buffer)
+        # segment kedua selesai dulu, lalu segment pertama
+        half = len(data) // 2
+        order = list(range(half, len(data), chunk)) + list(range(0, half, chunk))
+        for offset in order:
+            piece = data[offset:offset + chunk]
+            os.pwrite(fd, piece, offset)
+            frontier = offset + len(piece) if offset < half else 0
+            hasher.written(offset, piece, frontier)
+        hasher.catch_up(len(data))
+    finally:
+        os.close(fd)
+    return hasher
+
+
+def test_hasher_buffers_chunks_ahead_of_cursor(tmp_path, payload):
+    hasher = _hash_out_of_order(tmp_path, payload, 256 * 1024, max_buffer=SIZE)
+    assert hasher.hexdigest() == hashlib.sha256(payload).hexdigest()
+    assert hasher.reread_bytes == 0 and not hasher.pending
+
+
+def test_hasher_rereads_beyond_buffer(tmp_path, payload):
+    hasher = _hash_out_of_order(tmp_path, payload, 256 * 1024, max_buffer=512 * 1024)
+    assert hasher.hexdigest() == hashlib.sha256(payload).hexdigest()
+    assert hasher.reread_bytes == SIZE // 2 - 512 * 1024
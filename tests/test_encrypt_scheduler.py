@@ -0,0 +1,147 @@
+import os
+
+import pytest
+
+from core import encrypt_scheduler
+from core.encrypt_asset import EncryptAssetManager
+from core.encrypt_scheduler import CommandTransform, EncryptScheduler, StandInTransform
+from utils import config
+from utils.exceptions import EncryptError
+
+
+@pytest.fixture
+def state_dir(tmp_path, monkeypatch):
+    state = tmp_path / "state"
+    monkeypatch.setattr(config, "ENCRYPT_STATE_DIR", str(state))
+    return state
+
+
+def _tree(root, count=5, size=4096):
+    root.mkdir()
+    for i in range(count):
+        (root / f"f{i}.dat").write_bytes(os.urandom(size))
+    return root
+
+
+def test_refuses_to_run_without_command(state_dir, monkeypatch):
+    monkeypatch.setattr(config, "ENCRYPT_TRANSFORM_COMMAND", None)
+    with pytest.raises(EncryptError):
+        EncryptScheduler()
+
+
+def test_configured_command_is_used(state_dir, monkeypatch):
+    monkeypatch.setattr(config, "ENCRYPT_TRANSFORM_COMMAND", ["true", "{filelist}"])
+    assert isinstance(EncryptScheduler().transform, CommandTransform)
+
+
+def test_dry_run_uses_stand_in_with_separate_state(state_dir, tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "ENCRYPT_TRANSFORM_COMMAND", None)
+    scheduler = EncryptScheduler(dry_run=True, workers=1)
+    assert isinstance(scheduler.transform, StandInTransform)
+    assert scheduler.state_root == os.path.join(str(state_dir), "dry-run")
+
+    data = _tree(tmp_path / "data")
+    summary = scheduler.run([str(data)])
+    assert summary["completed"] and summary["bytes"] == 5 * 4096
+
+
+def test_dry_run_does_not_commit_manifest(state_dir, tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "ENCRYPT_TRANSFORM_COMMAND", None)
+    data = _tree(tmp_path / "data")
+    manager = EncryptAssetManager(candidate_paths=[str(data)])
+    first = manager.auto_encrypt(dry_run=True)
+    second = manager.auto_encrypt(dry_run=True)
+    assert first["changed_files"] == second["changed_files"] == 5
+
+
+def test_auto_encrypt_fails_before_walking_without_command(state_dir, tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "ENCRYPT_TRANSFORM_COMMAND", None)
+    manager = EncryptAssetManager(candidate_paths=[str(_tree(tmp_path / "data"))])
+    monkeypatch.setattr(EncryptScheduler, "iter_file_stats", lambda root: pytest.fail("tree walked"))
+    with pytest.raises(EncryptError):
+        manager.auto_encrypt()
+
+
+def test_auto_encrypt_walks_each_tree_once(state_dir, tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "ENCRYPT_TRANSFORM_COMMAND", None)
+    data = _tree(tmp_path / "data")
+    manager = EncryptAssetManager(candidate_paths=[str(data)])
+    monkeypatch.setattr(manager, "inventory", lambda *a, **kw: pytest.fail("separate inventory pass"))
+    walks = []
+    real_walk = EncryptScheduler.iter_file_stats
+    monkeypatch.setattr(EncryptScheduler, "iter_file_stats",
+                        staticmethod(lambda root: walks.append(root) or real_walk(root)))
+    summary = manager.auto_encrypt(dry_run=True)
+    assert summary["changed_files"] == 5
+    assert walks == [str(data)]
+
+
+def test_command_transform_throttles_before_running(tmp_path, monkeypatch):
+    data = _tree(tmp_path / "data", count=3, size=1000)
+    events = []
+
+    class Recorder:
+        def consume(self, nbytes=0, nops=0):
+            events.append(("throttle", nbytes, nops))
+
+    monkeypatch.setattr(encrypt_scheduler, "run_streaming", lambda argv, **kw: events.append(("run",)))
+    files = sorted(str(p) for p in data.iterdir())
+    assert CommandTransform(["true", "{filelist}"])(files, Recorder()) == 3000
+    assert events == [("throttle", 3000, 3), ("run",)]
+
+
+def test_unit_size_capped_under_throttle(state_dir):
+    scheduler = EncryptScheduler(transform=StandInTransform(), workers=2, unit_bytes=1 << 30, max_mbps=4)
+    assert scheduler.unit_bytes == 2 * 1024 * 1024 * config.ENCRYPT_THROTTLE_BURST_SECONDS
+
+
+class LoggingTransform:
+    """Catat file yang di-transform (lintas proses) dan gagalkan file tertentu."""
+
+    def __init__(self, log, fail=None):
+        self.log = log
+        self.fail = fail
+
+    def __call__(self, files, throttle):
+        if self.fail and any(f.endswith(self.fail) for f in files):
+            raise RuntimeError("injected failure")
+        with open(self.log, "a") as fh:
+            fh.write("\n".join(files) + "\n")
+        return 0
+
+
+def _transformed(log):
+    with open(log) as fh:
+        return sorted(os.path.basename(line.strip()) for line in fh if line.strip())
+
+
+def test_incremental_resume_skips_finished_units(state_dir, tmp_path):
+    data = _tree(tmp_path / "data")
+    log = str(tmp_path / "transformed.log")
+    manager = EncryptAssetManager(candidate_paths=[str(data)])
+
+    first = manager.auto_encrypt(EncryptScheduler(LoggingTransform(log, fail="f2.dat"),
+                                                  workers=1, unit_max_files=1))
+    assert not first["completed"] and first["failed"] == 1
+    assert len([e for e in os.scandir(state_dir) if e.is_dir()]) == 1  # satu plan dir per roots
+
+    os.unlink(log)
+    second = manager.auto_encrypt(EncryptScheduler(LoggingTransform(log), workers=1, unit_max_files=1))
+    assert second["completed"]
+    assert second["changed_files"] == 1 and second["skipped_files"] == 4
+    assert _transformed(log) == ["f2.dat"]
+    assert not [e for e in os.scandir(state_dir) if e.is_dir()]
+
+
+def test_stale_plan_for_same_roots_is_removed(state_dir, tmp_path):
+    data = _tree(tmp_path / "data")
+    stale = state_dir / "0123456789abcdef"
+    stale.mkdir(parents=True)
+    (stale / "plan.json").write_text('{"roots": ["%s"], "units": 1, "bytes": 1}' % data)
+    other = state_dir / "fedcba9876543210"
+    other.mkdir()
+    (other / "plan.json").write_text('{"roots": ["/elsewhere"], "units": 1, "bytes": 1}')
+
+    scheduler = EncryptScheduler(transform=StandInTransform(), workers=1)
+    scheduler.plan([str(data)])
+    assert not stale.exists() and other.exists()
@@ -0,0 +1,45 @@
+# tests/test_fileio.py
+import os
+import stat
+
+import pytest
+
+from utils.fileio import atomic_write_bytes, atomic_write_json, read_json
+
+
+@pytest.fixture
+def umask_022():
+    old = os.umask(0o022)
+    yield
+    os.umask(old)
+
+
+def _mode(path):
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+
+def test_new_file_gets_umask_mode(tmp_path, umask_022):
+    path = tmp_path / "matrix.json"
+    atomic_write_json(path, {"a": 1})
+    assert read_json(path) == {"a": 1}
+    assert _mode(path) == 0o644
+    assert [p.name for p in tmp_path.iterdir()] == ["matrix.json"]
+
+
+def test_rewrite_repairs_private_mode(tmp_path, umask_022):
+    # file yang dulu ditulis lewat mkstemp (0600) kembali terbaca user lain
+    path = tmp_path / "cte_release_status.pdf.status.json"
+    path.write_bytes(b"old")
+    path.chmod(0o600)
+    atomic_write_bytes(path, b"new")
+    assert path.read_bytes() == b"new"
+    assert _mode(path) == 0o644
+
+
+def test_mode_follows_umask(tmp_path):
+    old = os.umask(0o077)
+    try:
+        atomic_write_bytes(tmp_path / "private.bin", b"x")
+    finally:
+        os.umask(old)
+    assert _mode(tmp_path / "private.bin") == 0o600
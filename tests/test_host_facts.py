@@ -0,0 +1,68 @@
+import json
+import time
+
+import pytest
+
+from core import host_facts
+from core.host_facts import HostFacts
+
+
+@pytest.fixture
+def counters(monkeypatch):
+    calls = {"alpha": 0, "beta": 0}
+
+    def make(name):
+        def collect(facts):
+            calls[name] += 1
+            return f"{name}-{calls[name]}"
+        return collect
+
+    for name in calls:
+        monkeypatch.setitem(host_facts.COLLECTORS, name, make(name))
+    return calls
+
+
+def _cached(path):
+    with open(path) as fh:
+        return json.load(fh)["facts"]
+
+
+def test_partial_collections_merge_and_keep_collected_at(tmp_path, counters):
+    path = str(tmp_path / "host_facts.json")
+    assert HostFacts(ttl=60, cache_path=path).get("alpha") == "alpha-1"
+    alpha_at = _cached(path)["alpha"]["collected_at"]
+
+    # proses kedua hanya butuh beta; alpha dari proses pertama tetap tersimpan
+    assert HostFacts(ttl=60, cache_path=path).get("beta") == "beta-1"
+    cached = _cached(path)
+    assert set(cached) == {"alpha", "beta"}
+    assert cached["alpha"]["collected_at"] == alpha_at
+
+    third = HostFacts(ttl=60, cache_path=path)
+    assert (third.get("alpha"), third.get("beta")) == ("alpha-1", "beta-1")
+    assert counters == {"alpha": 1, "beta": 1}
+
+
+def test_ttl_is_per_fact(tmp_path, counters):
+    path = str(tmp_path / "host_facts.json")
+    facts = HostFacts(ttl=60, cache_path=path)
+    facts.get("alpha")
+    facts.get("beta")
+
+    with open(path) as fh:
+        data = json.load(fh)
+    data["facts"]["alpha"]["collected_at"] -= 120
+    with open(path, "w") as fh:
+        json.dump(data, fh)
+
+    fresh = HostFacts(ttl=60, cache_path=path)
+    assert fresh.get("beta") == "beta-1"
+    assert fresh.get("alpha") == "alpha-2"
+    assert counters == {"alpha": 2, "beta": 1}
+
+
+def test_old_cache_format_is_ignored(tmp_path, counters):
+    path = tmp_path / "host_facts.json"
+    path.write_text(json.dumps({"fingerprint": host_facts._fingerprint(), "collected_at": time.time(),
+                                "facts": {"alpha": "stale"}}))
+    assert HostFacts(ttl=60, cache_path=str(path)).get("alpha") == "alpha-1"
@@ -0,0 +1,52 @@
+# tests/test_host_info.py
+import time
+
+from core import host_info
+from core.host_info import HostInfoCollector
+
+
+def _collector(monkeypatch, probes):
+    collector = HostInfoCollector()
+    monkeypatch.setattr(collector, "_probes", lambda cm_domain: probes)
+    return collector
+
+
+def _sleeper(seconds, value):
+    def run():
+        time.sleep(seconds)
+        return value
+    return run
+
+
+def test_timeout_starts_when_probe_runs(monkeypatch):
+    monkeypatch.setattr(host_info, "DEFAULT_PROBE_TIMEOUT", 0.5)
+    collector = _collector(monkeypatch, [("a", _sleeper(0.3, "A")), ("b", _sleeper(0.3, "B"))])
+    # satu worker: "b" antre 0.3 s, tapi budget-nya baru mulai saat jalan
+    assert collector.collect(max_workers=1) == {"a": "A", "b": "B"}
+
+
+def test_hung_probe_reported_without_blocking(monkeypatch):
+    monkeypatch.setattr(host_info, "DEFAULT_PROBE_TIMEOUT", 0.2)
+
+    def boom():
+        raise RuntimeError("no")
+
+    collector = _collector(monkeypatch, [
+        ("slow", _sleeper(2, "late")), ("fast", lambda: "ok"), ("bad", boom)])
+    started = time.monotonic()
+    info = collector.collect(max_workers=3)
+    assert time.monotonic() - started < 1
+    assert info == {"slow": "Timeout", "fast": "ok", "bad": "Error"}
+
+
+def test_queued_probe_cancelled_when_workers_hang(monkeypatch):
+    monkeypatch.setattr(host_info, "DEFAULT_PROBE_TIMEOUT", 0.2)
+    ran = []
+    collector = _collector(monkeypatch, [
+        ("hang", _sleeper(3, "late")), ("queued", lambda: ran.append(1) or "ran")])
+    started = time.monotonic()
+    info = collector.collect(max_workers=1)
+    assert time.monotonic() - started < 1
+    assert info == {"hang": "Timeout", "queued": "Timeout"}
+    time.sleep(0.1)
+    assert ran == []
@@ -0,0 +1,71 @@
+# tests/test_http_cache.py
+import time
+
+import pytest
+
+from benchmarks.artifact_server import ArtifactServer
+from utils.http_cache import HTTPCache
+
+
+@pytest.fixture
+def server():
+    with ArtifactServer(artifacts={"vee-fs-1.0.0.1-{target}-x86_64.bin": b"x" * 1024}) as srv:
+        yield srv
+
+
+def _gets(server):
+    return [r for r in server.requests if r[0] == "GET"]
+
+
+def test_fetch_then_fresh_within_ttl(tmp_path, server):
+    cache = HTTPCache(str(tmp_path))
+    url = f"{server.url}/main_package.info"
+    first = cache.get(url, ttl=60)
+    assert first.source == "fetched"
+    second = cache.get(url, ttl=60)
+    assert second.source == "fresh"
+    assert second.content == first.content
+    assert len(_gets(server)) == 1
+
+
+def test_conditional_get_after_ttl(tmp_path, server):
+    cache = HTTPCache(str(tmp_path))
+    url = f"{server.url}/main_package.info"
+    cache.get(url, ttl=0)
+    resp = cache.get(url, ttl=0)
+    assert resp.source == "revalidated"
+    assert resp.text.startswith("active repo:")
+    assert len(_gets(server)) == 2
+
+
+def test_stale_if_slow_origin(tmp_path, server):
+    cache = HTTPCache(str(tmp_path))
+    url = f"{server.url}/main_package.info"
+    body = cache.get(url, ttl=0).content
+    server.latency = 2
+    resp = cache.get(url, ttl=0, revalidate_timeout=0.3)
+    assert resp.source == "stale"
+    assert resp.content == body
+
+
+def test_stale_while_revalidate_does_not_block(tmp_path, server):
+    cache = HTTPCache(str(tmp_path))
+    url = f"{server.url}/main_package.info"
+    cache.get(url, ttl=0)
+    server.latency = 0.5
+    started = time.monotonic()
+    resp = cache.get(url, ttl=0, stale_ttl=60)
+    assert resp.source == "stale"
+    assert time.monotonic() - started < 0.3
+    cache.wait(5)
+    assert len(_gets(server)) == 2
+    # revalidasi background memperbarui fetched_at, jadi entry fresh lagi
+    assert cache.get(url, ttl=60).source == "fresh"
+
+
+def test_eviction_by_size(tmp_path, server):
+    cache = HTTPCache(str(tmp_path), max_bytes=1500)
+    cache.get(f"{server.url}/cte/bin/rh8/latest/vee-fs-1.0.0.1-rh8-x86_64.bin")
+    cache.get(f"{server.url}/cte/bin/rh9/latest/vee-fs-1.0.0.1-rh9-x86_64.bin")
+    bodies = [p for p in tmp_path.iterdir() if p.name.endswith(".body")]
+    assert len(bodies) == 1
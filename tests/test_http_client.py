@@ -0,0 +1,40 @@
+# tests/test_http_client.py
+import socket
+import time
+
+import pytest
+import requests
+
+from benchmarks.artifact_server import ArtifactServer
+from utils import config
+from utils.http_client import get_session, http_get, http_head
+
+
+def test_retry_and_no_retry_requests_share_one_pool():
+    with ArtifactServer() as srv:
+        url = f"{srv.url}/main_package.info"
+        assert http_get(url).status_code == 200
+        assert http_get(url, retries=False).status_code == 200
+        assert http_head(url, retries=False).status_code == 200
+        adapter = get_session().get_adapter(url)
+        pools = adapter.poolmanager.pools
+        port = srv.httpd.server_address[1]
+        assert sum(pools[key].num_connections for key in pools.keys() if key.key_port == port) == 1
+        # override per request tidak bocor ke request berikutnya
+        assert adapter.max_retries.total == config.HTTP_RETRIES
+
+
+def test_no_retry_fails_fast():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    url = f"http://127.0.0.1:{port}/"
+    started = time.monotonic()
+    with pytest.raises(requests.ConnectionError):
+        http_get(url, retries=False, timeout=2)
+    assert time.monotonic() - started < config.HTTP_BACKOFF_FACTOR
+    # request biasa tetap di-retry dengan backoff
+    started = time.monotonic()
+    with pytest.raises(requests.ConnectionError):
+        http_get(url, timeout=2)
+    assert time.monotonic() - started >= config.HTTP_BACKOFF_FACTOR
@@ -0,0 +1,50 @@
+# tests/test_kernel_index.py
+from core.kernel_index import KernelIndex, strip_arch
+
+MATRIX = {
+    "MAPPING": [
+        {"OS": "RHEL 8", "KERNEL": [
+            {"NUM": "4.18.0-372.9.1.el8.x86_64", "START": "7.2.0.100", "END": "0"},
+            {"NUM": "4.18.0-372", "START": "7.1.0.50", "END": "7.5.0"},
+            {"NUM": "4.18.0-425.3.1.el8.x86_64", "START": "7.3.0.10", "END": "0"},
+        ]},
+        {"OS": "Ubuntu 22.04", "KERNEL": [
+            {"NUM": "5.15.0-91-generic", "START": "7.5.0.20", "END": "0"},
+        ]},
+    ]
+}
+
+
+def test_strip_arch():
+    assert strip_arch("4.18.0-372.9.1.el8.x86_64") == "4.18.0-372.9.1.el8"
+    assert strip_arch("5.15.0-91-generic") == "5.15.0-91-generic"
+
+
+def test_lookup_exact_and_partial():
+    index = KernelIndex(MATRIX)
+    assert len(index) == 4
+    exact = index.lookup("5.15.0-91-generic")
+    assert [(r.os, r.start) for r in exact] == [("Ubuntu 22.04", "7.5.0.20")]
+    # partial: semua NUM yang diawali query, urut seperti matrix
+    partial = index.lookup("4.18.0-372")
+    assert [r.num for r in partial] == ["4.18.0-372.9.1.el8.x86_64", "4.18.0-372"]
+
+
+def test_lookup_arch_only_in_query():
+    matrix = {"MAPPING": [{"OS": "RHEL 9", "KERNEL": [
+        {"NUM": "5.14.0-70.13.1.el9_0", "START": "7.2.0.1", "END": "0"}]}]}
+    index = KernelIndex(matrix)
+    assert [r.num for r in index.lookup("5.14.0-70.13.1.el9_0.x86_64")] == ["5.14.0-70.13.1.el9_0"]
+
+
+def test_lookup_miss():
+    index = KernelIndex(MATRIX)
+    assert index.lookup("6.1.0-1") == []
+    assert index.lookup("4.18.0-999.x86_64") == []
+
+
+def test_match_prefix_of_keeps_matrix_order():
+    index = KernelIndex(MATRIX)
+    records = index.match_prefix_of("4.18.0-372.9.1.el8.x86_64")
+    assert [r.num for r in records] == ["4.18.0-372.9.1.el8.x86_64", "4.18.0-372"]
+    assert index.match_prefix_of("5.4.0-1") == []
@@ -0,0 +1,114 @@
+# tests/test_kernel_query.py
+import pytest
+
+from core import kernel_query
+from core.compatibility_checker import CompatibilityChecker
+from core.kernel_index import KernelIndex
+from core.kernel_query import BulkKernelQuery, KernelRangeIndex, available_kernels, version_key
+from core.snapshot import CompatibilitySnapshot
+
+MATRIX = {
+    "MAPPING": [
+        {"OS": "RHEL 8", "KERNEL": [
+            {"NUM": "4.18.0-372.9.1.el8.x86_64", "START": "7.2.0.100", "END": "0"},
+            {"NUM": "4.18.0-372", "START": "7.1.0.50", "END": "7.5.0"},
+            {"NUM": "4.18.0-425.3.1.el8.x86_64", "START": "7.3.0.10", "END": "0"},
+        ]},
+        {"OS": "Ubuntu 22.04", "KERNEL": [
+            {"NUM": "5.15.0-91-generic", "START": "7.5.0.20", "END": "0"},
+        ]},
+    ]
+}
+SUPPORT = {"7.1.0": "End of Support", "7.2.0": "Active", "7.3.0": "Active", "7.5.0": "Active"}
+
+APT_OUTPUT = """\
+NOTE: This is only a simulation!
+Inst linux-image-generic [5.15.0.91.88] (5.15.0.94.91 Ubuntu:22.04/jammy-updates [amd64])
+Inst linux-image-5.15.0-94-generic (5.15.0-94.104 Ubuntu:22.04/jammy-updates [amd64])
+Inst linux-image-5.15.0-100-generic (5.15.0-100.110 Ubuntu:22.04/jammy-updates [amd64])
+Conf linux-image-5.15.0-94-generic (5.15.0-94.104 Ubuntu:22.04/jammy-updates [amd64])
+"""
+
+DNF_OUTPUT = """\
+kernel.x86_64                 4.18.0-513.5.1.el8_9                  baseos
+kernel.x86_64                 4.18.0-477.27.1.el8_8                 baseos
+kernel-headers.x86_64         4.18.0-513.5.1.el8_9                  baseos
+"""
+
+
+@pytest.fixture
+def bulk(tmp_path):
+    path = str(tmp_path / "snapshot.db")
+    CompatibilitySnapshot.build(path, MATRIX, SUPPORT)
+    return BulkKernelQuery(CompatibilityChecker(snapshot_path=path))
+
+
+def test_version_key_orders_numerically():
+    releases = ["5.4.0-100-generic", "4.18.0-372.41.1.el8", "5.4.0-99-generic",
+                "4.18.0-372.9.1.el8", "4.18.0-372.el8", "4.18.0-372.1.el8"]
+    assert sorted(releases, key=version_key) == [
+        "4.18.0-372.1.el8", "4.18.0-372.9.1.el8", "4.18.0-372.41.1.el8",
+        # angka selalu lebih kecil dari token huruf
+        "4.18.0-372.el8", "5.4.0-99-generic", "5.4.0-100-generic"]
+    assert version_key("4.18.0-372.9.1.el8.x86_64") == version_key("4.18.0-372.9.1.el8")
+
+
+def test_range_index_neighbours_stay_in_series():
+    ranges = KernelRangeIndex(KernelIndex(MATRIX).records)
+    assert ranges.neighbours(["4.18.0-400.1.1.el8", "4.18.0-500.el8", "4.18.0-1.el8", "6.1.0-13-amd64"]) == {
+        "4.18.0-400.1.1.el8": ("4.18.0-372.9.1.el8", "4.18.0-425.3.1.el8"),
+        "4.18.0-500.el8": ("4.18.0-425.3.1.el8", None),
+        "4.18.0-1.el8": (None, "4.18.0-372"),
+        # 5.15.0 di bawahnya beda seri: bukan tetangga
+        "6.1.0-13-amd64": (None, None),
+    }
+
+
+def test_query_exact_and_prefix_hit(bulk):
+    exact, prefix = bulk.query({"4.18.0-372.9.1.el8.x86_64": "running",
+                                "4.18.0-372.41.1.el8_6.x86_64": "installed"})
+    assert (exact.kernel, exact.source, exact.compatible) == ("4.18.0-372.9.1.el8.x86_64", "running", True)
+    assert [row["CTE Start"] for row in exact.rows] == ["7.2.0.100"] and exact.nearest is None
+
+    # NUM matrix "4.18.0-372" adalah prefix dari release lengkap
+    assert prefix.source == "installed"
+    assert [row["CTE Start"] for row in prefix.rows] == ["7.1.0.50"]
+    assert (prefix.compatible, prefix.reason) == (False, "End of Support")
+
+
+def test_query_miss_reports_nearest_both_sides(bulk):
+    [result] = bulk.query(["4.18.0-400.1.1.el8.x86_64"])
+    assert (result.compatible, result.reason, result.rows) == (False, "Kernel not found", [])
+    assert result.nearest["below"].startswith("4.18.0-372.9.1.el8 (RHEL 8: CTE 7.2.0.100+, active)")
+    assert result.nearest["above"].startswith("4.18.0-425.3.1.el8 (RHEL 8: CTE 7.3.0.10+, active)")
+
+
+def test_query_miss_without_series_neighbours(bulk):
+    results = bulk.query(["6.1.0-13-amd64", "5.15.0-91-generic"])
+    # urut berdasarkan versi, bukan urutan input
+    assert [r.kernel for r in results] == ["5.15.0-91-generic", "6.1.0-13-amd64"]
+    assert results[0].compatible
+    assert results[1].nearest == {"below": None, "above": None}
+
+
+def test_available_kernels_parses_apt_simulation(monkeypatch):
+    calls = []
+    monkeypatch.setattr(kernel_query, "run_shell", lambda cmd, **kw: calls.append(cmd) or APT_OUTPUT)
+    assert available_kernels("apt") == ["5.15.0-94-generic", "5.15.0-100-generic"]
+    assert calls == [["apt-get", "-s", "-q", "dist-upgrade"]]
+
+
+def test_available_kernels_parses_dnf_list_updates(monkeypatch):
+    calls = []
+    monkeypatch.setattr(kernel_query, "run_shell", lambda cmd, **kw: calls.append(cmd) or DNF_OUTPUT)
+    assert available_kernels("dnf") == ["4.18.0-477.27.1.el8_8.x86_64", "4.18.0-513.5.1.el8_9.x86_64"]
+    assert calls == [["dnf", "-q", "list", "updates", "kernel"]]
+
+
+def test_available_kernels_degrades_to_empty(monkeypatch):
+    def broken(cmd, **kw):
+        raise OSError("dnf not installed")
+
+    monkeypatch.setattr(kernel_query, "run_shell", broken)
+    assert available_kernels("dnf") == []
+    assert available_kernels("zypper") == []
@@ -0,0 +1,130 @@
+import hashlib
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from benchmarks.artifact_server import ArtifactServer
+from core.downloader import RangedDownloader
+from core.mirrors import candidate_urls, hedged_get, probe_mirrors
+from utils.exceptions import DownloadError
+
+NAME = "vee-fs-7.8.0.100-rh8-x86_64.bin"
+PATTERN = "vee-fs-7.8.0.100-{target}-x86_64.bin"
+SIZE = 4 * 1024 * 1024
+DEAD = "http://127.0.0.1:9"
+
+
+@pytest.fixture
+def status_server():
+    """Factory server HTTP hidup yang menjawab HEAD dengan status tertentu."""
+    servers = []
+
+    def start(status):
+        class Handler(BaseHTTPRequestHandler):
+            def do_HEAD(self):
+                self.send_response(status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=httpd.serve_forever, daemon=True).start()
+        servers.append(httpd)
+        return "http://127.0.0.1:%d" % httpd.server_address[1]
+
+    yield start
+    for httpd in servers:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+def _url(server):
+    return f"{server.url}/cte/bin/rh8/latest/{NAME}"
+
+
+def test_candidate_urls_dedupes_and_puts_tunnels_first():
+    text = ("mirror: http://mirror.example/\n"
+            "active: https://abc-def.trycloudflare.com\n"
+            "again: http://mirror.example\n")
+    assert candidate_urls(text) == ["https://abc-def.trycloudflare.com", "http://mirror.example"]
+
+
+def test_probe_ranks_non_repository_last(status_server):
+    not_a_repo = status_server(404)
+    with ArtifactServer() as repo:
+        ranked = probe_mirrors([not_a_repo, DEAD, repo.url], timeout=1, grace=1)
+    # 4xx tetap ada sebagai cadangan terakhir, di belakang error network
+    assert [p.url for p in ranked] == [repo.url, DEAD, not_a_repo]
+    assert ranked[0].healthy and ranked[0].status == 200
+    assert not ranked[1].healthy and ranked[1].status is None
+    assert not ranked[2].healthy and ranked[2].status == 404
+
+
+@pytest.mark.parametrize("status", [403, 405])
+def test_probe_treats_forbidden_listing_and_no_head_as_reachable(status_server, status):
+    url = status_server(status)
+    [probe] = probe_mirrors([url], timeout=1, grace=1)
+    assert probe.healthy and probe.status == status
+
+
+def test_probe_orders_by_latency():
+    with ArtifactServer(latency=0.3) as slow, ArtifactServer() as fast:
+        ranked = probe_mirrors([slow.url, fast.url], timeout=2, grace=1)
+    assert [p.url for p in ranked] == [fast.url, slow.url]
+    assert all(p.healthy for p in ranked)
+
+
+def test_hedged_get_uses_fastest_answer():
+    with ArtifactServer(latency=1.0) as slow, ArtifactServer() as fast:
+        started = time.monotonic()
+        url, resp = hedged_get([slow.url + "/main_package.info", fast.url + "/main_package.info"],
+                               hedge_delay=0.1, timeout=5)
+        elapsed = time.monotonic() - started
+    assert url.startswith(fast.url) and resp.status_code == 200
+    assert elapsed < 0.9
+
+
+def test_failover_resumes_segments_on_identical_mirror(tmp_path):
+    payload = os.urandom(SIZE)
+    with ArtifactServer(artifacts={PATTERN: payload}, fail_after=SIZE // 2) as primary, \
+            ArtifactServer(artifacts={PATTERN: payload}) as mirror:
+        dest, digest = RangedDownloader(segments=4, min_segment_bytes=512 * 1024).download(
+            _url(primary), tmp_path / NAME, mirrors=[_url(mirror)])
+    assert digest == hashlib.sha256(payload).hexdigest()
+    assert dest.read_bytes() == payload
+
+
+def test_failover_without_digest_rejects_mirror_with_other_validator(tmp_path, monkeypatch):
+    payload = os.urandom(SIZE)
+    downloader = RangedDownloader(segments=4, min_segment_bytes=512 * 1024)
+    monkeypatch.setattr(downloader, "resolve_expected_digest", lambda url, expected=None: None)
+    with ArtifactServer(artifacts={PATTERN: payload}, fail_after=SIZE // 2) as primary, \
+            ArtifactServer(artifacts={PATTERN: os.urandom(SIZE)}) as other:
+        # If-Range dengan ETag origin: mirror dengan isi lain menjawab 200, bukan 206
+        with pytest.raises(DownloadError, match="not honoured"):
+            downloader.download(_url(primary), tmp_path / NAME, mirrors=[_url(other)])
+        assert [r for r in other.requests if r[0] == "GET"]
+    assert not (tmp_path / NAME).exists()
+
+
+def test_failover_without_digest_or_validator_is_refused(tmp_path, monkeypatch):
+    payload = os.urandom(SIZE)
+    downloader = RangedDownloader(segments=4, min_segment_bytes=512 * 1024)
+    real_probe = downloader._probe
+
+    def probe_without_validator(urls):
+        size, ranges, _, ordered = real_probe(urls)
+        return size, ranges, None, ordered
+
+    monkeypatch.setattr(downloader, "resolve_expected_digest", lambda url, expected=None: None)
+    monkeypatch.setattr(downloader, "_probe", probe_without_validator)
+    with ArtifactServer(artifacts={PATTERN: payload}, fail_after=SIZE // 2) as primary, \
+            ArtifactServer(artifacts={PATTERN: payload}) as mirror:
+        with pytest.raises(DownloadError, match="Cannot fail over"):
+            downloader.download(_url(primary), tmp_path / NAME, mirrors=[_url(mirror)])
+        assert not [r for r in mirror.requests if r[0] == "GET"]
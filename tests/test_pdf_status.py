@@ -0,0 +1,31 @@
+import os
+
+import pytest
+
+from core import pdf_status
+
+PDF = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "cte_release_status.pdf")
+
+pytest.importorskip("pdfplumber")
+
+
+def test_targeted_matches_full():
+    assert pdf_status.parse_support_status(PDF) == pdf_status.parse_support_status(PDF, mode="full")
+
+
+def test_pool_uses_spawn_context(monkeypatch):
+    contexts = []
+    real_pool = pdf_status.ProcessPoolExecutor
+
+    def recording_pool(*args, **kwargs):
+        contexts.append(kwargs.get("mp_context"))
+        return real_pool(*args, **kwargs)
+
+    # paksa jalur pool: dua page kandidat, tanpa extract inline
+    monkeypatch.setattr(pdf_status, "INLINE_PAGE_LIMIT", 0)
+    monkeypatch.setattr(pdf_status, "probe_pages", lambda path: [0, 0])
+    monkeypatch.setattr(pdf_status, "ProcessPoolExecutor", recording_pool)
+
+    result = pdf_status.parse_support_status(PDF, workers=2)
+    assert [c.get_start_method() for c in contexts] == ["spawn"]
+    assert result == pdf_status.parse_support_status(PDF, mode="full")
@@ -0,0 +1,53 @@
+# tests/test_storage_profiler.py
+import errno
+import os
+import time
+
+from core import storage_profiler
+from core.encrypt_asset import EncryptAssetManager
+from core.storage_profiler import MiB, StorageProfiler
+
+
+def _scratch_files(directory):
+    return [n for n in os.listdir(directory) if n.startswith(".cte_profile-")]
+
+
+def test_profile_small_directory(tmp_path):
+    result = StorageProfiler(scratch_bytes=4 * MiB, random_ops=50).profile(str(tmp_path))
+    assert result["measured"] is True
+    assert result["sample_bytes"] == 4 * MiB
+    assert result["seq_write_bps"] > 0 and result["rand_read_iops"] > 0
+    assert _scratch_files(str(tmp_path)) == []
+
+
+def test_sequential_write_bounded_by_time(tmp_path):
+    profiler = StorageProfiler(scratch_bytes=64 * 1024 * MiB, random_ops=10, max_seconds=0.4)
+    started = time.monotonic()
+    result = profiler.profile(str(tmp_path))
+    assert time.monotonic() - started < 5
+    assert result["measured"] is True
+    assert result["sample_bytes"] < 64 * 1024 * MiB
+
+
+def test_enospc_reports_unmeasured_and_cleans_up(tmp_path, monkeypatch):
+    def full(fd, data):
+        raise OSError(errno.ENOSPC, "No space left on device")
+
+    monkeypatch.setattr(storage_profiler.os, "write", full)
+    result = StorageProfiler(scratch_bytes=4 * MiB).profile(str(tmp_path))
+    assert result["measured"] is False
+    assert "No space left" in result["error"]
+    assert _scratch_files(str(tmp_path)) == []
+
+
+def test_estimate_skips_unmeasured_paths(tmp_path):
+    (tmp_path / "f.dat").write_bytes(b"x" * 1000)
+
+    class Unmeasured(StorageProfiler):
+        def profile(self, directory):
+            return {"directory": directory, "measured": False, "error": "Read-only file system"}
+
+    estimates = EncryptAssetManager([str(tmp_path)]).estimate_transform(Unmeasured())
+    est = estimates[str(tmp_path)]
+    assert est["estimated_seconds"] is None
+    assert est["bytes"] == 1000
@@ -0,0 +1,76 @@
+# tests/test_tracing.py
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from utils import tracing
+
+
+@pytest.fixture
+def tracer(monkeypatch):
+    monkeypatch.setattr(tracing, "_tracer", None)
+    return tracing.enable()
+
+
+def _export(path):
+    count = tracing.export_chrome_trace(str(path))
+    with open(path) as fh:
+        return count, json.load(fh)["traceEvents"]
+
+
+def test_disabled_span_is_noop(tmp_path, monkeypatch):
+    monkeypatch.setattr(tracing, "_tracer", None)
+    assert not tracing.enabled()
+    assert tracing.span("a") is tracing.span("b", x=1)
+
+    @tracing.traced("fn")
+    def fn():
+        with tracing.span("inner"):
+            return 42
+
+    assert fn() == 42
+    assert tracing.export_chrome_trace(str(tmp_path / "trace.json")) == 0
+    assert not (tmp_path / "trace.json").exists()
+
+
+def test_export_writes_complete_events(tmp_path, tracer):
+    with tracing.span("repo.discover", url="http://mirror"):
+        with tracing.span("repo.probe"):
+            pass
+    count, events = _export(tmp_path / "trace.json")
+    spans = [e for e in events if e["ph"] == "X"]
+    assert count == 2
+    assert [e["name"] for e in spans] == ["repo.discover", "repo.probe"]
+    for e in spans:
+        assert e["cat"] == "repo" and e["tid"] == threading.get_ident()
+        assert e["ts"] >= 0 and e["dur"] >= 0
+    outer, inner = spans
+    assert outer["ts"] <= inner["ts"] and inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"]
+    assert outer["args"] == {"url": "http://mirror"}
+
+
+def test_exception_is_recorded_as_error(tmp_path, tracer):
+    @tracing.traced("compat.pdf_parse")
+    def parse():
+        raise ValueError("bad pdf")
+
+    with pytest.raises(ValueError):
+        parse()
+    _, events = _export(tmp_path / "trace.json")
+    [span] = [e for e in events if e["ph"] == "X"]
+    assert span["args"]["error"] == "ValueError: bad pdf"
+
+
+def test_pool_worker_threads_are_named_after_they_exit(tmp_path, tracer):
+    def work():
+        with tracing.span("host.probe"):
+            return threading.get_ident()
+
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="probe") as pool:
+        worker = pool.submit(work).result()
+    # pool sudah shutdown: thread worker tidak ada lagi di threading.enumerate()
+    _, events = _export(tmp_path / "trace.json")
+    names = {e["tid"]: e["args"]["name"] for e in events if e["ph"] == "M"}
+    assert names[worker].startswith("probe")
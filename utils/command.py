@@ -1,14 +1,79 @@
 # utils/command.py
+import logging
+import os
+import re
+import shlex
+import signal
 import subprocess
+import threading
+import time
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from core.logger import get_logger
+from utils import tracing
 
 logger = get_logger(__name__)
 
-def run_shell(cmd, check=True, capture_output=True, text=True):
+# karakter yang butuh /bin/sh (pipe, redirect, glob, expansion, ...)
+_SHELL_CHARS = re.compile(r"[|&;<>()$`\\\"'*?\[\]#~=%{}\n]")
+
+# detik antara SIGTERM dan SIGKILL ke process group saat timeout
+KILL_GRACE = 5
+# exit code /bin/sh untuk "command not found"
+NOT_FOUND_RETURNCODE = 127
+DEFAULT_TAIL_LINES = 200
+
+CommandResult = namedtuple("CommandResult", "cmd returncode tail elapsed timed_out")
+
+
+def _popen_args(cmd):
+    """String tanpa metachar shell di-split sendiri, jadi tidak fork /bin/sh."""
+    if not isinstance(cmd, str):
+        return list(cmd), False
+    if _SHELL_CHARS.search(cmd):
+        return cmd, True
+    return shlex.split(cmd), False
+
+
+def _start_failed(cmd, error):
+    """
+    Popen gagal (binary tidak ada, cwd hilang, ...). Dilaporkan seperti
+    `sh -c` melaporkannya: CalledProcessError exit 127, karena caller hanya
+    menangkap CalledProcessError.
+    """
+    logger.debug("Could not start command %s: %s", cmd, error)
+    return subprocess.CalledProcessError(NOT_FOUND_RETURNCODE, cmd, output="", stderr=str(error))
+
+
+def _kill_group(proc):
+    """
+    SIGTERM ke seluruh process group child, tunggu KILL_GRACE, lalu SIGKILL
+    ke sisa group (termasuk cucu yang masih hidup setelah child keluar).
+    """
+    try:
+        os.killpg(proc.pid, signal.SIGTERM)
+    except ProcessLookupError:
+        return
+    try:
+        proc.wait(timeout=KILL_GRACE)
+    except subprocess.TimeoutExpired:
+        pass
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+    proc.wait()
+
+
+def run_shell(cmd, check=True, capture_output=True, text=True, timeout=None, cwd=None):
     """
     Run shell command and return stdout.
     Compatible with Python 3.6+ (no capture_output/text native support).
-    Raises subprocess.CalledProcessError if check=True and exit code != 0.
+    Raises subprocess.CalledProcessError if check=True and exit code != 0,
+    subprocess.TimeoutExpired (setelah process group di-kill) kalau lewat `timeout`.
+    Interrupt (KeyboardInterrupt dsb.) juga membunuh process group sebelum di-raise ulang.
+    Command yang gagal start dianggap exit 127 (seperti di /bin/sh).
+    Untuk output besar pakai run_streaming.
     """
     logger.debug("Running shell command: %s", cmd)
 
@@ -21,11 +86,100 @@ def run_shell(cmd, check=True, capture_output=True, text=True):
     # Python 3.6 belum punya argumen text=True, pakai universal_newlines
     kwargs["universal_newlines"] = text
 
-    if isinstance(cmd, str):
-        proc = subprocess.run(cmd, shell=True, check=check, **kwargs)
-    else:
-        proc = subprocess.run(cmd, check=check, **kwargs)
+    args, shell = _popen_args(cmd)
+    with tracing.span("shell", cmd=cmd):
+        try:
+            proc = subprocess.Popen(args, shell=shell, cwd=cwd, start_new_session=True, **kwargs)
+        except OSError as e:
+            error = _start_failed(cmd, e)
+            if check:
+                raise error from e
+            return "" if capture_output else None
+        with proc:
+            try:
+                stdout, stderr = proc.communicate(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                _kill_group(proc)
+                proc.communicate()
+                raise
+            except BaseException:
+                # session sendiri: Ctrl-C terminal tidak sampai ke child
+                _kill_group(proc)
+                raise
+        if check and proc.returncode != 0:
+            raise subprocess.CalledProcessError(proc.returncode, cmd, stdout, stderr)
 
     if capture_output:
-        return proc.stdout.strip() if proc.stdout else ""
+        return stdout.strip() if stdout else ""
     return None
+
+
+def run_streaming(cmd, timeout=None, cwd=None, check=True, log=None, level=logging.INFO,
+                  prefix=None, tail_lines=DEFAULT_TAIL_LINES):
+    """
+    Jalankan command dan stream stdout+stderr baris per baris ke logger.
+    Hanya `tail_lines` baris terakhir yang disimpan (ring buffer), jadi memory
+    tetap flat berapa pun banyaknya output. Timeout dan interrupt (Ctrl-C)
+    membunuh seluruh process group. Return CommandResult; dengan check=True
+    exit code != 0 dan timeout menjadi CalledProcessError / TimeoutExpired
+    dengan tail sebagai output. Command yang gagal start dianggap exit 127.
+    """
+    log = log or logger
+    prefix = prefix or (os.path.basename(cmd[0]) if not isinstance(cmd, str) else "shell")
+    tail = deque(maxlen=tail_lines)
+    args, shell = _popen_args(cmd)
+    started = time.monotonic()
+
+    with tracing.span("shell.stream", cmd=cmd if isinstance(cmd, str) else " ".join(cmd)):
+        try:
+            proc = subprocess.Popen(
+                args, shell=shell, cwd=cwd, start_new_session=True,
+                stdout=subprocess.PIPE, stderr=subprocess.STDOUT, stdin=subprocess.DEVNULL,
+            )
+        except OSError as e:
+            error = _start_failed(cmd, e)
+            if check:
+                raise error from e
+            log.error("Could not start command %s: %s", cmd, e)
+            return CommandResult(cmd, error.returncode, error.stderr, time.monotonic() - started, False)
+
+        def pump():
+            for raw in proc.stdout:
+                line = raw.decode("utf-8", "replace").rstrip("\r\n")
+                tail.append(line)
+                log.log(level, "%s| %s", prefix, line)
+
+        reader = threading.Thread(target=pump, name=f"stream-{proc.pid}", daemon=True)
+        reader.start()
+        timed_out = False
+        try:
+            proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            timed_out = True
+            log.warning("Command timed out after %ss, killing process group: %s", timeout, cmd)
+            _kill_group(proc)
+        except BaseException:
+            # session sendiri: Ctrl-C terminal tidak sampai ke child
+            _kill_group(proc)
+            raise
+        finally:
+            # cucu yang mewarisi pipe bisa menahan EOF; jangan tunggu selamanya
+            reader.join(KILL_GRACE)
+            proc.stdout.close()
+
+    result = CommandResult(cmd, proc.returncode, "\n".join(tail), time.monotonic() - started, timed_out)
+    if check and timed_out:
+        raise subprocess.TimeoutExpired(cmd, timeout, output=result.tail)
+    if check and proc.returncode != 0:
+        raise subprocess.CalledProcessError(proc.returncode, cmd, output=result.tail)
+    return result
+
+
+def run_batch(cmds, max_workers=4, **kwargs):
+    """
+    Jalankan command independen secara paralel (maks `max_workers` sekaligus)
+    lewat run_streaming dengan check=False. Return list CommandResult sesuai
+    urutan `cmds`; command yang gagal start mendapat returncode 127.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(lambda cmd: run_streaming(cmd, check=False, **kwargs), cmds))
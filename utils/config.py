@@ -1,4 +1,106 @@
 # utils/config.py
-GITHUB_RAW_MAIN = "https://raw.githubusercontent.com/Nera-Project/enrolling_thales_cte/main/main_package.info"
+import os
+import shlex
+
+GITHUB_RAW_MAIN = os.environ.get(
+    "CTE_REPO_INFO_URL",
+    "https://raw.githubusercontent.com/Nera-Project/enrolling_thales_cte/main/main_package.info")
 DEFAULT_CLOUDFLARE_DOMAIN_PATTERN = r"https:\/\/[\w\-\.]+\.trycloudflare\.com"
 THALES_CM_URL = "https://thalesdocs.com/ctp/cte/cte-cm/"
+COMPAT_MATRIX_URL = "https://packages.vormetric.com/pub/cte_compatibility_matrix.json"
+
+# Lokasi cache lokal (HTTP cache, dll). Bisa di-override via env.
+CACHE_DIR = os.environ.get("CTE_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "setup_cte"))
+
+# HTTP cache: TTL per resource (detik) dan batas ukuran total
+HTTP_CACHE_MAX_BYTES = 64 * 1024 * 1024
+REPO_INFO_TTL = 300
+COMPAT_MATRIX_TTL = 6 * 3600
+# setelah TTL, matrix lama masih dipakai selama ini sambil direvalidasi di
+# background; repo info tidak (URL tunnel bisa sudah mati)
+COMPAT_MATRIX_STALE_TTL = 24 * 3600
+# kalau origin lambat/down, pakai entry basi setelah timeout ini
+HTTP_CACHE_REVALIDATE_TIMEOUT = 3
+
+# Download engine: jumlah koneksi paralel dan ukuran segment minimal
+DOWNLOAD_SEGMENTS = 4
+DOWNLOAD_MIN_SEGMENT_BYTES = 8 * 1024 * 1024
+# chunk segment yang tiba di depan cursor SHA-256 ditahan di memory sampai
+# sebanyak ini; sisanya di-hash dengan membaca ulang file (dari page cache)
+DOWNLOAD_HASH_BUFFER_BYTES = 64 * 1024 * 1024
+# Digest SHA-256 yang di-pin per nama file installer (opsional)
+PINNED_SHA256 = {}
+
+# Delta update installer (core/delta.py): ukuran block saat membuat
+# `<bin>.blockmap` dan porsi minimal yang bisa dipakai ulang dari installer lama
+DELTA_BLOCK_SIZE = 64 * 1024
+DELTA_MIN_REUSE = 0.2
+# batas byte seed yang digeser satu per satu saat mencari block (loop Python,
+# ~0.7 detik per MiB); block yang cocok dilompati dan tidak dihitung
+DELTA_MAX_SCAN_BYTES = 1024 * 1024
+
+# Artifact store untuk installer .bin (content-addressed, LRU)
+ARTIFACT_STORE_DIR = os.path.join(CACHE_DIR, "artifacts")
+ARTIFACT_STORE_MAX_BYTES = 4 * 1024 * 1024 * 1024
+
+# Batas waktu installer .bin (detik); process group di-kill kalau lewat
+INSTALLER_TIMEOUT = 1800
+
+# Multi-mirror repository: timeout probe HEAD dan delay sebelum request
+# index di-hedge ke mirror berikutnya (detik)
+MIRROR_PROBE_TIMEOUT = 2
+# path repository yang harus menjawab 2xx/3xx supaya endpoint dianggap mirror
+MIRROR_PROBE_PATH = "/cte/bin/"
+MIRROR_PROBE_GRACE = 0.25
+MIRROR_HEDGE_DELAY = 0.5
+
+# Shared HTTP client: pool per host, retry + exponential backoff untuk GET/HEAD
+HTTP_TIMEOUT = 15
+HTTP_POOL_MAXSIZE = 8
+HTTP_RETRIES = 3
+HTTP_BACKOFF_FACTOR = 0.5
+HTTP_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Parser PDF support status: "targeted" (probe page tabel, extract paralel)
+# atau "full" (serial, semua page); workers None = jumlah CPU
+PDF_PARSE_MODE = os.environ.get("CTE_PDF_PARSE_MODE", "targeted")
+PDF_PARSE_WORKERS = None
+
+# Snapshot offline (hasil `main.py --build-snapshot`); kalau di-set, --check
+# menjawab dari file ini tanpa network / pdfplumber
+SNAPSHOT_PATH = os.environ.get("CTE_SNAPSHOT")
+
+# folder kandidat untuk --encrypt / --estimate; env CTE_ENCRYPT_PATHS dipisah ":"
+ENCRYPT_CANDIDATE_PATHS = (os.environ["CTE_ENCRYPT_PATHS"].split(os.pathsep)
+                           if os.environ.get("CTE_ENCRYPT_PATHS") else ["/data", "/var/lib/mysql", "/backup"])
+# inventory: maksimum inode hardlink yang link-nya belum semua terlihat
+# (~150 byte per entry); di atas ini duplikat tidak lagi dideteksi
+INVENTORY_MAX_TRACKED_LINKS = 200000
+
+# Scheduler enkripsi: command transform CTE (argv, "{filelist}" diganti path
+# daftar file per unit), atau env CTE_ENCRYPT_COMMAND (di-split ala shell).
+# Wajib untuk --encrypt; stand-in read-only hanya dipakai dengan --dry-run.
+ENCRYPT_TRANSFORM_COMMAND = (shlex.split(os.environ["CTE_ENCRYPT_COMMAND"])
+                             if os.environ.get("CTE_ENCRYPT_COMMAND") else None)
+ENCRYPT_WORKERS = 4
+ENCRYPT_UNIT_BYTES = 256 * 1024 * 1024
+ENCRYPT_UNIT_MAX_FILES = 10000
+# batas I/O supaya database di disk yang sama tidak kelaparan (None = tanpa batas)
+ENCRYPT_MAX_MBPS = None
+ENCRYPT_MAX_IOPS = None
+# dengan batas MB/s, unit dibatasi sebesar budget satu worker selama ini
+# (detik), karena CLI transform menulis satu unit tanpa bisa di-pace
+ENCRYPT_THROTTLE_BURST_SECONDS = 5
+ENCRYPT_STATE_DIR = os.path.join(CACHE_DIR, "encrypt")
+
+# Host facts (core/host_facts.py): simpan ke disk dan pakai ulang antar proses
+# selama TTL ini (detik). None = hanya memoize per proses.
+HOST_FACTS_TTL = int(os.environ["CTE_HOST_FACTS_TTL"]) if os.environ.get("CTE_HOST_FACTS_TTL") else None
+
+# Diagnostik `--fix`: domain CipherTrust Manager (opsional), deadline total
+# dan per fact (detik), serta batas free space minimal per path
+CM_DOMAIN = os.environ.get("CTE_CM_DOMAIN")
+DIAGNOSTIC_TIMEOUT = 1.5
+DIAGNOSTIC_FACT_TIMEOUT = 1
+DIAGNOSTIC_MIN_FREE_BYTES = 1024 * 1024 * 1024
+DIAGNOSTIC_DISK_PATHS = ("/", "/opt/vormetric", "/var/log")
@@ -7,3 +7,12 @@ class CompatibilityError(Exception):
 
 class InstallerError(Exception):
     pass
+
+class DownloadError(Exception):
+    pass
+
+class DigestMismatchError(DownloadError):
+    pass
+
+class EncryptError(Exception):
+    pass
@@ -0,0 +1,58 @@
+# utils/fileio.py
+import json
+import os
+import tempfile
+
+
+def _umask():
+    """umask proses; dari /proc supaya tidak perlu os.umask() (tidak thread-safe)."""
+    try:
+        with open("/proc/self/status") as fh:
+            for line in fh:
+                if line.startswith("Umask:"):
+                    return int(line.split()[1], 8)
+    except (OSError, ValueError):
+        pass
+    mask = os.umask(0o022)
+    os.umask(mask)
+    return mask
+
+
+def atomic_write_bytes(path, data):
+    """
+    Tulis file secara atomic: tulis ke temp file di direktori yang sama,
+    fsync, lalu os.replace. Pembaca tidak pernah melihat file setengah jadi.
+    Mode file 0666 & ~umask seperti open() biasa; mkstemp sendiri membuat
+    0600, yang juga membetulkan file lama yang terlanjur 0600.
+    """
+    path = str(path)
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    mode = 0o666 & ~_umask()
+    fd, tmp = tempfile.mkstemp(prefix=".tmp-", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+            fh.flush()
+            os.fchmod(fh.fileno(), mode)
+            os.fsync(fh.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def atomic_write_json(path, obj):
+    atomic_write_bytes(path, json.dumps(obj, indent=2).encode("utf-8"))
+
+
+def read_json(path, default=None):
+    """Baca JSON; kembalikan `default` kalau file tidak ada atau rusak."""
+    try:
+        with open(str(path), "rb") as fh:
+            return json.loads(fh.read().decode("utf-8"))
+    except (OSError, ValueError):
+        return default
@@ -0,0 +1,231 @@
+# utils/http_cache.py
+import hashlib
+import json
+import os
+import time
+import threading
+import requests
+from core.logger import get_logger
+from utils import config
+from utils.fileio import atomic_write_bytes, atomic_write_json, read_json
+from utils.http_client import http_get
+
+logger = get_logger(__name__)
+
+
+class CachedResponse:
+    """
+    Hasil dari HTTPCache.get. `source` salah satu dari:
+    fresh (dalam TTL), revalidated (304), fetched (200), stale (dalam jendela
+    stale-while-revalidate, atau origin gagal/lambat).
+    """
+
+    def __init__(self, url, content, status_code, source, headers=None):
+        self.url = url
+        self.content = content
+        self.status_code = status_code
+        self.source = source
+        self.headers = headers or {}
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content.decode("utf-8"))
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error for url: {self.url}")
+
+
+class HTTPCache:
+    """
+    Cache HTTP lokal bersama untuk semua fetch remote.
+
+    - menyimpan ETag / Last-Modified dan melakukan conditional GET (304)
+    - TTL per resource: dalam TTL tidak ada request sama sekali
+    - eviction LRU berdasarkan total ukuran body
+    - stale-while-revalidate: sesaat setelah TTL habis entry lama langsung
+      dipakai dan direvalidasi di thread background
+    - stale-if-error: kalau revalidasi blocking gagal / lambat, entry lama dipakai
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=None):
+        self.cache_dir = cache_dir or os.path.join(config.CACHE_DIR, "http")
+        self.max_bytes = max_bytes if max_bytes is not None else config.HTTP_CACHE_MAX_BYTES
+        self._lock = threading.Lock()
+        self._inflight = set()
+        self._threads = []
+
+    # --- layout file ---
+    def _paths(self, url):
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        base = os.path.join(self.cache_dir, key)
+        return base + ".meta.json", base + ".body"
+
+    def _load(self, url):
+        meta_path, body_path = self._paths(url)
+        meta = read_json(meta_path)
+        if not meta or meta.get("url") != url:
+            return None, None
+        try:
+            with open(body_path, "rb") as fh:
+                body = fh.read()
+        except OSError:
+            return None, None
+        return meta, body
+
+    def _store(self, url, meta, body=None):
+        meta_path, body_path = self._paths(url)
+        try:
+            if body is not None:
+                atomic_write_bytes(body_path, body)
+            atomic_write_json(meta_path, meta)
+        except OSError as e:
+            logger.debug("Could not write HTTP cache entry for %s: %s", url, e)
+
+    def _touch(self, url, meta):
+        meta["last_access"] = time.time()
+        self._store(url, meta)
+
+    # --- API utama ---
+    def get(self, url, ttl=0, timeout=10, revalidate_timeout=None, stale_ttl=0):
+        """
+        GET dengan cache. `ttl` = berapa detik entry dianggap fresh tanpa
+        revalidasi. Selama `stale_ttl` detik berikutnya entry langsung dipakai
+        dan direvalidasi di background (stale-while-revalidate). Setelah itu
+        revalidasi blocking memakai `revalidate_timeout` (lebih pendek) dan
+        jatuh ke entry basi bila origin gagal (stale-if-error).
+        """
+        with self._lock:
+            meta, body = self._load(url)
+        now = time.time()
+
+        if meta is not None:
+            age = now - meta.get("fetched_at", 0)
+            if age < ttl:
+                logger.debug("HTTP cache fresh hit: %s", url)
+                self._touch(url, meta)
+                return CachedResponse(url, body, 200, "fresh")
+            if age < ttl + stale_ttl:
+                logger.debug("HTTP cache stale hit, revalidating in background: %s", url)
+                self._touch(url, meta)
+                self._revalidate_async(url, timeout)
+                return CachedResponse(url, body, 200, "stale")
+            if revalidate_timeout is None:
+                revalidate_timeout = config.HTTP_CACHE_REVALIDATE_TIMEOUT
+            timeout = min(timeout, revalidate_timeout)
+        return self._fetch(url, meta, body, timeout)
+
+    def _revalidate_async(self, url, timeout):
+        with self._lock:
+            if url in self._inflight:
+                return
+            self._inflight.add(url)
+
+        def worker():
+            try:
+                with self._lock:
+                    meta, body = self._load(url)
+                self._fetch(url, meta, body, timeout, background=True)
+            except Exception as e:
+                logger.debug("Background revalidation of %s failed: %s", url, e)
+            finally:
+                with self._lock:
+                    self._inflight.discard(url)
+
+        thread = threading.Thread(target=worker, name="http-cache-revalidate", daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def wait(self, timeout=None):
+        """Tunggu revalidasi background yang sedang berjalan (dipakai test/benchmark)."""
+        for thread in list(self._threads):
+            thread.join(timeout)
+        self._threads = [t for t in self._threads if t.is_alive()]
+
+    def _fetch(self, url, meta, body, timeout, background=False):
+        """Conditional GET ke origin; simpan hasilnya. Entry lama dipakai kalau origin gagal."""
+        now = time.time()
+        headers = {}
+        if meta is not None:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+        stale_log = logger.debug if background else logger.warning
+
+        try:
+            # ada salinan lama -> jangan retry, langsung pakai stale kalau gagal
+            resp = http_get(url, headers=headers, timeout=timeout, retries=meta is None)
+        except requests.RequestException as e:
+            if meta is not None:
+                stale_log("Origin unreachable for %s (%s); using stale cached copy", url, e)
+                return CachedResponse(url, body, 200, "stale")
+            raise
+
+        if resp.status_code == 304 and meta is not None:
+            logger.debug("HTTP cache revalidated (304): %s", url)
+            meta["fetched_at"] = now
+            self._touch(url, meta)
+            return CachedResponse(url, body, 200, "revalidated")
+
+        if resp.status_code >= 500 and meta is not None:
+            stale_log("Origin returned %s for %s; using stale cached copy", resp.status_code, url)
+            return CachedResponse(url, body, 200, "stale")
+
+        if resp.status_code != 200:
+            return CachedResponse(url, resp.content, resp.status_code, "fetched", dict(resp.headers))
+
+        new_meta = {
+            "url": url,
+            "etag": resp.headers.get("ETag"),
+            "last_modified": resp.headers.get("Last-Modified"),
+            "fetched_at": now,
+            "last_access": now,
+            "size": len(resp.content),
+        }
+        with self._lock:
+            self._store(url, new_meta, resp.content)
+            self._evict()
+        return CachedResponse(url, resp.content, 200, "fetched", dict(resp.headers))
+
+    def _evict(self):
+        """Hapus entry yang paling lama tidak diakses sampai total <= max_bytes."""
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return
+        entries = []
+        total = 0
+        for name in names:
+            if not name.endswith(".meta.json"):
+                continue
+            meta = read_json(os.path.join(self.cache_dir, name)) or {}
+            size = meta.get("size", 0)
+            total += size
+            entries.append((meta.get("last_access", 0), name[:-len(".meta.json")], size))
+
+        entries.sort()
+        for _, key, size in entries:
+            if total <= self.max_bytes:
+                break
+            for suffix in (".meta.json", ".body"):
+                try:
+                    os.unlink(os.path.join(self.cache_dir, key + suffix))
+                except OSError:
+                    pass
+            total -= size
+            logger.debug("HTTP cache evicted %s (%d bytes)", key, size)
+
+
+_shared_cache = None
+
+
+def get_http_cache():
+    """Instance HTTPCache bersama untuk satu proses."""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = HTTPCache()
+    return _shared_cache
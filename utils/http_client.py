@@ -0,0 +1,96 @@
+# utils/http_client.py
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from core.logger import get_logger
+from utils import config
+
+logger = get_logger(__name__)
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def _build_retry(retries):
+    kwargs = dict(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        backoff_factor=config.HTTP_BACKOFF_FACTOR,
+        status_forcelist=config.HTTP_RETRY_STATUSES,
+        raise_on_status=False,
+    )
+    try:
+        return Retry(allowed_methods=frozenset(["GET", "HEAD"]), **kwargs)
+    except TypeError:
+        # urllib3 < 1.26
+        return Retry(method_whitelist=frozenset(["GET", "HEAD"]), **kwargs)
+
+
+class _RetryAdapter(HTTPAdapter):
+    """
+    HTTPAdapter dengan policy retry yang bisa di-override per request
+    (thread-local), jadi request dengan dan tanpa retry tetap memakai
+    connection pool yang sama.
+    """
+
+    def __init__(self, **kwargs):
+        self._local = threading.local()
+        super().__init__(**kwargs)
+
+    @property
+    def max_retries(self):
+        override = getattr(self._local, "max_retries", None)
+        return self._default_retries if override is None else override
+
+    @max_retries.setter
+    def max_retries(self, value):
+        self._default_retries = value
+
+
+def get_session():
+    """
+    Session requests bersama untuk satu proses: koneksi keep-alive di-pool
+    per host, jadi --check lalu --install ke tunnel yang sama tidak
+    mengulang TCP+TLS handshake. Retry di-set per request (lihat http_get).
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = _RetryAdapter(
+                pool_connections=config.HTTP_POOL_MAXSIZE,
+                pool_maxsize=config.HTTP_POOL_MAXSIZE,
+                max_retries=_build_retry(config.HTTP_RETRIES),
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+def _request(method, url, timeout, retries, kwargs):
+    session = get_session()
+    # `retries=False` untuk request yang punya fallback sendiri (mis. revalidasi
+    # cache, probe mirror) supaya gagal cepat
+    if retries:
+        return session.request(method, url, timeout=timeout or config.HTTP_TIMEOUT, **kwargs)
+    adapter = session.get_adapter(url)
+    adapter._local.max_retries = Retry(0, read=False)
+    try:
+        return session.request(method, url, timeout=timeout or config.HTTP_TIMEOUT, **kwargs)
+    finally:
+        adapter._local.max_retries = None
+
+
+def http_get(url, timeout=None, retries=True, **kwargs):
+    """GET lewat session bersama. Timeout default config.HTTP_TIMEOUT."""
+    logger.debug("GET %s", url)
+    return _request("GET", url, timeout, retries, kwargs)
+
+
+def http_head(url, timeout=None, retries=True, **kwargs):
+    logger.debug("HEAD %s", url)
+    return _request("HEAD", url, timeout, retries, kwargs)
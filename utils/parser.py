@@ -1,10 +1,11 @@
 # utils/parser.py
-from bs4 import BeautifulSoup
 from core.logger import get_logger
 
 logger = get_logger(__name__)
 
 def parse_portal_table(html_text):
+    from bs4 import BeautifulSoup
+
     soup = BeautifulSoup(html_text, "html.parser")
     table = soup.find("table", class_="portal-table")
     if not table:
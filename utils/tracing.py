@@ -0,0 +1,125 @@
+# utils/tracing.py
+"""
+Span API ringan untuk melihat ke mana waktu habis dalam satu run.
+
+    from utils import tracing
+    with tracing.span("compat.pdf_parse", path=pdf):
+        ...
+
+Default nonaktif: span() hanya mengembalikan context manager no-op yang
+sama setiap kali. Aktifkan dengan tracing.enable() (main.py --trace FILE),
+lalu export_chrome_trace() menulis file trace-event JSON yang bisa dibuka
+di chrome://tracing atau Perfetto.
+"""
+import json
+import os
+import threading
+import time
+from functools import wraps
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+_tracer = None
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "args", "start")
+
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter()
+        if exc_type is not None:
+            self.args["error"] = f"{exc_type.__name__}: {exc}"
+        self.tracer.record(self.name, self.start, end, self.args)
+        return False
+
+
+class Tracer:
+    def __init__(self):
+        self.events = []
+        self.origin = time.perf_counter()
+        self.pid = os.getpid()
+        # tid -> nama thread saat span dicatat (worker pool sudah mati saat export)
+        self.thread_names = {}
+        self._lock = threading.Lock()
+
+    def record(self, name, start, end, args):
+        thread = threading.current_thread()
+        event = {
+            "name": name,
+            "cat": name.split(".", 1)[0],
+            "ph": "X",
+            "ts": round((start - self.origin) * 1e6, 3),
+            "dur": round((end - start) * 1e6, 3),
+            "pid": self.pid,
+            "tid": thread.ident,
+            "args": {k: str(v) for k, v in args.items()},
+        }
+        with self._lock:
+            self.events.append(event)
+            self.thread_names[thread.ident] = thread.name
+
+
+def enable():
+    global _tracer
+    if _tracer is None:
+        _tracer = Tracer()
+    return _tracer
+
+
+def enabled():
+    return _tracer is not None
+
+
+def span(name, **args):
+    tracer = _tracer
+    if tracer is None:
+        return _NULL_SPAN
+    return _Span(tracer, name, args)
+
+
+def traced(name):
+    """Decorator: bungkus seluruh fungsi dalam satu span."""
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*a, **kw):
+            if _tracer is None:
+                return fn(*a, **kw)
+            with _Span(_tracer, name, {}):
+                return fn(*a, **kw)
+        return wrapper
+    return decorator
+
+
+def export_chrome_trace(path):
+    """Tulis semua span sebagai Chrome trace-event JSON. Return jumlah event."""
+    tracer = _tracer
+    if tracer is None:
+        return 0
+    with tracer._lock:
+        events = sorted(tracer.events, key=lambda e: e["ts"])
+        thread_names = [
+            {"name": "thread_name", "ph": "M", "pid": tracer.pid, "tid": tid, "args": {"name": name}}
+            for tid, name in tracer.thread_names.items()
+        ]
+    with open(path, "w") as fh:
+        json.dump({"traceEvents": thread_names + events, "displayTimeUnit": "ms"}, fh)
+    return len(events)